@@ -1,123 +1,94 @@
+import time
+_STARTED = time.perf_counter()
+
 import sys
 import os
 import json
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import streamlink
-import numpy as np
-import sounddevice as sd
-from piper import PiperVoice
 from threading import Thread, Lock
-from queue import Queue
-import time
 from qtpy.QtWidgets import (
     QApplication, 
     QMainWindow, 
     QVBoxLayout, 
     QPushButton, 
     QWidget, 
-    QTreeWidget, 
-    QTreeWidgetItem, 
+    QTreeView, 
     QFileDialog, 
     QHBoxLayout, 
     QLabel, 
     QSlider, 
     QMessageBox, 
-    QProgressDialog, 
+    QProgressBar, 
     QLineEdit,
     QHeaderView,
-    QPlainTextEdit
+    QShortcut
 )
+from qtpy.QtGui import QKeySequence
 from qtpy.QtCore import Qt, QUrl, QTimer, QThread, Signal, QThread
-from qtpy.QtMultimediaWidgets import QVideoWidget
 from qtpy.QtMultimedia import QMediaPlayer, QMediaContent
-from whisper_live.client import TranscriptionClient
 import locale
-from deep_translator import GoogleTranslator
-from io import StringIO
 import threading
 import subprocess
 import queue
 from functools import partial
-import socket
-
-def is_port_in_use(port):
-    """Sprawdza czy port jest zajęty."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
-
-def start_whisper_server_if_needed():
-    """Uruchamia serwer Whisper na stałym porcie 9090 jeśli nie jest aktywny."""
-    port = 9090
-    
-    if is_port_in_use(port):
-        print("Serwer Whisper jest już uruchomiony na porcie 9090.")
-        return
-
-    print("Uruchamianie serwera Whisper na porcie 9090...")
-    whisper_dir = os.path.join(os.path.dirname(__file__), "WhisperLive")
-    command = [
-        "python3.11", os.path.join(whisper_dir, "run_server.py"),
-        "--port", str(port),
-        "--backend", "faster_whisper",
-        "--omp_num_threads", "6",
-        "--no_single_model"
-    ]
-    
-    try:
-        process = subprocess.Popen(
-            command, 
-            cwd=whisper_dir, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE
-        )
-        time.sleep(5)  # Czekaj na inicjalizację
-        
-        if is_port_in_use(port):
-            print("Serwer Whisper został pomyślnie uruchomiony.")
-        else:
-            print("Uwaga: Serwer nie odpowiada na porcie 9090!")
-            
-    except Exception as e:
-        print(f"Błąd podczas uruchamiania serwera: {e}")
 
+from array import array
+
+from iptvplayer.channels import ChannelTable
+from iptvplayer.check_job import StreamCheckJob
+from iptvplayer.check_stats_panel import CheckStatsPanel
+from iptvplayer.debug_panel import DebugPanel
+from iptvplayer.download import fetch_playlist
+from iptvplayer.frame_monitor import FrameMonitor
+from iptvplayer.lazy import lazy_import
+from iptvplayer.playlist_loader import PlaylistLoader
+from iptvplayer.playlist_model import PlaylistModel
+from iptvplayer.resources import ResourceBudget, limit_process_cpus
+from iptvplayer.subtitle_overlay import SubtitleOverlay
+from iptvplayer.subtitle_view import SubtitleView
+from iptvplayer.transcription import SegmentQueue, SegmentStream, TranscriptionStopped, make_client
+from iptvplayer.translation import TranslationStage
+from iptvplayer.translation_cache import CachedTranslator, TranslationCache
+from iptvplayer.translators import LOCAL_BACKENDS, BoundedTranslator, make_backend
+from iptvplayer.whisper_server import DEFAULT_PORT, FAILED, READY, RESTARTING, WhisperServerSupervisor, server_command
+
+# Ciężkie moduły syntezy mowy ładowane są przy pierwszym użyciu - samo oglądanie
+# kanału ich nie potrzebuje (napisy i tłumaczenie: iptvplayer.transcription, iptvplayer.translators).
+np = lazy_import('numpy')
+sd = lazy_import('sounddevice')
 
 class TranscriptionThread(QThread):
-    def __init__(self, transcription_client, hls_url, whisper_queue):
+    """Przesyła dźwięk kanału do serwera Whisper; segmenty trafiają do ``segments`` (SegmentQueue)."""
+
+    def __init__(self, hls_url, segments, lang="en", port=DEFAULT_PORT):
         super().__init__()
-        self.transcription_client = transcription_client
         self.hls_url = hls_url
-        self.whisper_queue = whisper_queue  # Przekazanie kolejki
-        self._is_running = True
+        self.segments = segments
+        self.lang = lang
+        self.port = port
+        self.stream = None
+        self._stopped = False
 
     def run(self):
         try:
-            old_stdout = sys.stdout
-            sys.stdout = OutputRedirector(self.whisper_queue)  # Użycie przekazanej kolejki
-            
-            if not self.transcription_client:
-                raise Exception("TranscriptionClient not initialized")
-
-            while self._is_running:
-                try:
-                    self.transcription_client.process_stream(self.hls_url)
-                except AttributeError:
-                    result = self.transcription_client(hls_url=self.hls_url)
-                    if result:
-                        for transcript in result:
-                            print(transcript['text'])
+            # Połączenie z serwerem (czekanie na SERVER_READY) także poza wątkiem GUI
+            stream = SegmentStream(make_client("localhost", self.port, lang=self.lang), self.segments.put)
+            self.stream = stream
+            if self._stopped:
+                stream.stop()
+            stream.run(self.hls_url)
+        except TranscriptionStopped:
+            pass
         except Exception as e:
-            print(f"Transcription error: {str(e)}")
-        finally:
-            sys.stdout = old_stdout
+            print(f"Transcription error: {e}")
 
     def stop(self):
-        self._is_running = False
-        self.quit()
-        self.wait()
+        self._stopped = True
+        if self.stream is not None:
+            self.stream.stop()
+        self.wait(5000)
 
 class TTSHandler:
-    def __init__(self, model_path=None, config_path=None):
+    def __init__(self, model_path=None, config_path=None, threads=None):
         self.audio_queue = queue.Queue()
         self.is_playing = False
         self.process = None
@@ -126,6 +97,7 @@ class TTSHandler:
         self.sample_rate = 22050  # Piper's default sample rate
         self.model_path = model_path
         self.config_path = config_path
+        self.threads = threads  # funkcja zwracająca bieżący przydział wątków dla piper-tts
         
         # Sprawdź dostępność TTS
         self.tts_available = False
@@ -198,13 +170,21 @@ class TTSHandler:
                 if self.config_path:
                     cmd.extend(["-c", self.config_path])
                 
+                env = None
+                threads = self.threads() if self.threads else None
+                if threads:
+                    env = dict(os.environ, OMP_NUM_THREADS=str(threads))
                 self.process = subprocess.Popen(
                     cmd,    
                     stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    bufsize=0
+                    bufsize=0,
+                    env=env
                 )
+                if threads:
+                    # onnxruntime tworzy wątki według liczby rdzeni - maska je ogranicza
+                    limit_process_cpus(self.process.pid, threads)
 
                 # Wyczyść kolejkę przed dodaniem nowych danych
                 while not self.audio_queue.empty():
@@ -241,33 +221,23 @@ class TTSHandler:
         if not self.is_playing:
             self.start_audio_stream()
 
-class OutputRedirector:
-    def __init__(self, queue):
-        self.queue = queue
-
-    def write(self, text):
-        self.queue.put(text)
-
-    def flush(self):
-        pass
-
-def translate_text(text, target_lang):
-    try:
-        return GoogleTranslator(target=target_lang).translate(text)
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return text
-
 class IPTVPlayer(QMainWindow):
     subtitle_signal = Signal(str)
     whisper_output = Signal(str)
+    whisper_server_state = Signal(str, str)  # stan, opis - zgłaszane z wątku nadzorcy serwera
 
     def __init__(self):
         super().__init__()
         self.config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+        self.config = self.load_config()
+        self.resources = ResourceBudget(cores=self.config.get('cpu_cores'), fixed=self.config.get('thread_budget'))
+        for name in ('whisper', 'tts', 'translation', 'checker'):
+            self.resources.set_active(name, False)  # podsystemy startują bezczynne
         self.last_playlist = None
-        self.active_streams = []
-        self.group_items = {}
+        self.channels = ChannelTable()
+        self.active_streams = array('I')  # wiersze tabeli widoczne na liście
+        self.playlist_loader = None
+        self.check_job = None
 
         self.setWindowTitle("IPTV Player")
         self.setGeometry(100, 100, 1000, 600)
@@ -297,31 +267,60 @@ class IPTVPlayer(QMainWindow):
         load_local_button.clicked.connect(self.load_playlist)
         playlist_buttons_layout.addWidget(load_local_button)
 
+        self.cancel_load_button = QPushButton("Cancel")
+        self.cancel_load_button.setEnabled(False)
+        self.cancel_load_button.clicked.connect(self.cancel_background_work)
+        playlist_buttons_layout.addWidget(self.cancel_load_button)
+
+        self.check_progress = QProgressBar()
+        self.check_progress.setMaximumWidth(200)
+        self.check_progress.hide()
+        playlist_buttons_layout.addWidget(self.check_progress)
+
+        self.load_status_label = QLabel("")
+        playlist_buttons_layout.addWidget(self.load_status_label)
+
+        self.check_stats_button = QPushButton("Check Stats")
+        self.check_stats_button.setCheckable(True)
+        playlist_buttons_layout.addWidget(self.check_stats_button)
+
         self.layout.addLayout(playlist_buttons_layout)
 
+        self.check_stats_panel = CheckStatsPanel()
+        self.check_stats_panel.hide()
+        self.check_stats_button.toggled.connect(self.check_stats_panel.setVisible)
+        self.layout.addWidget(self.check_stats_panel)
+
         # Video Player and Playlist
         upper_layout = QHBoxLayout()
-        self.video_widget = QVideoWidget()
+        # Obraz z napisami rysowanymi na wideo (widoczne także na pełnym ekranie)
+        self.video_widget = SubtitleOverlay(self.config.get('subtitle_overlay_lines', 2),
+                                            delay=self.config.get('subtitle_overlay_delay', 0.0))
         self.video_widget.setMouseTracking(True)
         self.video_widget.mouseDoubleClickEvent = self.toggle_fullscreen
         upper_layout.addWidget(self.video_widget)
 
-        self.playlist_tree = QTreeWidget()
-        self.playlist_tree.setColumnCount(1)
-        self.playlist_tree.setHeaderLabels(["Channel Name"])
-        self.playlist_tree.itemDoubleClicked.connect(self.play_channel_double_click)
+        self.playlist_model = PlaylistModel(self)
+        self.playlist_tree = QTreeView()
+        self.playlist_tree.setModel(self.playlist_model)
+        self.playlist_tree.setUniformRowHeights(True)
+        self.playlist_tree.doubleClicked.connect(self.play_channel_double_click)
+        self.playlist_tree.expanded.connect(self.fetch_group)
+        self.playlist_tree.verticalScrollBar().valueChanged.connect(self.fetch_more_visible)
         self.playlist_tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         upper_layout.addWidget(self.playlist_tree)
 
         self.layout.addLayout(upper_layout)
 
         # Subtitle Display
-        self.subtitle_box = QPlainTextEdit()
-        self.subtitle_box.setReadOnly(True)
+        self.subtitle_box = SubtitleView(self.config.get('subtitle_max_lines', 500))
         self.layout.addWidget(self.subtitle_box)
 
+        self.transcription_status = QLabel("Transcription: not started")
+        self.layout.addWidget(self.transcription_status)
+
         # Connect subtitle signal
-        self.subtitle_signal.connect(self.update_subtitles_gui)
+        self.subtitle_signal.connect(self.subtitle_box.append_line)
 
         # Playback Controls
         control_layout = QHBoxLayout()
@@ -372,29 +371,53 @@ class IPTVPlayer(QMainWindow):
 
         # Initialize player
         self.media_player = QMediaPlayer()
-        self.media_player.setVideoOutput(self.video_widget)
+        self.media_player.setVideoOutput(self.video_widget.video_item)
 
         # Subtitle client
-        self.transcription_client = None
+        self.transcription_thread = None
+        self.whisper_server = None
+        self.whisper_ready = False
+        self.pending_subtitles_url = None  # kanał czekający na gotowość serwera
+        self.subtitles_url = None          # kanał, dla którego działa transkrypcja
+        self.whisper_server_state.connect(self.on_whisper_server_state)
         
         self.is_fullscreen = False
         self.auto_hide_timer = QTimer()
         self.auto_hide_timer.timeout.connect(self.hide_playlist)
 
+        # Pomiar utraconych klatek podczas wczytywania listy
+        self.frame_monitor = FrameMonitor(parent=self)
+
         self.load_last_playlist()
         
-        self.whisper_queue = queue.Queue()
-        
        # Get system locale for translation
         try:
             self.system_locale = locale.getlocale()[0].split('_')[0]  # Gets language code (e.g., 'pl' from 'pl_PL')
         except:
             self.system_locale = 'pl'  # Default to Polish if locale detection fails
             
-        # Initialize translator
-        self.translator = GoogleTranslator(target=self.system_locale)
-
-        self.whisper_queue = queue.Queue()
+        # Tłumaczenie w puli wątków; tłumacz tworzony przy pierwszym użyciu w każdym wątku
+        self.translation_cache = TranslationCache(
+            max_entries=self.config.get('translation_cache_size', 2000),
+            ttl=self.config.get('translation_cache_ttl_hours', 24) * 3600,
+            path=None if self.config.get('translation_cache_disk', True) else False,
+        )
+        self.translation_backend = self.config.get('translation_backend', 'google')
+        self.translator = None  # BoundedTranslator tworzony przy pierwszym tłumaczeniu (patrz create_translator)
+        self._translator_lock = Lock()
+        self.translation_stage = TranslationStage(
+            self.create_translator, workers=self.config.get('translation_workers', 2), parent=self)
+        self.translation_stage.translated.connect(self.on_translation)
+        self._spoken_translations = set()  # tłumaczenia już wypowiedziane przez TTS
+
+        # Panel diagnostyczny pod F12
+        self.debug_panel = DebugPanel(self.debug_stats)
+        self.debug_panel.hide()
+        self.layout.addWidget(self.debug_panel)
+        QShortcut(QKeySequence(Qt.Key_F12), self, activated=self.toggle_debug_panel)
+
+        # Segmenty transkrypcji z wątku klienta Whisper (ograniczona kolejka)
+        self.segment_queue = SegmentQueue(self.config.get('subtitle_queue_size', 64))
         
         # Timer do sprawdzania kolejki
         self.whisper_timer = QTimer()
@@ -402,146 +425,148 @@ class IPTVPlayer(QMainWindow):
         self.whisper_timer.start(100)  # sprawdzaj co 100ms
 
         # Połącz sygnał z metodą aktualizacji GUI
-        self.whisper_output.connect(self.update_subtitles_gui)
+        self.whisper_output.connect(self.subtitle_box.append_line)
 
         # W metodzie __init__ klasy IPTVPlayer:
         try:
             model_path = "pl_PL-darkman-medium.onnx"
             config_path = "pl_PL-darkman-medium.onnx.json"
-            self.tts_handler = TTSHandler(model_path=model_path, config_path=config_path)
+            self.tts_handler = TTSHandler(model_path=model_path, config_path=config_path,
+                                          threads=partial(self.resources.threads, 'tts'))
             self.tts_enabled = False
         except Exception as e:
             print(f"Błąd inicjalizacji TTS: {e}")
             self.tts_handler = None
 
 
-    def play_channel_double_click(self, item):
-        if item and item.childCount() == 0:
-            channel_url = item.data(0, Qt.UserRole)
-            if channel_url:
+    def play_channel_double_click(self, index):
+        if index.isValid():
+            row = self.playlist_model.table_row(index)
+            if row is not None:
+                channel_url = self.channels.urls[row]
                 self.media_player.setMedia(QMediaContent(QUrl.fromUserInput(channel_url)))
                 self.media_player.play()
                 self.start_subtitles(channel_url)
 
-    def start_subtitles(self, hls_url):
-        if self.transcription_client:
-            self.transcription_client = None
-        try:
-            self.transcription_client = TranscriptionClient("localhost", 9090, lang="en")
-            self.transcription_thread = TranscriptionThread(
-                self.transcription_client, 
-                hls_url, 
-                self.whisper_queue  # Przekazanie kolejki
-            )
-            self.transcription_thread.start()
-        
-            def process_subtitles():
-                # Zapisz oryginalny stdout
-                old_stdout = sys.stdout
-            
-                try:
-                    # Przekieruj stdout do naszego OutputRedirector
-                    sys.stdout = OutputRedirector(self.whisper_queue)
-                
-                    # Sprawdź, czy klient został poprawnie zainicjalizowany
-                    if not self.transcription_client:
-                        raise Exception("TranscriptionClient not initialized")
+    def start_whisper_server(self):
+        """Uruchamia nadzór serwera Whisper w tle; okno działa, zanim serwer będzie gotowy."""
+        whisper_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "WhisperLive")
+        command = server_command(
+            whisper_dir, DEFAULT_PORT,
+            omp_threads=self.resources.base('whisper'),
+            model_pool_size=self.config.get('whisper_model_pool_size', 1),
+            model_queue_size=self.config.get('whisper_model_queue_size', 8),
+            preload_model=self.config.get('whisper_preload_model'),
+        )
+        self.whisper_server = WhisperServerSupervisor(
+            whisper_dir, DEFAULT_PORT, command=command,
+            on_state=self.whisper_server_state.emit,
+            keep_running=self.config.get('whisper_server_keep_running', False),
+        )
+        self.transcription_status.setText("Transcription: warming up...")
+        self.whisper_server.start()
+
+    def on_whisper_server_state(self, state, detail):
+        self.whisper_ready = state == READY
+        if state == READY:
+            self.transcription_status.setText("Transcription: ready")
+            if self.pending_subtitles_url:
+                url, self.pending_subtitles_url = self.pending_subtitles_url, None
+                self.start_subtitles(url)
+        elif state == FAILED:
+            self.transcription_status.setText(f"Transcription unavailable: {detail}")
+        elif state == RESTARTING:
+            self.transcription_status.setText("Transcription: server restarting...")
+            # Połączenie z padniętym serwerem jest stracone - wznów napisy po restarcie
+            if self.subtitles_url and not self.pending_subtitles_url:
+                self.pending_subtitles_url = self.subtitles_url
+        else:
+            self.transcription_status.setText("Transcription: warming up...")
+        print(f"Whisper server: {state} {detail}")
 
-                    # Próba uruchomienia transkrypcji
-                    try:
-                        # Bezpośrednie wywołanie metody process_stream
-                        self.transcription_client.process_stream(hls_url)
-                    except AttributeError:
-                        # Jeśli process_stream nie jest dostępne, spróbuj standardowego wywołania
-                        result = self.transcription_client(hls_url=hls_url)
-                        if result:
-                            for transcript in result:
-                                print(transcript['text'])
-                    
-                except Exception as e:
-                    print(f"Transcription error: {str(e)}")
-                finally:
-                    # Przywróć oryginalny stdout
-                    sys.stdout = old_stdout
-
-            # Uruchom przetwarzanie napisów w osobnym wątku
-            Thread(target=process_subtitles, daemon=True).start()
+    def start_subtitles(self, hls_url):
+        if self.whisper_server is not None and not self.whisper_ready:
+            # Serwer jeszcze się uruchamia - napisy ruszą po zgłoszeniu gotowości
+            self.pending_subtitles_url = hls_url
+            return
+        self.subtitles_url = hls_url
+        self.resources.set_active('whisper', True)
+        self.resources.set_active('translation', self.translation_backend in LOCAL_BACKENDS)
+        self.stop_subtitles()
+        self.transcription_thread = TranscriptionThread(hls_url, self.segment_queue)
+        self.transcription_thread.start()
+
+    def stop_subtitles(self):
+        thread, self.transcription_thread = self.transcription_thread, None
+        if thread is not None:
+            thread.stop()
+        self.segment_queue.clear()
+        self.translation_stage.reset()
+        self.video_widget.clear_cues()
+
+    def create_translator(self):
+        """Tłumacz dla wątku puli tłumaczeń; silnik (np. wczytany model) jest wspólny."""
+        with self._translator_lock:
+            if self.translator is None:
+                name = self.translation_backend
+                options = {}
+                if name == 'ctranslate2':
+                    threads = self.resources.base('translation')
+                    options = dict(model_dir=self.config.get('translation_model_dir'),
+                                   inter_threads=min(threads, self.config.get('translation_workers', 2)),
+                                   intra_threads=max(1, threads // self.config.get('translation_workers', 2)),
+                                   source_prefix=self.config.get('translation_source_prefix'))
+                backend = make_backend(name, self.system_locale,
+                                       source=self.config.get('translation_source') or None, **options)
+                self.translator = BoundedTranslator(backend, timeout=self.config.get('translation_timeout', 5.0),
+                                                    workers=self.config.get('translation_workers', 2))
+        return CachedTranslator(self.translator, self.translation_cache, self.translator.source, self.translator.target)
+
+    def debug_stats(self):
+        stats = self.translation_cache.stats()
+        stats.update(segments=self.translation_stage.segments, batches=self.translation_stage.batches,
+                     dropped=self.segment_queue.dropped, threads=self.resources.describe())
+        return stats
+
+    def toggle_debug_panel(self):
+        self.debug_panel.setVisible(not self.debug_panel.isVisible())
 
-        except Exception as e:
-            self.whisper_output.emit(f"Error initializing transcription client: {e}")
-            print(f"Error initializing transcription client: {e}")
-            
     def check_whisper_output(self):
-        # Use a class-level set to track spoken translations across method calls
-        if not hasattr(self, '_spoken_translations'):
-            self._spoken_translations = set()
-
-        try:
-            while True:
-                try:
-                    text = self.whisper_queue.get_nowait()
-                    if text and text.strip():
-                        translated_text = self.translator.translate(text.strip())
-                        combined_text = f"Original: {text.strip()}\n{self.system_locale.upper()}: {translated_text}"
-                
-                        # Aktualizuj GUI
-                        self.whisper_output.emit(combined_text)
-                
-                        # Synteza TTS tylko dla unikalnych, nieprzetworzonych wcześniej tłumaczeń
-                        if (self.tts_enabled and 
-                            self.tts_handler and 
-                            self.tts_handler.tts_available and 
-                            translated_text not in self._spoken_translations):
-                        
-                            QTimer.singleShot(50, lambda t=translated_text: 
-                                self.tts_handler.speak(t))
-                        
-                            # Dodaj do zbioru już przetłumaczonych i wypowiedzianych tekstów
-                            self._spoken_translations.add(translated_text)
-
-                            # Opcjonalnie: ogranicz rozmiar zbioru, aby nie rosło w nieskończoność
-                            if len(self._spoken_translations) > 100:
-                                self._spoken_translations.clear()
-
-                except queue.Empty:
-                    break
-
-        except Exception as e:
-            print(f"Error in check_whisper_output: {e}")
-    
-    def update_subtitles_gui(self, text):
-        """Aktualizuje napisy w GUI"""
-        current_text = self.subtitle_box.toPlainText()
-        # Dodaj nowy tekst na końcu, zachowując historię
-        if current_text:
-            new_text = current_text + "\n" + text
+        """Przekazuje ukończone segmenty do tłumaczenia (wątek GUI nie czeka na odpowiedź)."""
+        completed = [segment for segment in self.segment_queue.drain() if segment.completed and segment.text]
+        if completed:
+            self.translation_stage.submit(completed)
         else:
-            new_text = text
-            
-        self.subtitle_box.setPlainText(new_text)
-        
-        # Przewiń do końca
-        cursor = self.subtitle_box.textCursor()
-        cursor.movePosition(cursor.End)
-        self.subtitle_box.setTextCursor(cursor)
-        self.subtitle_box.ensureCursorVisible()
+            self.translation_stage.poll()
+
+    def on_translation(self, result):
+        if result.error:
+            print(f"Translation error: {result.error}")
+        translated_text = result.translated or result.text
+        self.whisper_output.emit(f"Original: {result.text}\n{self.system_locale.upper()}: {translated_text}")
+        self.video_widget.add_cue(translated_text, result.start, result.end)
+
+        # Synteza TTS tylko dla unikalnych, nieprzetworzonych wcześniej tłumaczeń
+        if (self.tts_enabled and
+                self.tts_handler and
+                self.tts_handler.tts_available and
+                result.translated and
+                translated_text not in self._spoken_translations):
+            self.tts_handler.speak(translated_text)
+            self._spoken_translations.add(translated_text)
+            # Ogranicz rozmiar zbioru, aby nie rósł w nieskończoność
+            if len(self._spoken_translations) > 100:
+                self._spoken_translations.clear()
 
     def speak_text(self, text):
         """Send text to TTS handler for synthesis"""
         if self.tts_enabled and self.tts_handler.running:
             Thread(target=self.tts_handler.synthesize_speech, args=(text,), daemon=True).start()
 
-    def update_subtitles_gui(self, text):
-        """Update subtitles in GUI thread"""
-        self.subtitle_box.setPlainText(text)
-        # Auto-scroll to bottom
-        self.subtitle_box.verticalScrollBar().setValue(
-            self.subtitle_box.verticalScrollBar().maximum()
-        )
-
     def toggle_tts(self):
         self.tts_enabled = not self.tts_enabled
         self.tts_button.setText(f"TTS: {'Włączony' if self.tts_enabled else 'Wyłączony'}")
+        self.resources.set_active('tts', self.tts_enabled)
     
         if self.tts_enabled:
             self.tts_handler.start_audio_stream()
@@ -557,20 +582,23 @@ class IPTVPlayer(QMainWindow):
     # W metodzie stop_channel:
     def stop_channel(self):
         self.media_player.stop()
-        if self.transcription_thread and self.transcription_thread.isRunning():
-            self.transcription_thread.stop()
+        self.resources.set_active('whisper', False)
+        self.resources.set_active('translation', False)
+        self.subtitles_url = None
+        self.stop_subtitles()
 
     def load_remote_playlist(self):
         url = self.url_field.text()
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'remote_playlist.m3u')
-                with open(local_path, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
+            local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'remote_playlist.m3u')
+            result = fetch_playlist(url, local_path)
+            if result.not_modified and self.last_playlist == local_path and len(self.channels):
+                # Lista na serwerze się nie zmieniła i jest już wczytana
+                self.load_status_label.setText("Remote playlist not modified")
+            elif result.ok:
                 self.prompt_check_playlist(local_path)
             else:
-                QMessageBox.warning(self, "Error", f"Failed to fetch playlist: {response.status_code}")
+                QMessageBox.warning(self, "Error", f"Failed to fetch playlist: {result.status}")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error fetching playlist: {e}")
 
@@ -591,141 +619,162 @@ class IPTVPlayer(QMainWindow):
         else:
             self.parse_playlist(file_path, check_streams=False)
 
-    def parse_playlist(self, file_path, check_streams):
-        self.playlist_tree.clear()
-        self.active_streams = []
-        self.group_items = {}
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                playlist_data = file.readlines()
-
-            streams_to_check = []
-            current_channel = None
-
-            for line in playlist_data:
-                line = line.strip()
-
-                if line.startswith('#EXTINF:'):
-                    try:
-                        channel_info = {}
-
-                        if 'group-title="' in line:
-                            group_title = line.split('group-title="')[1].split('"')[0]
-                        else:
-                            group_title = "Undefined"
-
-                        if 'tvg-id="' in line:
-                            channel_info['tvg-id'] = line.split('tvg-id="')[1].split('"')[0]
-
-                        if 'tvg-logo="' in line:
-                            channel_info['tvg-logo'] = line.split('tvg-logo="')[1].split('"')[0]
-
-                        channel_name = line.split(',')[-1].strip()
-
-                        current_channel = {
-                            'name': channel_name,
-                            'group': group_title,
-                            'extinf': line,
-                            'info': channel_info
-                        }
-
-                    except Exception as e:
-                        print(f"Error parsing EXTINF line: {e}")
-                        current_channel = None
-
-                elif (line.startswith('http') or line.startswith('https')) and current_channel:
-                    current_channel['url'] = line
-                    streams_to_check.append(current_channel)
-
-                    if not check_streams:
-                        group_name = current_channel['group']
-                        if group_name not in self.group_items:
-                            group_item = QTreeWidgetItem([group_name])
-                            self.playlist_tree.addTopLevelItem(group_item)
-                            self.group_items[group_name] = group_item
-
-                        channel_item = QTreeWidgetItem([current_channel['name']])
-                        channel_item.setData(0, Qt.UserRole, current_channel['url'])
-                        self.group_items[group_name].addChild(channel_item)
-
-                    current_channel = None
-
-            if check_streams:
-                progress = QProgressDialog("Checking channel availability...", "Cancel", 0, len(streams_to_check), self)
-                progress.setWindowModality(Qt.WindowModal)
-                progress.setMinimumDuration(0)
-                checked_count = 0
-
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    future_to_stream = {executor.submit(self.check_stream, stream): stream for stream in streams_to_check}
-
-                    for future in as_completed(future_to_stream):
-                        checked_count += 1
-                        progress.setValue(checked_count)
-
-                        if progress.wasCanceled():
-                            executor.shutdown(wait=False)
-                            break
-
-                        result = future.result()
-                        if result['valid']:
-                            stream_info = result['info']
-                            self.active_streams.append(stream_info)
-
-                            group_name = stream_info['group']
-                            if group_name not in self.group_items:
-                                group_item = QTreeWidgetItem([group_name])
-                                self.playlist_tree.addTopLevelItem(group_item)
-                                self.group_items[group_name] = group_item
+    def fetch_group(self, index):
+        """Pierwsza partia kanałów grupy przy jej rozwinięciu."""
+        if self.playlist_model.rowCount(index) == 0 and self.playlist_model.canFetchMore(index):
+            self.playlist_model.fetchMore(index)
 
-                            channel_item = QTreeWidgetItem([stream_info['name']])
-                            channel_item.setData(0, Qt.UserRole, stream_info['url'])
-                            self.group_items[group_name].addChild(channel_item)
+    def fetch_more_visible(self):
+        """Dociąga kolejną partię kanałów grupy przewiniętej do końca widoku."""
+        viewport = self.playlist_tree.viewport()
+        index = self.playlist_tree.indexAt(viewport.rect().bottomLeft())
+        parent = index.parent()
+        if parent.isValid() and self.playlist_model.canFetchMore(parent):
+            self.playlist_model.fetchMore(parent)
 
-                progress.setValue(len(streams_to_check))
-
-            self.last_playlist = file_path
-            self.save_config()
-            self.playlist_tree.expandAll()
-
-            if check_streams:
-                active_count = len(self.active_streams)
-                total_count = len(streams_to_check)
-                QMessageBox.information(self, "Summary", f"Found {active_count} active channels out of {total_count} total.")
-
-        except Exception as e:
-            self.show_error_message(f"Error loading playlist: {e}")
-
-    def check_stream(self, stream_info):
-        url = stream_info['url']
-        try:
-            session = streamlink.Streamlink()
-            session.set_option("stream-timeout", 2)
-            session.set_option("hls-timeout", 2)
-            session.set_option("http-timeout", 2)
-            streams = session.streams(url)
-
-            if streams:
-                for quality in ['best', 'worst']:
-                    if quality in streams:
-                        try:
-                            stream = streams[quality]
-                            fd = stream.open()
-                            fd.close()
-                            return {'valid': True, 'info': stream_info}
-                        except Exception as e:
-                            print(f"Unable to open stream {url} at quality {quality}: {e}")
-                            continue
-
-            return {'valid': False, 'info': stream_info}
-
-        except streamlink.StreamlinkError as e:
-            print(f"Streamlink error for {url}: {e}")
-            return {'valid': False, 'info': stream_info}
-        except Exception as e:
-            print(f"General error checking stream {url}: {e}")
-            return {'valid': False, 'info': stream_info}
+    def parse_playlist(self, file_path, check_streams):
+        """Uruchamia wczytywanie listy w tle; kanały pojawiają się partiami."""
+        self.cancel_loading()
+        self.cancel_check()
+        self.channels = ChannelTable()
+        self.active_streams = array('I')
+        self.playlist_model.set_channels(self.channels, ())
+
+        self.playlist_loader = PlaylistLoader(file_path, parent=self)
+        self.playlist_loader.rows_ready.connect(partial(self.on_playlist_batch, check_streams))
+        self.playlist_loader.loading_finished.connect(partial(self.on_playlist_loaded, file_path, check_streams))
+        self.playlist_loader.loading_failed.connect(self.on_playlist_failed)
+
+        self.cancel_load_button.setEnabled(True)
+        self.load_status_label.setText("Loading playlist...")
+        self.frame_monitor.start()
+        self.playlist_loader.start()
+
+    def cancel_loading(self):
+        loader = self.playlist_loader
+        if loader is None:
+            return
+        self.playlist_loader = None
+        for signal in (loader.rows_ready, loader.loading_finished, loader.loading_failed):
+            try:
+                signal.disconnect()
+            except (TypeError, RuntimeError):
+                pass
+        loader.cancel()
+        loader.wait()
+        self.finish_loading(f"Loading cancelled ({len(self.channels)} channels)")
+
+    def finish_loading(self, message):
+        self.cancel_load_button.setEnabled(False)
+        if self.frame_monitor.is_active():
+            stats = self.frame_monitor.stop()
+            message += (f" in {stats['elapsed']:.2f}s, dropped frames: {stats['dropped']}"
+                        f" (max stall {stats['max_stall_ms']:.0f} ms)")
+        self.load_status_label.setText(message)
+        print(message)
+
+    def on_playlist_batch(self, check_streams, table, start, end):
+        if table is not self.channels:
+            self.channels = table
+            self.playlist_model.set_channels(table, ())
+        if not check_streams:
+            rows = range(start, end)
+            self.active_streams.extend(rows)
+            self.playlist_model.append_rows(rows)
+        self.load_status_label.setText(f"Loading playlist... {end} channels")
+
+    def on_playlist_failed(self, error):
+        self.playlist_loader = None
+        self.finish_loading("Loading failed")
+        self.show_error_message(f"Error loading playlist: {error}")
+
+    def on_playlist_loaded(self, file_path, check_streams, count, from_cache):
+        self.playlist_loader = None
+        self.finish_loading(f"Loaded {count} channels{' from cache' if from_cache else ''}")
+
+        self.last_playlist = file_path
+        self.save_config()
+
+        if check_streams:
+            self.check_playlist_streams()
+
+        if self.playlist_model.rowCount() == 1:
+            self.playlist_tree.expand(self.playlist_model.group_index(0))
+
+    def check_playlist_streams(self):
+        """Uruchamia sprawdzanie kanałów w tle; działające trafiają na listę na bieżąco."""
+        self.cancel_check()
+        backend = self.config.get('checker_backend', 'asyncio')
+        self.resources.set_active('checker', True)
+        job = self.check_job = StreamCheckJob(
+            self.channels, range(len(self.channels)),
+            backend=backend,
+            concurrency=self.config.get('checker_concurrency') or self.resources.checker_concurrency(backend),
+            depth=self.config.get('checker_probe_depth', 2),
+            adaptive=self.config.get('checker_adaptive', True),
+            health_ttl=self.config.get('health_ttl_hours', 48) * 3600,
+            health_backoff=self.config.get('health_backoff_minutes', 15) * 60,
+            parent=self,
+        )
+        job.progress.connect(self.on_check_progress)
+        job.scheduler_stats.connect(self.check_stats_panel.update_stats)
+        job.check_finished.connect(self.on_check_finished)
+        job.check_failed.connect(self.on_check_failed)
+
+        self.check_progress.setRange(0, len(self.channels))
+        self.check_progress.setValue(0)
+        self.check_progress.show()
+        self.cancel_load_button.setEnabled(True)
+        self.load_status_label.setText("Checking channel availability...")
+        self.frame_monitor.start()
+        job.start()
+
+    def cancel_check(self):
+        job = self.check_job
+        if job is None:
+            return
+        self.check_job = None
+        for signal in (job.progress, job.scheduler_stats, job.check_finished, job.check_failed):
+            try:
+                signal.disconnect()
+            except (TypeError, RuntimeError):
+                pass
+        job.cancel()
+        job.wait()
+        self.resources.set_active('checker', False)
+        self.check_progress.hide()
+        self.finish_loading(f"Check cancelled ({len(self.active_streams)} active channels)")
+
+    def cancel_background_work(self):
+        self.cancel_loading()
+        if self.check_job is not None:
+            # Anulowanie zgłasza check_finished z wynikami zebranymi do tej pory
+            self.check_job.cancel()
+
+    def on_check_progress(self, rows, checked, total):
+        if rows:
+            self.active_streams.extend(rows)
+            self.playlist_model.append_rows(rows)
+        self.check_progress.setValue(checked)
+        self.load_status_label.setText(f"Checking... {checked}/{total}, active: {len(self.active_streams)}")
+
+    def on_check_finished(self, checked, active, cancelled, saved):
+        self.check_job = None
+        self.resources.set_active('checker', False)
+        self.check_progress.hide()
+        total = len(self.channels)
+        self.finish_loading(f"{'Check cancelled' if cancelled else 'Checked'}: "
+                            f"{active} active channels out of {checked} checked ({total} total), "
+                            f"{saved} duplicate probes skipped")
+        if not cancelled:
+            QMessageBox.information(self, "Summary", f"Found {active} active channels out of {total} total.")
+
+    def on_check_failed(self, error):
+        self.check_job = None
+        self.resources.set_active('checker', False)
+        self.check_progress.hide()
+        self.finish_loading("Check failed")
+        self.show_error_message(f"Error checking playlist: {error}")
 
     def toggle_play_pause(self):
         if self.media_player.state() == QMediaPlayer.PlayingState:
@@ -755,22 +804,57 @@ class IPTVPlayer(QMainWindow):
         self.media_player.setVolume(new_volume)
         self.volume_slider.setValue(new_volume)
 
+    def load_config(self):
+        """Wczytuje config.json; brakujące klucze uzupełnia wartościami domyślnymi."""
+        config = {
+            'last_playlist': None,
+            'checker_backend': 'asyncio',   # 'asyncio' albo 'threads'
+            'checker_concurrency': None,    # górny limit prób naraz; None = z budżetu wątków
+            'checker_adaptive': True,       # faktyczny limit dobiera AIMD (opóźnienia, przekroczenia czasu)
+            'checker_probe_depth': 2,       # 1 playlista, 2 + playlista mediów, 3 + segment, 0 = Streamlink
+            'health_ttl_hours': 48,         # po tylu godzinach działający kanał jest sprawdzany ponownie
+            'health_backoff_minutes': 15,   # pierwsza przerwa po porażce, podwajana z każdą kolejną
+            'whisper_server_keep_running': False,  # zostaw serwer Whisper po zamknięciu (szybszy następny start)
+            'whisper_model_pool_size': 1,   # modele współdzielone przez połączenia; 0 = osobny model na połączenie
+            'whisper_model_queue_size': 8,  # żądania czekające na model z puli
+            'whisper_preload_model': 'small',  # model ładowany przy starcie serwera (None = przy pierwszym kanale)
+            'translation_backend': 'google',  # 'google', 'argos', 'ctranslate2' (lokalnie, bez sieci) albo 'echo'
+            'translation_source': None,     # język napisów; None = wykryj (google) albo 'en' (modele lokalne)
+            'translation_model_dir': None,  # katalog modelu CTranslate2 (z source.spm i target.spm)
+            'translation_source_prefix': None,  # znacznik języka modeli wielojęzycznych, np. ">>pol<<"
+            'translation_timeout': 5.0,     # po tylu sekundach napis pokazywany jest bez tłumaczenia
+            'translation_workers': 2,       # równoległe zapytania do tłumacza
+            'translation_cache_size': 2000,  # tłumaczenia trzymane w pamięci (LRU)
+            'translation_cache_ttl_hours': 24,
+            'translation_cache_disk': True,  # zapisuj tłumaczenia także w SQLite (przeżywają restart)
+            'subtitle_max_lines': 500,      # linii historii w oknie napisów (starsze są usuwane)
+            'subtitle_overlay_lines': 2,    # napisów naraz na obrazie wideo (0 = bez napisów na obrazie)
+            'subtitle_overlay_delay': 0.0,  # przesunięcie napisów na obrazie (s), gdy obraz jest opóźniony względem dźwięku
+            'subtitle_queue_size': 64,      # segmenty czekające na wyświetlenie; przy przepełnieniu najstarsze odpadają
+            'cpu_cores': None,              # rdzenie do podziału; None = wykryj (affinity i limit cgroup)
+            'thread_budget': {},            # stałe wątki podsystemów, np. {"whisper": 4, "tts": 2}; reszta według udziałów
+        }
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r') as f:
+                    config.update(json.load(f))
+        except Exception as e:
+            print(f"Error loading config: {e}")
+        return config
+
     def save_config(self):
-        config = {'last_playlist': self.last_playlist}
+        self.config['last_playlist'] = self.last_playlist
         try:
             with open(self.config_file, 'w') as f:
-                json.dump(config, f)
+                json.dump(self.config, f, indent=2)
         except Exception as e:
             print(f"Error saving config: {e}")
 
     def load_last_playlist(self):
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    last_playlist = config.get('last_playlist')
-                    if last_playlist and os.path.exists(last_playlist):
-                        self.parse_playlist(last_playlist, check_streams=False)
+            last_playlist = self.config.get('last_playlist')
+            if last_playlist and os.path.exists(last_playlist):
+                self.parse_playlist(last_playlist, check_streams=False)
         except Exception as e:
             print(f"Error loading last playlist: {e}")
 
@@ -791,18 +875,7 @@ class IPTVPlayer(QMainWindow):
 
         try:
             with open(file_path, 'w', encoding='utf-8') as file:
-                file.write("#EXTM3U\n")
-
-                for i in range(self.playlist_tree.topLevelItemCount()):
-                    group_item = self.playlist_tree.topLevelItem(i)
-
-                    for j in range(group_item.childCount()):
-                        channel_item = group_item.child(j)
-                        name = channel_item.text(0)
-                        url = channel_item.data(0, Qt.UserRole)
-
-                        file.write(f'#EXTINF:-1 group-title="{group_item.text(0)}",{name}\n')
-                        file.write(f'{url}\n')
+                self.channels.write_m3u(file, self.active_streams)
 
             QMessageBox.information(self, "Success", "Playlist saved successfully!")
         except Exception as e:
@@ -853,14 +926,32 @@ class IPTVPlayer(QMainWindow):
 
     def closeEvent(self, event):
         """Czyszczenie zasobów przed zamknięciem"""
+        self.cancel_loading()
+        self.cancel_check()
+        self.stop_subtitles()
+        self.translation_stage.shutdown()
+        if self.translator is not None:
+            self.translator.close()
+        self.translation_cache.close()
+        if self.whisper_server is not None:
+            self.whisper_server.stop()
         if self.tts_handler:
             self.tts_handler.stop_audio_stream()
         super().closeEvent(event)
               
+def report_first_window():
+    """Czas do pierwszego okna (IPTVPLAYER_STARTUP_PROBE=1 kończy program zaraz po nim)."""
+    print(f"startup: first window after {(time.perf_counter() - _STARTED) * 1000:.0f} ms", flush=True)
+    QApplication.instance().quit()
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     player = IPTVPlayer()
-    start_whisper_server_if_needed()
     player.show()
+    if os.environ.get('IPTVPLAYER_STARTUP_PROBE'):
+        QTimer.singleShot(0, report_first_window)
+    else:
+        player.start_whisper_server()
     sys.exit(app.exec())
                             
@@ -0,0 +1,147 @@
+"""Wspólna pula modeli faster_whisper dla serwera WhisperLive.
+
+Bez puli każde połączenie tworzy własny model (``--no_single_model``), więc
+każda zmiana kanału w odtwarzaczu to ponowne ładowanie wag i kolejna kopia
+modelu w pamięci. Tryb ``single_model`` z WhisperLive działa tylko dla
+modelu z własnej ścieżki i ma jedną instancję za jednym zamkiem.
+
+:class:`ModelPool` trzyma do ``size`` instancji na klucz (model,
+urządzenie, typ obliczeń), tworzonych przy pierwszej potrzebie i
+zachowywanych po rozłączeniu klienta. Wywołania ``transcribe`` czekają
+w kolejce FIFO na wolną instancję; gdy w kolejce czeka już ``queue_size``
+żądań, wywołanie od razu zwraca pusty wynik - serwer spróbuje ponownie
+z dłuższym fragmentem dźwięku, zamiast budować zaległość.
+
+:func:`install` podmienia ``ServeClientFasterWhisper.create_model`` tak,
+żeby klient dostawał :class:`PooledTranscriber` zamiast własnego modelu.
+"""
+import collections
+import logging
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 8
+
+
+class ModelPool:
+    def __init__(self, size=1, queue_size=DEFAULT_QUEUE_SIZE):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.size = size
+        self.queue_size = queue_size
+        self._cond = threading.Condition()
+        self._idle = collections.defaultdict(list)     # klucz -> wolne instancje
+        self._created = collections.Counter()          # klucz -> liczba instancji
+        self._waiting = collections.defaultdict(collections.deque)  # klucz -> kolejka oczekujących
+        self.stats = collections.Counter()
+
+    def acquire(self, key, factory):
+        """Zwraca wolną instancję (tworzy ją, jeśli pula nie jest pełna) albo ``None`` przy pełnej kolejce."""
+        with self._cond:
+            waiting = self._waiting[key]
+            if not self._idle[key] and self._created[key] >= self.size and len(waiting) >= self.queue_size:
+                self.stats['rejected'] += 1
+                return None
+            ticket = object()
+            waiting.append(ticket)
+            start = time.monotonic()
+            try:
+                while True:
+                    if waiting[0] is ticket:
+                        if self._idle[key]:
+                            model = self._idle[key].pop()
+                            break
+                        if self._created[key] < self.size:
+                            self._created[key] += 1
+                            model = None
+                            break
+                    self._cond.wait()
+            finally:
+                waiting.remove(ticket)
+                self._cond.notify_all()
+            self.stats['acquired'] += 1
+            self.stats['wait_ms'] += int((time.monotonic() - start) * 1000)
+        if model is None:
+            try:
+                logging.info(f"[model_pool] loading model instance {self._created[key]}/{self.size} for {key}")
+                model = factory()
+            except BaseException:
+                with self._cond:
+                    self._created[key] -= 1
+                    self._cond.notify_all()
+                raise
+            self.stats['loaded'] += 1
+        return model
+
+    def release(self, key, model):
+        with self._cond:
+            self._idle[key].append(model)
+            self._cond.notify_all()
+
+    def preload(self, key, factory):
+        """Ładuje jedną instancję z wyprzedzeniem, żeby pierwszy klient nie czekał na wagi."""
+        model = self.acquire(key, factory)
+        if model is not None:
+            self.release(key, model)
+
+
+class PooledTranscriber:
+    """Zastępuje model klienta: każde ``transcribe`` wypożycza instancję z puli."""
+
+    def __init__(self, pool, key, factory):
+        self.pool = pool
+        self.key = key
+        self.factory = factory
+
+    def transcribe(self, *args, **kwargs):
+        model = self.pool.acquire(self.key, self.factory)
+        if model is None:
+            return [], None
+        try:
+            segments, info = model.transcribe(*args, **kwargs)
+            # Wynik bywa generatorem liczonym leniwie - musi powstać, póki instancja jest wypożyczona
+            return list(segments), info
+        finally:
+            self.pool.release(self.key, model)
+
+
+def install(size, queue_size=DEFAULT_QUEUE_SIZE, preload=None, device=None):
+    """Włącza pulę modeli w ``whisper_live.server``; zwraca :class:`ModelPool`.
+
+    ``preload`` to nazwa modelu ładowanego od razu przy starcie serwera.
+    """
+    from whisper_live import server
+
+    serve_client = server.ServeClientFasterWhisper
+    create_model = serve_client.create_model
+    pool = ModelPool(size, queue_size)
+
+    def factory_for(client, device):
+        def factory():
+            # Oryginalne create_model na kliencie zastępczym - te same parametry modelu co w WhisperLive
+            holder = object.__new__(serve_client)
+            holder.__dict__.update(client.__dict__)
+            create_model(holder, device)
+            return holder.transcriber
+        return factory
+
+    def pooled_create_model(self, device):
+        key = (self.model_size_or_path, device, getattr(self, 'compute_type', None))
+        self.transcriber = PooledTranscriber(pool, key, factory_for(self, device))
+
+    serve_client.create_model = pooled_create_model
+
+    if preload:
+        import torch
+        device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        holder = object.__new__(serve_client)
+        holder.model_size_or_path = preload
+        # Ten sam wybór typu obliczeń co w ServeClientFasterWhisper.__init__ - inaczej klucz by się różnił
+        if device == 'cuda':
+            major, _ = torch.cuda.get_device_capability(device)
+            holder.compute_type = 'float16' if major >= 7 else 'float32'
+        else:
+            holder.compute_type = 'int8'
+        key = (preload, device, holder.compute_type)
+        pool.preload(key, factory_for(holder, device))
+    return pool
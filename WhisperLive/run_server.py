@@ -28,6 +28,19 @@ if __name__ == "__main__":
     parser.add_argument('--no_single_model', '-nsm',
                         action='store_true',
                         help='Set this if every connection should instantiate its own model. Only relevant for custom model, passed using -trt or -fw.')
+    parser.add_argument('--model_pool_size', '-mps',
+                        type=int,
+                        default=0,
+                        help="Share this many faster_whisper model instances between all connections "
+                             "(0 = one model per connection).")
+    parser.add_argument('--model_queue_size', '-mqs',
+                        type=int,
+                        default=8,
+                        help="Transcription requests allowed to wait for a pooled model.")
+    parser.add_argument('--preload_model',
+                        type=str,
+                        default=None,
+                        help="Load this model into the pool at startup (e.g. small).")
     args = parser.parse_args()
 
     if args.backend == "tensorrt":
@@ -38,6 +51,10 @@ if __name__ == "__main__":
         os.environ["OMP_NUM_THREADS"] = str(args.omp_num_threads)
 
     from whisper_live.server import TranscriptionServer
+    if args.model_pool_size > 0 and args.backend == "faster_whisper":
+        import model_pool
+        model_pool.install(args.model_pool_size, args.model_queue_size, preload=args.preload_model)
+        args.no_single_model = True  # pula zastępuje zarówno tryb jednego modelu, jak i model na połączenie
     server = TranscriptionServer()
     server.run(
         "0.0.0.0",
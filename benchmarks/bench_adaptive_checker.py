@@ -0,0 +1,87 @@
+"""Stały limit prób vs AIMD na serwerach o różnym opóźnieniu i pojemności.
+
+Dziewięć "szybkich" hostów ma pojemność ``capacity`` zapytań naraz (domyślnie
+4; powyżej niej opóźnienie rośnie proporcjonalnie do obciążenia, powyżej
+dwukrotności odpowiadają 503), a jeden host jest wolny - odpowiada po
+``slow`` sekundach (powyżej 2 s próby kończą się przekroczeniem czasu).
+
+Stały limit 32 prób na host przekracza pojemność szybkich hostów
+kilkakrotnie: większość prób dostaje 503 także po ponowieniach, więc kanały
+wychodzą fałszywie martwe (``refused``). AIMD obniża limit tych hostów
+(``host limits``) do ich pojemności i prawie wszystkie kanały przechodzą.
+Czas całości wyznacza wolny host; ``fast hosts done`` pokazuje, że nie
+spowalnia on pozostałych. Przy ``capacity`` >= 16 żaden host nie jest
+przeciążony i oba przebiegi dają te same wyniki.
+
+Użycie: python benchmarks/bench_adaptive_checker.py [kanały] [opóźnienie_s] [capacity] [slow_s]
+"""
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+from hls_fixture import FixtureServer
+
+from iptvplayer.async_checker import AsyncStreamChecker
+
+
+def run(label, checker, urls, slow_url):
+    start = time.perf_counter()
+    alive = timeouts = refused = 0
+    fast_done = None
+    fast_total = sum(not url.startswith(slow_url) for url in urls)
+    fast_seen = 0
+    decisions = []
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(0.5):
+            stats = checker.stats()
+            if stats:
+                decisions.append(stats)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    with checker:
+        for _, result in checker.iter_results(enumerate(urls)):
+            alive += result.ok
+            timeouts += not result.ok and 'timeout' in (result.error or '')
+            refused += not result.ok and (result.error or '').endswith('HTTP 503')
+            if not result.url.startswith(slow_url):
+                fast_seen += 1
+                if fast_seen == fast_total:
+                    fast_done = time.perf_counter() - start
+        stats = checker.stats()
+        limits = checker.scheduler.host_limits()
+    stop.set()
+    sampler.join()
+    elapsed = time.perf_counter() - start
+    print(f"{label:18s} {len(urls) / elapsed:7.1f} probes/s  {elapsed:6.2f} s  fast hosts done in "
+          f"{fast_done or 0:5.2f} s  alive {alive}/{len(urls)}  refused {refused}  timeouts {timeouts}")
+    slow_host = slow_url.split('://', 1)[1]
+    fast_limits = [limit for host, limit in limits.items() if host != slow_host]
+    print(f"{'':18s} host limits: fast {min(fast_limits)}-{max(fast_limits)}  slow {limits.get(slow_host)}")
+    print(f"{'':18s} final limit {stats['limit']}  p50 {stats['p50_ms']:.0f} ms  p95 {stats['p95_ms']:.0f} ms  "
+          f"+{stats['increases']}/-{stats['decreases']}")
+    if len(decisions) > 1:
+        trace = ' '.join(f"{d['limit']}({d['reason']})" for d in decisions[:12])
+        print(f"{'':18s} limit every 0.5 s: {trace}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    capacity = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    slow = float(sys.argv[4]) if len(sys.argv) > 4 else 0.5
+    with ExitStack() as stack:
+        fast = [stack.enter_context(FixtureServer(latency, capacity=capacity)) for _ in range(9)]
+        slow_server = stack.enter_context(FixtureServer(slow))
+        urls = [f"{fast[i % 9].base_url}/live/{i}/master.m3u8" for i in range(count)]
+        urls += [f"{slow_server.base_url}/live/{i}/master.m3u8" for i in range(count // 10)]
+        run("fixed 200/32", AsyncStreamChecker(concurrency=200, per_host=32, adaptive=False), urls,
+            slow_server.base_url)
+        run("adaptive <=500/32", AsyncStreamChecker(concurrency=500, per_host=32), urls, slow_server.base_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Przepustowość sprawdzania: pula 5 wątków (Streamlink) vs asyncio/aiohttp.
+
+Kanały rozłożone są na kilka lokalnych serwerów HLS (osobne "hosty")
+z ustawionym opóźnieniem odpowiedzi.
+Użycie: python benchmarks/bench_async_checker.py [kanały] [opóźnienie_s] [hosty]
+"""
+import sys
+import time
+from contextlib import ExitStack
+
+from hls_fixture import FixtureServer
+
+from iptvplayer.async_checker import AsyncStreamChecker
+from iptvplayer.checker import StreamChecker
+
+
+def run(label, checker, urls):
+    start = time.perf_counter()
+    first = None
+    alive = 0
+    with checker:
+        for _, result in checker.iter_results(enumerate(urls)):
+            first = first or time.perf_counter() - start
+            alive += result.ok
+    elapsed = time.perf_counter() - start
+    print(f"{label:26s} {len(urls) / elapsed:8.1f} probes/s  {elapsed:6.2f} s  "
+          f"first result {first * 1000:6.1f} ms  ({alive}/{len(urls)} alive)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    hosts = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FixtureServer(latency)) for _ in range(hosts)]
+        urls = [f"{servers[i % hosts].base_url}/live/{i}/master.m3u8" for i in range(count)]
+        urls += [f"{servers[0].base_url}/dead/{i}.m3u8" for i in range(count // 10)]
+        threads = urls[:min(len(urls), 100)]
+        run(f"threads x5 ({len(threads)} ch)", StreamChecker(max_workers=5), threads)
+        run(f"asyncio ({len(urls)} ch)", AsyncStreamChecker(concurrency=200, per_host=32), urls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Pamięć zajmowana przez 50k kanałów: słowniki z 2.5.3 vs ChannelTable.
+
+Użycie: python benchmarks/bench_channel_memory.py [liczba_kanałów]
+"""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from synthetic import write_synthetic_playlist
+from bench_m3u_parser import legacy_parse
+
+from iptvplayer.channels import ChannelTable
+from iptvplayer.m3u import parse_playlist_file
+
+
+def retained(build, path):
+    """Bajty zaalokowane i wciąż żywe po zbudowaniu struktury."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(path)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_playlist(os.path.join(tmp, "synthetic.m3u"), count)
+        baseline = None
+        for label, build in (("dict per channel (2.5.3)", legacy_parse),
+                             ("Channel records", parse_playlist_file),
+                             ("ChannelTable", ChannelTable.from_playlist)):
+            size, result = retained(build, path)
+            baseline = baseline or size
+            print(f"{label:26s} {size / 1e6:7.1f} MB  {size / count:6.0f} B/channel  "
+                  f"{size / baseline:6.1%}  ({len(result)} channels)")
+            del result
+
+
+if __name__ == "__main__":
+    main()
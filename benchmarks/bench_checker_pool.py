@@ -0,0 +1,54 @@
+"""Próby na sekundę: nowa sesja Streamlink na kanał vs SessionPool.
+
+Użycie: python benchmarks/bench_checker_pool.py [liczba_kanałów]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlink
+from hls_fixture import FixtureServer
+
+from iptvplayer.checker import StreamChecker
+
+
+def fresh_session_check(url):
+    """check_stream z wersji 2.5.3: nowa sesja Streamlink dla każdego kanału."""
+    try:
+        session = streamlink.Streamlink()
+        session.set_option("stream-timeout", 2)
+        session.set_option("hls-timeout", 2)
+        session.set_option("http-timeout", 2)
+        streams = session.streams(url)
+        for quality in ['best', 'worst']:
+            if quality in streams:
+                fd = streams[quality].open()
+                fd.close()
+                return True
+    except Exception:
+        pass
+    return False
+
+
+def run(label, check, urls, server, workers=5):
+    before = dict(server.stats)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        alive = sum(1 for ok in executor.map(check, urls) if ok)
+    elapsed = time.perf_counter() - start
+    connections = server.stats['connections'] - before['connections']
+    print(f"{label:24s} {len(urls) / elapsed:7.1f} probes/s  {elapsed:6.2f} s  "
+          f"{connections:5d} TCP connections  ({alive}/{len(urls)} alive)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with FixtureServer() as server:
+        urls = [f"{server.base_url}/live/{i}/master.m3u8" for i in range(count)]
+        run("fresh session per probe", fresh_session_check, urls, server)
+        with StreamChecker(max_workers=5) as checker:
+            run("pooled sessions", lambda url: checker.check(url).ok, urls, server)
+
+
+if __name__ == "__main__":
+    main()
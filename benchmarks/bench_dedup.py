@@ -0,0 +1,72 @@
+"""Sprawdzanie listy złożonej z kilku kategorii: każda pozycja osobno vs łączenie adresów.
+
+Kanał pojawia się w 1-4 kategoriach; część kopii ma inny zapis hosta,
+jawny domyślny port albo inną kwerendę doklejoną do playlisty master.
+Użycie: python benchmarks/bench_dedup.py [kanały] [opóźnienie_s]
+"""
+import random
+import sys
+import time
+from contextlib import ExitStack
+
+from hls_fixture import FixtureServer
+
+from iptvplayer.async_checker import AsyncStreamChecker
+from iptvplayer.dedup import collapse, fan_out
+
+
+def merged_playlist_urls(servers, count, seed=1):
+    rng = random.Random(seed)
+    urls = []
+    for i in range(count):
+        base = servers[i % len(servers)].base_url
+        for copy in range(rng.choice((1, 1, 2, 2, 3, 4))):
+            url = f"{base}/live/{i}/master.m3u8"
+            if copy == 1:
+                url = url.replace('http://', 'HTTP://')
+            elif copy == 2:
+                url += f"?category={copy}"
+            elif copy == 3:
+                url += "#player"
+            urls.append(url)
+    rng.shuffle(urls)
+    return urls
+
+
+def requests_sent(servers):
+    return sum(server.stats['requests'] for server in servers)
+
+
+def run(label, servers, jobs, dedup):
+    before = requests_sent(servers)
+    start = time.perf_counter()
+    alive = rows = 0
+    with AsyncStreamChecker(concurrency=200, per_host=16) as checker:
+        if dedup:
+            collapsed = collapse(jobs)
+            results = fan_out(checker.iter_results(collapsed.jobs), collapsed)
+            probes = len(collapsed.jobs)
+        else:
+            results = checker.iter_results(jobs)
+            probes = len(jobs)
+        for _, result in results:
+            rows += 1
+            alive += result.ok
+    elapsed = time.perf_counter() - start
+    print(f"{label:12s} {elapsed:6.2f} s  {probes:6d} probes  {requests_sent(servers) - before:6d} HTTP requests  "
+          f"({alive}/{rows} rows alive)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FixtureServer(latency)) for _ in range(10)]
+        jobs = list(enumerate(merged_playlist_urls(servers, count)))
+        print(f"{len(jobs)} playlist entries for {count} distinct channels")
+        run("per entry", servers, jobs, dedup=False)
+        run("collapsed", servers, jobs, dedup=True)
+
+
+if __name__ == "__main__":
+    main()
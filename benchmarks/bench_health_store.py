@@ -0,0 +1,56 @@
+"""Ponowne sprawdzenie dużej listy dzień później: bez bazy stanu vs z HealthStore.
+
+Użycie: python benchmarks/bench_health_store.py [kanały] [opóźnienie_s]
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+from hls_fixture import FixtureServer
+
+from iptvplayer.checker import make_checker
+from iptvplayer.health_store import HealthStore
+
+DAY = 24 * 3600
+
+
+def check(jobs, health=None, now=None):
+    """Zwraca (czas, liczba prób sieciowych, liczba żywych)."""
+    start = time.perf_counter()
+    alive = 0
+    pending = jobs
+    if health is not None:
+        cached, pending = health.split(jobs, now=now)
+        alive += sum(result.ok for _, result in cached)
+    results = []
+    with make_checker('asyncio', 200) as checker:
+        for _, result in checker.iter_results(pending):
+            alive += result.ok
+            results.append(result)
+    if health is not None:
+        health.record(results, now=now)
+    return time.perf_counter() - start, len(pending), alive
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as tmp:
+        servers = [stack.enter_context(FixtureServer(latency)) for _ in range(10)]
+        urls = [f"{servers[i % 10].base_url}/live/{i}/master.m3u8" for i in range(count)]
+        urls += [f"{servers[0].base_url}/dead/{i}.m3u8" for i in range(count // 20)]
+        jobs = list(enumerate(urls))
+        health = stack.enter_context(HealthStore(os.path.join(tmp, 'health.sqlite3')))
+
+        now = time.time()
+        for label, store, when in (("first run (empty store)", health, now),
+                                   ("day later, no store", None, None),
+                                   ("day later, HealthStore", health, now + DAY)):
+            elapsed, probes, alive = check(jobs, store, when)
+            print(f"{label:24s} {elapsed:6.2f} s  {probes:6d} probes  ({alive}/{len(jobs)} alive)")
+
+
+if __name__ == "__main__":
+    main()
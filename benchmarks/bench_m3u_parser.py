@@ -0,0 +1,91 @@
+"""Porównanie starego parsera (readlines/split) ze strumieniowym iptvplayer.m3u.
+
+Użycie: python benchmarks/bench_m3u_parser.py [liczba_kanałów]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic import write_synthetic_playlist
+
+from iptvplayer.m3u import iter_playlist
+
+
+def legacy_parse(file_path):
+    """Logika parse_playlist z wersji 2.5.3 bez części związanej z Qt."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        playlist_data = file.readlines()
+
+    streams = []
+    current_channel = None
+    for line in playlist_data:
+        line = line.strip()
+        if line.startswith('#EXTINF:'):
+            channel_info = {}
+            if 'group-title="' in line:
+                group_title = line.split('group-title="')[1].split('"')[0]
+            else:
+                group_title = "Undefined"
+            if 'tvg-id="' in line:
+                channel_info['tvg-id'] = line.split('tvg-id="')[1].split('"')[0]
+            if 'tvg-logo="' in line:
+                channel_info['tvg-logo'] = line.split('tvg-logo="')[1].split('"')[0]
+            channel_name = line.split(',')[-1].strip()
+            current_channel = {
+                'name': channel_name,
+                'group': group_title,
+                'extinf': line,
+                'info': channel_info
+            }
+        elif (line.startswith('http') or line.startswith('https')) and current_channel:
+            current_channel['url'] = line
+            streams.append(current_channel)
+            current_channel = None
+    return streams
+
+
+def streaming_parse(file_path):
+    return list(iter_playlist(file_path))
+
+
+def time_to_first(func, path):
+    """Czas do otrzymania pierwszego kanału (stary parser musi skończyć całość)."""
+    start = time.perf_counter()
+    if func is streaming_parse:
+        next(iter_playlist(path))
+    else:
+        func(path)
+    return time.perf_counter() - start
+
+
+def measure(func, path, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(result)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_playlist(os.path.join(tmp, "synthetic.m3u"), count)
+        print(f"Playlist: {count} channels, {os.path.getsize(path) / 1e6:.1f} MB")
+        for label, func in (("legacy readlines/split", legacy_parse),
+                            ("streaming iptvplayer.m3u", streaming_parse)):
+            elapsed, peak, parsed = measure(func, path)
+            first = time_to_first(func, path)
+            print(f"{label:28s} {elapsed * 1000:8.1f} ms  first channel {first * 1000:8.2f} ms  "
+                  f"peak {peak / 1e6:7.1f} MB  ({parsed} channels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Start z listą: parsowanie od zera vs odczyt z cache ChannelTable.
+
+Użycie: python benchmarks/bench_playlist_cache.py [liczba_kanałów]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import write_synthetic_playlist
+
+from iptvplayer import playlist_cache
+from iptvplayer.channels import ChannelTable
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['XDG_CACHE_HOME'] = os.path.join(tmp, 'cache')
+        path = write_synthetic_playlist(os.path.join(tmp, "synthetic.m3u"), count)
+
+        cold, table = timed(ChannelTable.from_playlist, path)
+        store, _ = timed(playlist_cache.store, path, table)
+        warm, cached = timed(playlist_cache.load, path)
+        assert cached is not None and len(cached) == len(table)
+        assert cached.channel(count - 1) == table.channel(count - 1)
+
+        os.utime(path)  # ten sam plik, nowy mtime -> walidacja skrótem
+        touched, cached = timed(playlist_cache.load, path)
+        assert cached is not None
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('#EXTINF:-1,Extra\nhttp://example.com/extra.m3u8\n')
+        stale, cached = timed(playlist_cache.load, path)
+        assert cached is None
+
+        size = os.path.getsize(playlist_cache.cache_path(path))
+        print(f"{count} channels, cache file {size / 1e6:.1f} MB")
+        print(f"cold parse          {cold * 1000:8.1f} ms")
+        print(f"cache write         {store * 1000:8.1f} ms")
+        print(f"warm cache load     {warm * 1000:8.1f} ms  ({cold / warm:.0f}x faster)")
+        print(f"touched file (hash) {touched * 1000:8.1f} ms")
+        print(f"changed file (miss) {stale * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
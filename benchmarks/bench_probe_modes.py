@@ -0,0 +1,39 @@
+"""Koszt jednej próby: pełny Streamlink vs lekkie poziomy z iptvplayer.probe.
+
+Mierzy czas, czas CPU procesu i bajty wysłane przez lokalny serwer HLS.
+Użycie: python benchmarks/bench_probe_modes.py [liczba_kanałów]
+"""
+import sys
+import time
+
+from hls_fixture import FixtureServer
+
+from iptvplayer.checker import StreamChecker
+from iptvplayer.probe import TIER_MEDIA, TIER_PLAYLIST, TIER_SEGMENT
+
+MODES = (
+    ("streamlink open()", 0),
+    ("tier 1: playlist", TIER_PLAYLIST),
+    ("tier 2: + media playlist", TIER_MEDIA),
+    ("tier 3: + segment range", TIER_SEGMENT),
+)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with FixtureServer() as server:
+        urls = [f"{server.base_url}/live/{i}/master.m3u8" for i in range(count)]
+        for label, depth in MODES:
+            before = dict(server.stats)
+            wall, cpu = time.perf_counter(), time.process_time()
+            with StreamChecker(max_workers=5, depth=depth) as checker:
+                alive = sum(result.ok for _, result in checker.iter_results(enumerate(urls)))
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            sent = server.stats['bytes'] - before['bytes']
+            requests = server.stats['requests'] - before['requests']
+            print(f"{label:26s} {wall / count * 1000:7.1f} ms/check  cpu {cpu / count * 1000:6.2f} ms/check  "
+                  f"{sent / count / 1024:8.1f} KiB/check  {requests / count:4.1f} req/check  ({alive}/{count} alive)")
+
+
+if __name__ == "__main__":
+    main()
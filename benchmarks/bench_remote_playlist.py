@@ -0,0 +1,89 @@
+"""Pobieranie listy z lokalnego serwera zastępczego: 200 + gzip, potem 304.
+
+Serwer obsługuje ETag, Last-Modified i kompresję gzip jak iptv-org.github.io.
+Użycie: python benchmarks/bench_remote_playlist.py [liczba_kanałów]
+"""
+import email.utils
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from synthetic import write_synthetic_playlist
+
+from iptvplayer.download import ValidatorStore, fetch_playlist
+
+
+def make_handler(body, mtime):
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    last_modified = email.utils.formatdate(mtime, usegmt=True)
+    compressed = gzip.compress(body)
+
+    class Handler(BaseHTTPRequestHandler):
+        stats = {'200': 0, '304': 0, 'bytes': 0}
+
+        def do_GET(self):
+            if self.headers.get('If-None-Match') == etag:
+                self.stats['304'] += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            payload = compressed if use_gzip else body
+            self.stats['200'] += 1
+            self.stats['bytes'] += len(payload)
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/x-mpegurl')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        source = write_synthetic_playlist(os.path.join(tmp, "source.m3u"), count)
+        with open(source, 'rb') as f:
+            body = f.read()
+        handler = make_handler(body, time.time())
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/music.m3u"
+
+        dest = os.path.join(tmp, "remote_playlist.m3u")
+        validators = ValidatorStore(os.path.join(tmp, "validators.json"))
+        try:
+            start = time.perf_counter()
+            first = fetch_playlist(url, dest, validators=validators)
+            first_time = time.perf_counter() - start
+            assert first.status == 200 and open(dest, 'rb').read() == body
+            mtime = os.stat(dest).st_mtime_ns
+
+            start = time.perf_counter()
+            second = fetch_playlist(url, dest, validators=validators)
+            second_time = time.perf_counter() - start
+            assert second.not_modified and os.stat(dest).st_mtime_ns == mtime
+        finally:
+            server.shutdown()
+
+        print(f"playlist {len(body) / 1e6:.1f} MB, sent gzip {handler.stats['bytes'] / 1e6:.1f} MB")
+        print(f"first fetch (200)       {first_time * 1000:8.1f} ms  {first.bytes_written} bytes written")
+        print(f"conditional fetch (304) {second_time * 1000:8.1f} ms  file untouched")
+
+
+if __name__ == "__main__":
+    main()
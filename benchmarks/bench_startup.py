@@ -0,0 +1,72 @@
+"""Koszt startu odtwarzacza: importy ciężkich modułów i czas do pierwszego okna.
+
+1. ``python -X importtime -c "import X"`` dla każdego z modułów ładowanych
+   teraz leniwie - tyle kosztowałby ich import przy starcie;
+2. ``-X importtime`` całego skryptu odtwarzacza uruchomionego
+   z ``IPTVPLAYER_STARTUP_PROBE=1`` (kończy się zaraz po pokazaniu okna)
+   oraz zgłoszony przez niego czas do pierwszego okna.
+
+Użycie: python benchmarks/bench_startup.py [powtórzenia]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from guard_startup_imports import FORBIDDEN, ROOT, SCRIPT
+
+HEAVY = [name for name in FORBIDDEN if name != 'aiohttp'] + ['whisper_live.client', 'piper']
+
+
+def import_cost_ms(code, env=None):
+    """Łączny czas importów z ``-X importtime`` (ms) i kod wyjścia."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_us, cumulative, name = line[12:].split('|')
+            if not name.startswith('  '):  # import najwyższego poziomu
+                try:
+                    total += int(cumulative)
+                except ValueError:
+                    pass
+    return total / 1000.0, proc
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("deferred modules (import cost avoided at startup):")
+    avoided = 0.0
+    for name in dict.fromkeys(HEAVY):
+        costs = []
+        for _ in range(runs):
+            cost, proc = import_cost_ms(['-c', f'import {name}'])
+            if proc.returncode:
+                break
+            costs.append(cost)
+        if not costs:
+            print(f"  {name:22s} not installed")
+            continue
+        avoided += min(costs)
+        print(f"  {name:22s} {min(costs):8.1f} ms")
+    print(f"  {'total':22s} {avoided:8.1f} ms (sum - shared dependencies may be counted twice)")
+
+    env = dict(os.environ, IPTVPLAYER_STARTUP_PROBE='1', QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    imports, windows = [], []
+    for _ in range(runs):
+        cost, proc = import_cost_ms([SCRIPT], env)
+        if proc.returncode:
+            print(f"player startup: failed ({proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode})")
+            return
+        imports.append(cost)
+        for line in proc.stdout.splitlines():
+            if line.startswith('startup: first window after'):
+                windows.append(float(line.split()[-2]))
+    print(f"player imports:      {statistics.median(imports):8.1f} ms (median of {runs})")
+    if windows:
+        print(f"time to first window: {statistics.median(windows):8.1f} ms (median, min {min(windows):.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
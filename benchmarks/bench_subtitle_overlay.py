@@ -0,0 +1,100 @@
+"""Koszt klatki wideo z napisami na obrazie (:class:`SubtitleOverlay`).
+
+Przerysowuje widok ``frames`` razy (jak przy każdej klatce wideo) i podaje
+czas na klatkę: bez napisów, z ``CUES`` napisami :class:`CueItem` (gotowy
+układ tekstu i obraz w pamięci podręcznej) oraz z tymi samymi napisami
+rysowanymi co klatkę przez ``drawText`` z zawijaniem - tak wyglądałby
+najprostszy overlay. Napisy z pamięcią podręczną nie mogą dokładać do
+klatki więcej niż ``MAX_OVERHEAD_US`` - inaczej kod wyjścia 1.
+
+Użycie: python benchmarks/bench_subtitle_overlay.py [klatki] [szerokość] [wysokość]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtCore import QRectF, Qt
+from qtpy.QtGui import QColor
+from qtpy.QtWidgets import QApplication, QGraphicsItem
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from iptvplayer.subtitle_overlay import CueItem, SubtitleOverlay
+
+CUES = ["The minister said that the road will reopen tomorrow morning after the repairs.",
+        "Heavy rain is expected in the north, with local flooding near the rivers."]
+MAX_OVERHEAD_US = 500
+
+
+class PlainCue(CueItem):
+    """Napis bez pamięci podręcznej, układany przez ``drawText`` przy każdym rysowaniu."""
+
+    def __init__(self, text, show_at, hide_at):
+        super().__init__(text, show_at, hide_at)
+        self.setCacheMode(QGraphicsItem.NoCache)
+
+    def paint(self, painter, option, widget=None):
+        box = self.boundingRect()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 170))
+        painter.drawRoundedRect(box, self._padding, self._padding)
+        painter.setFont(self._font)
+        painter.setPen(Qt.white)
+        inner = QRectF(box).adjusted(self._padding, self._padding, -self._padding, -self._padding)
+        painter.drawText(inner, Qt.AlignHCenter | Qt.TextWordWrap, self.text)
+
+
+def frame_cost(view, frames):
+    """Średni czas (us) przerysowania obszaru obrazu, jak przy nowej klatce wideo."""
+    viewport = view.viewport()
+    area = view.mapFromScene(view.video_item.boundingRect()).boundingRect()
+    viewport.repaint(area)   # rozgrzewka: wypełnienie pamięci podręcznej napisów
+    start = time.perf_counter()
+    for _ in range(frames):
+        viewport.repaint(area)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 1920
+    height = int(sys.argv[3]) if len(sys.argv) > 3 else 1080
+    app = QApplication.instance() or QApplication(sys.argv)
+    view = SubtitleOverlay(max_cues=len(CUES))
+    view.resize(width, height)
+    view.show()
+    app.processEvents()
+
+    empty = frame_cost(view, frames)
+    now = time.monotonic()
+    for i, text in enumerate(CUES):
+        view.add_cue(text, i * 3.0, i * 3.0 + 2.5, now)
+    cached = frame_cost(view, frames)
+
+    view.clear_cues()
+    for i, text in enumerate(CUES):
+        cue = PlainCue(text, now, now + 60)
+        cue.layout(view._font, view._max_width)
+        view._visible.append(cue)
+        view.scene().addItem(cue)
+    view._place_cues()
+    plain = frame_cost(view, frames)
+    view.close()
+
+    print(f"{width}x{height}, {frames} frames, {len(CUES)} cues:")
+    print(f"  no subtitles:        {empty:8.1f} us/frame")
+    print(f"  cached CueItem:      {cached:8.1f} us/frame (+{cached - empty:.1f})")
+    print(f"  drawText each frame: {plain:8.1f} us/frame (+{plain - empty:.1f})")
+    if cached - empty > MAX_OVERHEAD_US:
+        print(f"FAIL: subtitles add {cached - empty:.0f} us per frame (limit {MAX_OVERHEAD_US} us)")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Koszt dopisania linii napisów: :class:`SubtitleView` a przepisywanie dokumentu.
+
+Dopisuje ``lines`` linii (domyślnie 100 000) do :class:`SubtitleView`
+partiami jak z jednej klatki i mierzy czas na linię w kolejnych
+dziesięciu odcinkach. Przy stałym koszcie ostatni odcinek nie może być
+wolniejszy od pierwszego o więcej niż ``TOLERANCE`` - inaczej skrypt
+kończy się kodem 1 (można go uruchamiać jako test regresji).
+
+Dla porównania mierzony jest dawny sposób (``toPlainText() + linia``
+i ``setPlainText``) na ``OLD_LINES`` liniach - jego koszt rośnie liniowo
+z długością historii.
+
+Użycie: python benchmarks/bench_subtitle_view.py [linie] [linie_na_klatkę]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtWidgets import QApplication, QPlainTextEdit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from iptvplayer.subtitle_view import SubtitleView
+
+TOLERANCE = 2.0
+SECTIONS = 10
+OLD_LINES = 3000
+
+
+def line(n):
+    return f"Original: the quick brown fox jumps over the lazy dog {n}\nPL: szybki brązowy lis {n}"
+
+
+def bench_view(lines, per_frame):
+    view = SubtitleView(max_lines=500)
+    view.resize(800, 300)
+    view.show()
+    app = QApplication.instance()
+    section = lines // SECTIONS
+    costs = []
+    n = 0
+    for _ in range(SECTIONS):
+        start = time.perf_counter()
+        for _ in range(section // per_frame):
+            for _ in range(per_frame):
+                view.append_line(line(n))
+                n += 1
+            view.flush()            # to, co robi timer raz na klatkę
+            app.processEvents()     # przerysowanie
+        costs.append((time.perf_counter() - start) / section * 1e6)
+    blocks = view.document().blockCount()
+    view.close()
+    return costs, blocks
+
+
+def bench_old(lines):
+    box = QPlainTextEdit()
+    box.setReadOnly(True)
+    box.show()
+    app = QApplication.instance()
+    section = lines // SECTIONS
+    costs = []
+    n = 0
+    for _ in range(SECTIONS):
+        start = time.perf_counter()
+        for _ in range(section):
+            current = box.toPlainText()
+            box.setPlainText(current + "\n" + line(n) if current else line(n))
+            n += 1
+            app.processEvents()
+        costs.append((time.perf_counter() - start) / section * 1e6)
+    box.close()
+    return costs
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_frame = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    QApplication.instance() or QApplication(sys.argv)
+
+    costs, blocks = bench_view(lines, per_frame)
+    print(f"SubtitleView, {lines} lines, {per_frame} per frame ({blocks} blocks kept):")
+    print("  us/line per tenth: " + ' '.join(f"{c:.1f}" for c in costs))
+    growth = costs[-1] / costs[0]
+
+    old = bench_old(OLD_LINES)
+    print(f"setPlainText rewrite, {OLD_LINES} lines:")
+    print("  us/line per tenth: " + ' '.join(f"{c:.0f}" for c in old))
+
+    if growth > TOLERANCE:
+        print(f"FAIL: per-line cost grew {growth:.2f}x (tolerance {TOLERANCE}x)")
+        return 1
+    print(f"OK: per-line cost ratio last/first tenth {growth:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Opóźnienie pętli zdarzeń GUI: tłumaczenie w wątku GUI a :class:`TranslationStage`.
+
+Symuluje napływ ukończonych segmentów transkrypcji (``rate`` na sekundę,
+krótkie i dłuższe na przemian) i tłumacza z opóźnieniem sieci
+``latency`` sekund. Dla obu wariantów :class:`FrameMonitor` mierzy
+utracone klatki i najdłuższy przestój pętli zdarzeń, a dodatkowo liczony
+jest czas od powstania segmentu do wyświetlenia tłumaczenia.
+
+- ``gui``: jak dawniej - timer co 100 ms tłumaczy każdy segment synchronicznie,
+- ``stage``: segmenty idą do :class:`TranslationStage` (pula wątków, łączenie krótkich).
+
+Użycie: python benchmarks/bench_translation_latency.py [sekundy] [latency_s] [rate]
+"""
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QApplication
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from iptvplayer.frame_monitor import FrameMonitor
+from iptvplayer.transcription import Segment, SegmentQueue
+from iptvplayer.translation import TranslationStage
+
+WORDS = "the quick brown fox jumps over the lazy dog while the news anchor reads the weather".split()
+
+
+class SlowTranslator:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        time.sleep(self.latency)
+        return text.upper()
+
+
+def run(mode, seconds, latency, rate):
+    app = QApplication.instance() or QApplication(sys.argv)
+    monitor = FrameMonitor()
+    segments = SegmentQueue(1024)
+    translator = SlowTranslator(latency)
+    created = {}
+    delays = []
+    produced = [0]
+
+    def produce():
+        n = produced[0]
+        produced[0] += 1
+        words = 3 if n % 3 else 14
+        text = ' '.join(WORDS[(n + i) % len(WORDS)] for i in range(words)) + f' {n}'
+        start = n / rate
+        segment = Segment(text, start, start + 0.8 / rate, True)
+        created[id(segment)] = time.perf_counter()
+        segments.put(segment)
+
+    def shown(batch):
+        now = time.perf_counter()
+        delays.extend(now - created.pop(id(segment), now) for segment in batch)
+
+    if mode == 'gui':
+        def consume():
+            for segment in segments.drain():
+                translator.translate(segment.text)
+                shown([segment])
+    else:
+        stage = TranslationStage(lambda: translator, workers=2)
+        stage.translated.connect(lambda result: shown(result.segments))
+
+        def consume():
+            completed = segments.drain()
+            if completed:
+                stage.submit(completed)
+            else:
+                stage.poll()
+
+    producer = QTimer()
+    producer.timeout.connect(produce)
+    producer.start(int(1000 / rate))
+    consumer = QTimer()
+    consumer.timeout.connect(consume)
+    consumer.start(100)
+    monitor.start()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    producer.stop()
+    consumer.stop()
+    stats = monitor.stop()
+    if mode == 'stage':
+        stage.shutdown()
+    p95 = sorted(delays)[int(len(delays) * 0.95)] if delays else float('nan')
+    print(f"{mode:6s} frames {stats['frames']:5d}  dropped {stats['dropped']:5d}  "
+          f"max stall {stats['max_stall_ms']:7.1f} ms  translated {len(delays):4d}/{produced[0]:4d} segments "
+          f"in {translator.calls:4d} requests  delay median {statistics.median(delays) if delays else float('nan'):.2f}s "
+          f"p95 {p95:.2f}s")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.25
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    for mode in ('gui', 'stage'):
+        run(mode, seconds, latency, rate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Przepustowość silników tłumaczenia (linie/s) w zależności od liczby wątków.
+
+Tłumaczy ``lines`` krótkich linii napisów przez :class:`BoundedTranslator`
+z 1, 2, 4... wątkami (do liczby dostępnych rdzeni) i podaje linie na
+sekundę, opóźnienie p50/p95 oraz liczbę przekroczeń czasu. Linie są
+unikalne - pamięć tłumaczeń nie jest używana.
+
+- ``echo`` nie potrzebuje modelu; ``ECHO_LATENCY`` (s) symuluje czas tłumaczenia,
+- ``ctranslate2`` wymaga ``TRANSLATION_MODEL_DIR`` (model OPUS-MT w formacie CTranslate2);
+  każdy pomiar wczytuje model z ``inter_threads`` równym liczbie wątków,
+- ``argos`` wymaga zainstalowanego pakietu en -> ``TARGET`` (domyślnie pl),
+- ``google`` odpytuje usługę sieciową.
+
+Użycie: python benchmarks/bench_translators.py [silnik] [linie] [timeout_s] [maks_wątków]
+"""
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from iptvplayer.resources import available_cores
+from iptvplayer.translators import BoundedTranslator, TranslationTimeout, make_backend
+
+SUBJECTS = ["the minister", "our reporter", "the weather service", "local police", "the team captain"]
+VERBS = ["said", "confirmed", "announced", "warned", "explained"]
+OBJECTS = ["that the road will reopen tomorrow", "heavy rain in the north", "a new schedule for trains",
+           "the match was postponed", "prices rose again this month"]
+
+
+def lines(count):
+    return [f"{SUBJECTS[i % 5]} {VERBS[i // 5 % 5]} {OBJECTS[i // 25 % 5]} ({i})." for i in range(count)]
+
+
+def backend_options(name, threads):
+    if name == 'echo':
+        return {'latency': float(os.environ.get('ECHO_LATENCY', '0.02'))}
+    if name == 'ctranslate2':
+        return {'model_dir': os.environ.get('TRANSLATION_MODEL_DIR'), 'inter_threads': threads,
+                'intra_threads': 1, 'source_prefix': os.environ.get('TRANSLATION_SOURCE_PREFIX')}
+    return {}
+
+
+def measure(name, texts, threads, timeout):
+    source = None if name in ('google', 'echo') else 'en'
+    backend = make_backend(name, os.environ.get('TARGET', 'pl'), source=source, **backend_options(name, threads))
+    translator = BoundedTranslator(backend, timeout=timeout, workers=threads)
+    backend.translate(texts[0])  # rozgrzewka (wczytanie modelu, połączenie) bez limitu czasu
+    latencies = []
+    timeouts = 0
+
+    def one(text):
+        nonlocal timeouts
+        start = time.perf_counter()
+        try:
+            translator.translate(text)
+        except TranslationTimeout:
+            timeouts += 1
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, texts))
+    elapsed = time.perf_counter() - start
+    translator.close()
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"  {threads:3d} threads: {len(texts) / elapsed:8.1f} lines/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  timeouts {timeouts}")
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else 'echo'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    timeout = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    cores = int(sys.argv[4]) if len(sys.argv) > 4 else available_cores()
+    texts = lines(count)
+    print(f"{name}: {count} lines, up to {cores} threads, timeout {timeout:g}s")
+    threads = 1
+    while True:
+        measure(name, texts, threads, timeout)
+        if threads >= cores:
+            break
+        threads = min(threads * 2, cores)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Pula modeli WhisperLive a osobny model na połączenie: pamięć i czas do pierwszego napisu.
+
+Dla każdego trybu uruchamia serwer WhisperLive (``--no_single_model``
+albo ``--model_pool_size N``), a potem symuluje kolejne zmiany kanału:
+nowe połączenie WebSocket, przesyłanie dźwięku z pliku WAV w tempie
+rzeczywistym i pomiar czasu od połączenia do ``SERVER_READY`` oraz do
+pierwszych segmentów. Po każdej zmianie odczytywana jest pamięć (RSS)
+procesu serwera.
+
+Wymaga środowiska serwera (``python3.11`` z whisper_live) oraz pakietu
+``websocket-client``. Plik WAV: mono, 16 kHz, 16 bit.
+
+Użycie: python benchmarks/bench_whisper_pool.py nagranie.wav [zmiany] [rozmiar_puli]
+"""
+import array
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from iptvplayer.whisper_server import is_port_in_use, server_command, websocket_ping
+
+PORT = 9099
+MODEL = 'small'
+CHUNK_SECONDS = 0.25
+FIRST_SEGMENT_TIMEOUT = 120.0
+
+
+def load_audio(path):
+    with wave.open(path, 'rb') as w:
+        if w.getnchannels() != 1 or w.getframerate() != 16000 or w.getsampwidth() != 2:
+            raise SystemExit("expected mono 16 kHz 16-bit WAV")
+        samples = array.array('h', w.readframes(w.getnframes()))
+    return array.array('f', (s / 32768.0 for s in samples))
+
+
+def rss_mb(pid):
+    """RSS procesu razem z potomkami (w MB), z /proc."""
+    total = 0
+    pids = [pid]
+    while pids:
+        p = pids.pop()
+        try:
+            with open(f'/proc/{p}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+            with open(f'/proc/{p}/task/{p}/children') as f:
+                pids.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return total / 1024.0
+
+
+def switch_channel(audio):
+    """Jedno połączenie jak po zmianie kanału; zwraca (czas do SERVER_READY, czas do segmentów)."""
+    import websocket
+
+    uid = str(uuid.uuid4())
+    start = time.monotonic()
+    ws = websocket.create_connection(f'ws://localhost:{PORT}', timeout=FIRST_SEGMENT_TIMEOUT)
+    try:
+        ws.send(json.dumps({'uid': uid, 'language': 'en', 'task': 'transcribe', 'model': MODEL, 'use_vad': False}))
+        while True:
+            message = json.loads(ws.recv())
+            if message.get('message') == 'SERVER_READY':
+                ready = time.monotonic() - start
+                break
+            if message.get('status') == 'ERROR':
+                raise RuntimeError(message.get('message'))
+        step = int(16000 * CHUNK_SECONDS)
+        ws.settimeout(CHUNK_SECONDS)
+        offset = 0
+        deadline = start + FIRST_SEGMENT_TIMEOUT
+        while time.monotonic() < deadline:
+            if offset < len(audio):
+                ws.send_binary(audio[offset:offset + step].tobytes())
+                offset += step
+            try:
+                message = json.loads(ws.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            if message.get('segments'):
+                return ready, time.monotonic() - start
+        return ready, None
+    finally:
+        try:
+            ws.send_binary(b'END_OF_AUDIO')
+        except Exception:
+            pass
+        ws.close()
+
+
+def run_mode(label, command, audio, switches):
+    whisper_dir = os.path.dirname(command[1])
+    started = time.monotonic()
+    process = subprocess.Popen(command, cwd=whisper_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while not (is_port_in_use(PORT) and websocket_ping(PORT)):
+            if process.poll() is not None:
+                raise SystemExit(f"{label}: server exited with code {process.returncode}")
+            time.sleep(0.2)
+        print(f"{label}: server ready after {time.monotonic() - started:.1f}s, RSS {rss_mb(process.pid):.0f} MB")
+        firsts = []
+        for n in range(1, switches + 1):
+            ready, first = switch_channel(audio)
+            firsts.append(first if first is not None else float('inf'))
+            first_text = f"{first:6.2f}s" if first is not None else "  none"
+            print(f"  switch {n}: SERVER_READY {ready:6.2f}s  first segments {first_text}  RSS {rss_mb(process.pid):6.0f} MB")
+        print(f"  median time to first transcript: {statistics.median(firsts):.2f}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    audio = load_audio(sys.argv[1])
+    switches = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pool_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    whisper_dir = os.path.join(ROOT, 'WhisperLive')
+    if is_port_in_use(PORT):
+        raise SystemExit(f"port {PORT} is busy")
+    run_mode("model per connection", server_command(whisper_dir, PORT, model_pool_size=0), audio, switches)
+    run_mode(f"model pool ({pool_size})",
+             server_command(whisper_dir, PORT, model_pool_size=pool_size, preload_model=MODEL), audio, switches)
+
+
+if __name__ == '__main__':
+    main()
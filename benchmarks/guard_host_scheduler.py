@@ -0,0 +1,108 @@
+"""Strażnik :class:`HostScheduler`: anulowanie w trakcie prób i ponowienia po odmowie.
+
+Sprawdza (bez sieci; ostatni punkt na lokalnym serwerze HLS), że:
+
+- wynik ``cancelled`` nie jest traktowany jak przeciążenie hosta,
+- po ``cancel()`` żadne zadanie nie wraca do kolejki (wcześniej ``done()``
+  z zerwanym połączeniem na hoście, który odpowiadał, kończył się
+  ``KeyError``, bo ``cancel()`` wyczyścił kolejki hostów),
+- przed anulowaniem odmowa 503 nadal wraca do kolejki,
+- porażka Streamlink (``observe=False``) nie wraca do kolejki: strona HTML
+  na hoście, który poprawnie odpowiada, jest sprawdzana dokładnie raz
+  przez oba sposoby sprawdzania.
+
+Użycie: python benchmarks/guard_host_scheduler.py   (kod wyjścia 1 = regresja)
+"""
+import sys
+
+from hls_fixture import FixtureServer  # dodaje też katalog repozytorium do sys.path
+
+from iptvplayer.adaptive import CANCELLED, HostScheduler, is_congestion
+from iptvplayer.probe import CheckResult
+
+URLS = [f"http://h/{i}.m3u8" for i in range(4)]
+
+
+def answered_scheduler():
+    """Harmonogram z hostem ``h``, który już raz poprawnie odpowiedział."""
+    scheduler = HostScheduler(concurrency=8, per_host=8, adaptive=True)
+    scheduler.add(enumerate(URLS))
+    jobs = [scheduler.next_job() for _ in URLS]
+    tag, url = jobs.pop(0)
+    scheduler.done(tag, url, CheckResult(url, True, 0.05))
+    return scheduler, jobs
+
+
+def streamlink_fallback_once():
+    """Strona HTML po poprawnej playliście tego samego hosta - jedna próba na backend."""
+    from iptvplayer.checker import StreamChecker
+    problems = []
+    backends = [('threads', lambda: StreamChecker(max_workers=1, timeout=5))]
+    try:
+        from iptvplayer.async_checker import AsyncStreamChecker
+        backends.append(('asyncio', lambda: AsyncStreamChecker(concurrency=1, per_host=1, timeout=5,
+                                                                fallback_workers=1)))
+    except ImportError:
+        pass
+    for label, make in backends:
+        with FixtureServer() as server:
+            page = f"{server.base_url}/page/1.html"
+            jobs = [(0, f"{server.base_url}/live/1/master.m3u8"), (1, page)]
+            try:
+                checker = make()
+            except RuntimeError:  # brak aiohttp
+                continue
+            with checker:
+                results = dict(checker.iter_results(jobs))
+                retried = checker.scheduler.retried
+            fetched = server.paths['/page/1.html']
+        if not results[0].ok or results[1].ok:
+            problems.append(f"{label}: unexpected results {results}")
+        # jedna próba to GET lekkiej próby i ewentualnie jeden GET Streamlink
+        if retried or fetched > 2:
+            problems.append(f"{label}: Streamlink failure retried {retried} times, page fetched {fetched} times")
+    return problems
+
+
+def main():
+    problems = []
+
+    if is_congestion(CheckResult(URLS[0], False, error=CANCELLED)):
+        problems.append("a cancelled result counts as congestion")
+
+    scheduler, jobs = answered_scheduler()
+    scheduler.cancel()
+    outcomes = []
+    for (tag, url), error in zip(jobs, (CANCELLED, "connection reset", "HTTP 503")):
+        try:
+            observe = error != CANCELLED  # jak w iter_results: anulowane bez obserwacji
+            outcomes.append(scheduler.done(tag, url, CheckResult(url, False, 0.05, error=error), observe=observe))
+        except Exception as e:
+            problems.append(f"done() after cancel() with {error!r} raised {type(e).__name__}: {e}")
+    if any(outcomes):
+        problems.append("a job was re-queued after cancel()")
+    if scheduler.next_job() is not None or scheduler.pending_count:
+        problems.append("jobs left in the queue after cancel()")
+    if scheduler.total_in_flight:
+        problems.append(f"{scheduler.total_in_flight} jobs still counted in flight")
+
+    scheduler, jobs = answered_scheduler()
+    tag, url = jobs[0]
+    if not scheduler.done(tag, url, CheckResult(url, False, 0.05, error="HTTP 503")):
+        problems.append("HTTP 503 on an answering host was not retried")
+    for (tag, url), error in zip(jobs[1:], ("no playable streams", "")):
+        if scheduler.done(tag, url, CheckResult(url, False, 0.05, error=error), observe=False):
+            problems.append(f"unobserved Streamlink failure {error!r} was re-queued")
+
+    problems += streamlink_fallback_once()
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print("OK: cancel-then-done and retries behave")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Strażnik szybkiego startu: ciężkie moduły nie mogą być importowane przy starcie GUI.
+
+Sprawdza statycznie (AST) importy na poziomie modułu w skrypcie odtwarzacza
+i - przechodnio - w modułach ``iptvplayer``, które on importuje. Importy
+wewnątrz funkcji i metod są dozwolone (to właśnie leniwe ładowanie).
+Jeśli zależności są zainstalowane, dodatkowo importuje te moduły pakietu
+i sprawdza ``sys.modules``.
+
+Użycie: python benchmarks/guard_startup_imports.py   (kod wyjścia 1 = regresja)
+"""
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'IPTVPlayer4iptv-org_v2.5.3.py')
+FORBIDDEN = ('numpy', 'sounddevice', 'piper', 'whisper_live', 'deep_translator',
+             'argostranslate', 'ctranslate2', 'sentencepiece', 'requests', 'streamlink', 'aiohttp')
+
+
+def top_level_imports(path):
+    """Nazwy modułów importowanych poza funkcjami i klasami (z numerem linii)."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    package = None
+    if os.path.dirname(path) != ROOT:
+        package = os.path.relpath(os.path.dirname(path), ROOT).replace(os.sep, '.')
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield alias.name, node.lineno
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ''
+                if node.level:
+                    module = f"{package}.{module}" if module else package
+                yield module, node.lineno
+                for alias in node.names:  # "from . import playlist_cache"
+                    if not node.module:
+                        yield f"{module}.{alias.name}", node.lineno
+            else:
+                for field in ('body', 'orelse', 'finalbody', 'handlers'):
+                    yield from visit(getattr(node, field, ()))
+
+    yield from visit(tree.body)
+
+
+def module_path(name):
+    base = os.path.join(ROOT, *name.split('.'))
+    for candidate in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def static_check():
+    problems = []
+    seen = set()
+    stack = [(SCRIPT, os.path.basename(SCRIPT))]
+    package_modules = []
+    while stack:
+        path, label = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for name, line in top_level_imports(path):
+            root = name.split('.')[0]
+            if root in FORBIDDEN:
+                problems.append(f"{label}:{line} imports {name} at module level")
+            elif root == 'iptvplayer':
+                target = module_path(name)
+                if target:
+                    stack.append((target, os.path.relpath(target, ROOT)))
+                    if name not in package_modules:
+                        package_modules.append(name)
+    return problems, package_modules
+
+
+def runtime_check(modules):
+    code = (
+        "import sys\n"
+        f"for name in {modules!r}:\n"
+        "    try:\n"
+        "        __import__(name)\n"
+        "    except ImportError as e:\n"
+        "        print('skip', name, e.name)\n"
+        f"print('loaded', *[m for m in {FORBIDDEN!r} if m in sys.modules])\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True).stdout
+    skipped = [line.split()[1:] for line in output.splitlines() if line.startswith('skip ')]
+    loaded = next((line.split()[1:] for line in output.splitlines() if line.startswith('loaded')), [])
+    return skipped, loaded
+
+
+def main():
+    problems, modules = static_check()
+    skipped, loaded = runtime_check(modules)
+    problems += [f"importing the GUI's iptvplayer modules loads {name}" for name in loaded]
+    print(f"checked {os.path.basename(SCRIPT)} and {len(modules)} iptvplayer modules")
+    for name, missing in skipped:
+        print(f"  runtime import of {name} skipped ({missing} not installed)")
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    if not problems:
+        print("  OK: no heavy optional modules imported at startup")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Lokalny serwer HLS do benchmarków sprawdzania kanałów.
+
+``/live/<id>/master.m3u8`` -> dwa warianty, każdy z playlistą mediów
+i trzema segmentami TS; ``/dead/...`` zwraca 404, a ``/page/...`` stronę
+HTML (kanał wymagający wtyczki Streamlink). Opóźnienie odpowiedzi
+ustawia się atrybutem ``latency`` (sekundy); z ``capacity`` serwer
+symuluje przeciążenie - powyżej tylu zapytań naraz opóźnienie rośnie
+proporcjonalnie do ich liczby, a powyżej dwukrotności odpowiada 503.
+``stats`` zlicza zapytania, wysłane bajty
+i najwyższą liczbę zapytań obsługiwanych naraz, a ``paths`` - zapytania
+o każdą ścieżkę. Segmenty obsługują
+nagłówek ``Range``.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+TS_PACKET = b'\x47' + b'\x1f\xff\x10' + b'\xff' * 184
+SEGMENT = TS_PACKET * 1000  # ~188 kB
+
+MASTER = (
+    "#EXTM3U\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=2000000,RESOLUTION=1280x720\n"
+    "hi/index.m3u8{query}\n"
+    "#EXT-X-STREAM-INF:BANDWIDTH=500000,RESOLUTION=640x360\n"
+    "lo/index.m3u8{query}\n"
+)
+
+
+def media_playlist(sequence):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:6",
+             f"#EXT-X-MEDIA-SEQUENCE:{sequence}"]
+    for n in range(sequence, sequence + 3):
+        lines += ["#EXTINF:6.0,", f"seg{n}.ts"]
+    return "\n".join(lines) + "\n"
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, latency=0.0, host='127.0.0.1', port=0, capacity=None):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.capacity = capacity
+        self.active = 0
+        self.stats = {'requests': 0, 'bytes': 0, 'connections': 0, 'peak_active': 0}
+        self.paths = Counter()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def delay(self):
+        """Opóźnienie przy bieżącym obciążeniu albo ``None`` (odmowa 503)."""
+        with self._lock:
+            self.active += 1
+            self.stats['peak_active'] = max(self.stats['peak_active'], self.active)
+            active = self.active
+        if self.capacity and active > 2 * self.capacity:
+            return None
+        if self.capacity and active > self.capacity:
+            return self.latency * active / self.capacity
+        return self.latency
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+    def count(self, nbytes, path):
+        with self._lock:
+            self.paths[path] += 1
+            self.stats['requests'] += 1
+            self.stats['bytes'] += nbytes
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):  # klient zerwał po przekroczeniu czasu
+            super().handle_error(request, client_address)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.stats['connections'] += 1
+
+    def _send(self, status, body=b'', content_type='application/vnd.apple.mpegurl', extra=()):
+        delay = self.server.delay()
+        try:
+            if delay is None:
+                status, body, content_type = 503, b'overloaded', 'text/plain'
+            elif delay:
+                time.sleep(delay)
+        finally:
+            self.server.release()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in extra:
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        self.server.count(len(body) if self.command != 'HEAD' else 0, self.path.partition('?')[0])
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path.startswith('/dead/'):
+            return self._send(404, b'not found', 'text/plain')
+        if path.startswith('/page/'):
+            return self._send(200, b'<!DOCTYPE html><html><body>player</body></html>', 'text/html')
+        if path.endswith('/master.m3u8'):
+            return self._send(200, MASTER.format(query='?' + query if query else '').encode())
+        if path.endswith('/index.m3u8'):
+            return self._send(200, media_playlist(int(time.time() // 6)).encode())
+        if path.endswith('.ts'):
+            body = SEGMENT
+            match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+            if match:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(body) - 1
+                body = body[start:end + 1]
+                extra = [('Content-Range', f'bytes {start}-{start + len(body) - 1}/{len(SEGMENT)}')]
+                return self._send(206, body, 'video/mp2t', extra)
+            return self._send(200, body, 'video/mp2t')
+        return self._send(404, b'not found', 'text/plain')
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,24 @@
+"""Generator syntetycznych list M3U używany przez benchmarki."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+GROUPS = ["Music", "News", "Sports", "Movies", "Kids", "Documentary", "Religious", "Undefined"]
+
+
+def write_synthetic_playlist(path, count, hosts=50):
+    """Zapisuje listę z ``count`` kanałami w stylu indeksu iptv-org."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("#EXTM3U\n")
+        for i in range(count):
+            group = GROUPS[i % len(GROUPS)]
+            f.write(
+                f'#EXTINF:-1 tvg-id="Channel{i}.pl" tvg-name="Channel {i}" '
+                f'tvg-logo="https://i.imgur.com/logo{i}.png" group-title="{group}",'
+                f'Channel {i} (1080p) [Geo-blocked]\n'
+            )
+            f.write(f"https://cdn{i % hosts}.example.com/live/{i}/index.m3u8\n")
+    return path
@@ -0,0 +1,9 @@
+"""Wspólne moduły odtwarzacza IPTV (parsowanie, sprawdzanie, napisy).
+
+Qt (przez qtpy) importują tylko widoki i obiekty wysyłające sygnały Qt:
+``check_job``, ``check_stats_panel``, ``debug_panel``, ``frame_monitor``,
+``playlist_loader``, ``playlist_model``, ``subtitle_overlay``,
+``subtitle_view`` i ``translation``. Pozostałe moduły (m.in. ``m3u``,
+``channels``, ``checker``, ``async_checker``, ``translators``,
+``whisper_server``) działają także bez interfejsu graficznego.
+"""
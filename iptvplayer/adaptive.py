@@ -0,0 +1,300 @@
+"""Adaptacyjna liczba równoczesnych prób (AIMD) i kolejka per host.
+
+:class:`AIMDLimiter` zbiera czasy kolejnych prób w oknach po
+``window`` wyników (mniej, gdy limit jest niski - okno odpowiada wtedy
+jednej "rundzie" prób, jak RTT w TCP). Po każdym oknie limit:
+
+* maleje multiplikatywnie (``* decrease``), gdy odsetek przekroczeń czasu
+  jest większy niż ``timeout_rate`` albo wybrany percentyl opóźnienia
+  (domyślnie p95) przekracza ``latency_factor`` razy najniższą
+  zaobserwowaną medianę (kolejki po stronie serwera lub łącza);
+* w przeciwnym razie rośnie - dwukrotnie do pierwszego spadku (jak slow
+  start w TCP), potem addytywnie o ``increase``.
+
+:class:`HostScheduler` przydziela zadania naprzemiennie z kolejek
+poszczególnych hostów, pilnując limitu globalnego i osobnego limitu AIMD
+każdego hosta, więc jeden wolny CDN nie zajmuje wszystkich miejsc.
+Limit hosta reaguje na jego p95 i na porażki bez właściwej odpowiedzi
+(przekroczenia czasu, zerwane połączenia, 429/503). Limit globalny ma wykrywać wąskie gardło wspólne dla wszystkich
+(łącze, DNS, CPU), więc dostaje opóźnienia względne (do mediany danego
+hosta), patrzy na ich medianę z wyższym progiem i tylko na przekroczenia
+czasu - jeden przeciążony albo po prostu odległy host nie obniża go,
+a krótkie przeciążenie wszystkich hostów naraz (zanim zareagują ich
+własne limity) nie zbija go poniżej 1/10 maksimum. Takie porażki
+liczą się tylko u hostów, które choć raz odpowiedziały: hostowi całkiem
+martwemu mniejsza liczba prób nic by nie pomogła.
+Obie klasy nie zależą od sposobu wykonywania prób (wątki czy asyncio).
+"""
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from .probe import NO_SEGMENTS, TIMEOUT
+
+
+CANCELLED = 'cancelled'  # błąd wyniku próby porzuconej po anulowaniu sprawdzania
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def is_timeout(result):
+    error = (result.error or '').lower()
+    return error == TIMEOUT or 'timeout' in error or 'timed out' in error
+
+
+def is_congestion(result):
+    """Porażka bez właściwej odpowiedzi: przekroczenie czasu, zerwane połączenie
+    albo odmowa 429/503 - w odróżnieniu od np. 404, pustej playlisty czy próby
+    anulowanej przez :meth:`HostScheduler.cancel`."""
+    if result.ok:
+        return False
+    error = result.error or ''
+    if error == CANCELLED:
+        return False
+    if error.endswith(('HTTP 429', 'HTTP 503')):
+        return True
+    return 'HTTP ' not in error and error != NO_SEGMENTS
+
+
+class AIMDLimiter:
+    def __init__(self, initial, minimum=1, maximum=None, window=20, increase=1, decrease=0.7,
+                 latency_factor=3.0, timeout_rate=0.05, signal_percentile=0.95):
+        self.minimum = minimum
+        self.maximum = maximum or max(initial, minimum)
+        self.limit = max(minimum, min(initial, self.maximum))
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.timeout_rate = timeout_rate
+        self.signal_percentile = signal_percentile
+        self.slow_start = True
+        self.baseline = None  # najniższa mediana okna
+        self.p50 = self.p95 = 0.0
+        self.last_timeout_rate = 0.0
+        self.increases = self.decreases = 0
+        self.last_reason = 'start'
+        self._latencies = []
+        self._timeouts = 0
+
+    def observe(self, latency, timed_out=False):
+        """Dodaje wynik próby; zwraca nowy limit, jeśli okno zmieniło decyzję.
+
+        Opóźnienie przekroczeń czasu (i odmów) nie trafia do percentyli -
+        szybka odmowa zaniżyłaby medianę bazową.
+        """
+        if timed_out:
+            self._timeouts += 1
+        else:
+            self._latencies.append(latency)
+        if len(self._latencies) + self._timeouts < min(self.window, max(4, self.limit)):
+            return None
+        return self._decide()
+
+    def _decide(self):
+        latencies = sorted(self._latencies)
+        timeouts = self._timeouts
+        self._latencies = []
+        self._timeouts = 0
+
+        self.last_timeout_rate = timeouts / (len(latencies) + timeouts)
+        if latencies:
+            self.p50 = percentile(latencies, 0.50)
+            self.p95 = percentile(latencies, 0.95)
+            if self.baseline is None or self.p50 < self.baseline:
+                self.baseline = self.p50
+
+        old = self.limit
+        if self.last_timeout_rate > self.timeout_rate:
+            self.last_reason = f"timeouts {self.last_timeout_rate:.0%}"
+        elif self.baseline and percentile(latencies, self.signal_percentile) > self.latency_factor * self.baseline:
+            slowdown = percentile(latencies, self.signal_percentile) / self.baseline
+            self.last_reason = f"p{self.signal_percentile * 100:.0f} {slowdown:.1f}x baseline"
+        else:
+            if self.slow_start:
+                self.limit = min(self.maximum, self.limit * 2)
+            else:
+                self.limit = min(self.maximum, self.limit + self.increase)
+            if self.limit != old:
+                self.increases += 1
+                self.last_reason = 'increase'
+            return self.limit
+
+        self.slow_start = False
+        self.limit = max(self.minimum, int(self.limit * self.decrease))
+        if self.limit != old:
+            self.decreases += 1
+        return self.limit
+
+    def stats(self):
+        return {
+            'limit': self.limit,
+            'p50_ms': self.p50 * 1000.0,
+            'p95_ms': self.p95 * 1000.0,
+            'timeout_rate': self.last_timeout_rate,
+            'increases': self.increases,
+            'decreases': self.decreases,
+            'reason': self.last_reason,
+        }
+
+
+class HostScheduler:
+    """Kolejki zadań (znacznik, adres) per host z limitami AIMD.
+
+    Metody są bezpieczne wątkowo. :meth:`next_job` zwraca kolejne zadanie,
+    które mieści się w limitach, albo ``None``; po zakończeniu próby trzeba
+    wywołać :meth:`done` z jej wynikiem. Odmowy 429/503 i zerwane połączenia
+    hosta, który odpowiada, wracają do kolejki (najwyżej ``retries`` razy),
+    bo nie świadczą o martwym kanale. Z ``adaptive=False`` limity są
+    stałe (``concurrency`` i ``per_host``), a kolejność nadal naprzemienna.
+    """
+
+    def __init__(self, concurrency=200, per_host=8, adaptive=True, initial=16, initial_per_host=4, retries=2):
+        if not adaptive:
+            initial, initial_per_host = concurrency, per_host
+        self.adaptive = adaptive
+        self.global_limit = AIMDLimiter(min(initial, concurrency), minimum=max(min(4, concurrency), concurrency // 10),
+                                        maximum=concurrency, increase=max(1, concurrency // 50),
+                                        latency_factor=5.0, timeout_rate=0.2, signal_percentile=0.5)
+        self.per_host = per_host
+        self.initial_per_host = initial_per_host
+        self._hosts = {}         # host -> AIMDLimiter
+        self._pending = {}       # host -> deque zadań
+        self._in_flight = {}     # host -> liczba prób w toku
+        self._ready = deque()    # hosty z zadaniami i wolnym miejscem
+        self._queued = set()
+        self._answered = set()   # hosty, które choć raz odpowiedziały w czasie
+        self._attempts = {}      # (znacznik, adres) -> liczba powtórzeń po odmowie
+        self.retries = retries
+        self.retried = 0
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=200)  # ostatnie opóźnienia - tylko do statystyk
+        self.total_in_flight = 0
+        self.pending_count = 0
+        self.completed = 0
+        self.started = time.monotonic()
+
+    @staticmethod
+    def host_of(url):
+        return urlsplit(url).netloc.lower()
+
+    def _host_limit(self, host):
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = AIMDLimiter(
+                min(self.initial_per_host, self.per_host), minimum=max(1, self.per_host // 4),
+                maximum=self.per_host, window=8)
+        return limiter
+
+    def _mark_ready(self, host):
+        if host not in self._queued and self._pending.get(host) \
+                and self._in_flight.get(host, 0) < self._host_limit(host).limit:
+            self._queued.add(host)
+            self._ready.append(host)
+
+    def add(self, jobs):
+        with self._lock:
+            for tag, url in jobs:
+                host = self.host_of(url)
+                queue = self._pending.get(host)
+                if queue is None:
+                    queue = self._pending[host] = deque()
+                queue.append((tag, url))
+                self.pending_count += 1
+                self._mark_ready(host)
+
+    def next_job(self):
+        with self._lock:
+            if self.total_in_flight >= self.global_limit.limit or not self._ready:
+                return None
+            host = self._ready.popleft()
+            self._queued.discard(host)
+            tag, url = self._pending[host].popleft()
+            self.pending_count -= 1
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            self.total_in_flight += 1
+            self._mark_ready(host)  # na koniec kolejki - naprzemiennie między hostami
+            return tag, url
+
+    def done(self, tag, url, result, observe=True):
+        """Zwalnia miejsce zadania; ``observe=False`` pomija wynik w AIMD (np. Streamlink).
+
+        Zwraca ``True``, jeśli zadanie wróciło do kolejki i wyniku nie należy zgłaszać.
+        """
+        host = self.host_of(url)
+        # Tylko wyniki lekkiej próby HTTP mówią coś o obciążeniu hosta; porażka
+        # Streamlink (np. "no playable streams") jest ostateczna i nie wraca do kolejki
+        congested = observe and is_congestion(result)
+        timed_out = congested and is_timeout(result)
+        with self._lock:
+            self._in_flight[host] -= 1
+            self.total_in_flight -= 1
+            self.completed += 1
+            if observe:
+                self._recent.append(result.latency)
+                if not congested:
+                    self._answered.add(host)
+            if self.adaptive and observe:
+                host_limit = self._host_limit(host)
+                if host not in self._answered:
+                    host_limit.observe(result.latency)
+                else:
+                    if timed_out:
+                        self.global_limit.observe(result.latency, True)
+                    elif not congested:
+                        baseline = host_limit.baseline
+                        self.global_limit.observe(result.latency / baseline if baseline else 1.0)
+                    host_limit.observe(result.latency, congested)
+            requeue = (observe and congested and not timed_out and not self.cancelled and host in self._answered
+                       and self._attempts.get((tag, url), 0) < self.retries)
+            if requeue:
+                self._attempts[(tag, url)] = self._attempts.get((tag, url), 0) + 1
+                self._pending.setdefault(host, deque()).append((tag, url))
+                self.pending_count += 1
+                self.retried += 1
+            self._mark_ready(host)
+            return requeue
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            self._pending.clear()
+            self._ready.clear()
+            self._queued.clear()
+            self.pending_count = 0
+
+    def host_limits(self):
+        """Bieżący limit każdego hosta (z ``adaptive=False`` - stały ``per_host``)."""
+        with self._lock:
+            return {host: limiter.limit for host, limiter in self._hosts.items()}
+
+    def stats(self):
+        with self._lock:
+            stats = self.global_limit.stats()
+            recent = sorted(self._recent)
+            # globalnie próbki są krotnościami mediany hosta, nie milisekundami
+            stats['slowdown'] = stats.pop('p50_ms') / 1000.0
+            del stats['p95_ms']
+            throttled = [(host, limiter.limit) for host, limiter in self._hosts.items()
+                         if limiter.limit < self.per_host and self._pending.get(host)]
+            elapsed = time.monotonic() - self.started
+            stats.update({
+                'in_flight': self.total_in_flight,
+                'pending': self.pending_count,
+                'completed': self.completed,
+                'rate': self.completed / elapsed if elapsed > 0 else 0.0,
+                'p50_ms': percentile(recent, 0.50) * 1000.0,
+                'p95_ms': percentile(recent, 0.95) * 1000.0,
+                'retried': self.retried,
+                'hosts': len(self._hosts),
+                'throttled_hosts': sorted(throttled, key=lambda item: item[1])[:5],
+                'throttled_count': len(throttled),
+            })
+            return stats
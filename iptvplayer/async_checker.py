@@ -0,0 +1,183 @@
+"""Sprawdzanie dostępności kanałów na asyncio/aiohttp - setki prób naraz.
+
+Każdy adres HTTP(S) sprawdzany jest tą samą stopniowaną próbą co w
+:mod:`iptvplayer.probe` (playlista, playlista mediów, opcjonalnie początek
+segmentu). Liczbę prób w toku, globalnie i osobno dla każdego hosta,
+dobiera :class:`~iptvplayer.adaptive.HostScheduler`. Adresy spoza HTTP i strony wymagające wtyczki trafiają do
+:class:`StreamChecker` (Streamlink) w puli wątków.
+
+Pętla zdarzeń działa we własnym wątku, a :meth:`AsyncStreamChecker.iter_results`
+oddaje wyniki zwykłym generatorem, zaraz po ukończeniu każdej próby.
+"""
+import asyncio
+import queue
+import threading
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .adaptive import CANCELLED, HostScheduler
+from .checker import CHECK_TIMEOUT, StreamChecker
+from .probe import TIER_MEDIA, CheckResult, error_message, is_http, probe_result, probe_steps
+
+_DONE = object()
+
+
+class AsyncStreamChecker:
+    """Sprawdzanie wielu adresów naraz z limitem globalnym i per host."""
+
+    def __init__(self, concurrency=200, per_host=8, timeout=CHECK_TIMEOUT, fallback_workers=5, depth=TIER_MEDIA,
+                 adaptive=True):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the asyncio checker")
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.adaptive = adaptive
+        self.scheduler = None
+        self.timeout = timeout
+        self.depth = depth
+        self.fallback_workers = fallback_workers
+        self._fallback = None
+        self._loop = None
+        self._main = None
+        self._cancelled = False
+
+    # --- próby -----------------------------------------------------------
+
+    async def _get(self, session, url, limit, headers=None):
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            data = bytearray()
+            while len(data) < limit:
+                chunk = await response.content.read(limit - len(data))
+                if not chunk:
+                    break
+                data += chunk
+            return response.status, response.headers.get('Content-Type'), bytes(data), str(response.url)
+
+    async def probe(self, session, url):
+        """Odpowiednik :meth:`iptvplayer.probe.HLSProbe.probe` na aiohttp (decyzje w :func:`probe_steps`)."""
+        start = time.monotonic()
+        steps = probe_steps(url, self.depth)
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(await self._get(session, *request))
+        except StopIteration as stop:
+            return probe_result(url, stop.value, time.monotonic() - start)
+        except Exception as e:  # ClientError, przekroczenia czasu, błędne adresy, zerwane połączenia
+            return CheckResult(url, False, time.monotonic() - start, error_message(e))
+
+    async def _fallback_check(self, url):
+        if self._fallback is None:
+            self._fallback = StreamChecker(max_workers=self.fallback_workers, timeout=self.timeout)
+        return await asyncio.get_running_loop().run_in_executor(None, self._fallback.check_streamlink, url)
+
+    async def _check(self, session, fallback, tag, url, finished):
+        """Wynik trafia do ``finished`` zawsze - inaczej ``_run`` czekałby na niego bez końca."""
+        result = None
+        probed = False
+        try:
+            if self.depth and is_http(url):
+                result = await self.probe(session, url)
+            probed = result is not None
+            if result is None:
+                async with fallback:
+                    result = await self._fallback_check(url)
+        except Exception as e:  # np. brak Streamlink przy próbie zastępczej
+            result, probed = CheckResult(url, False, error=str(e) or type(e).__name__), False
+        finally:
+            if result is None:  # zadanie anulowane
+                result = CheckResult(url, False, error=CANCELLED)
+            finished.put_nowait((tag, url, result, probed))
+
+    async def _run(self, emit):
+        self._main = asyncio.current_task()
+        if self._cancelled:
+            return
+        scheduler = self.scheduler
+        fallback = asyncio.Semaphore(self.fallback_workers)
+        finished = asyncio.Queue()
+        tasks = set()
+        timeout = aiohttp.ClientTimeout(total=self.timeout * 2, sock_connect=self.timeout, sock_read=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            try:
+                while True:
+                    job = scheduler.next_job()
+                    while job is not None:
+                        task = asyncio.ensure_future(self._check(session, fallback, job[0], job[1], finished))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                        job = scheduler.next_job()
+                    if not scheduler.total_in_flight:
+                        break
+                    tag, url, result, probed = await finished.get()
+                    if not scheduler.done(tag, url, result, observe=probed):
+                        emit((tag, result))
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    # --- interfejs wspólny z StreamChecker --------------------------------
+
+    def iter_results(self, jobs):
+        """Dla par (znacznik, adres) zwraca (znacznik, CheckResult) w kolejności ukończenia."""
+        results = queue.Queue()
+        self._cancelled = False
+        self.scheduler = HostScheduler(self.concurrency, self.per_host, self.adaptive)
+        self.scheduler.add(jobs)
+
+        def run_loop():
+            loop = self._loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._run(results.put))
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                print(f"Async checker error: {e}")
+            finally:
+                loop.close()
+                self._loop = self._main = None
+                results.put(_DONE)
+
+        thread = threading.Thread(target=run_loop, name="async-checker", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.cancel()
+            thread.join()
+
+    def stats(self):
+        """Decyzje harmonogramu bieżącego przebiegu (pusty słownik przed startem)."""
+        return self.scheduler.stats() if self.scheduler is not None else {}
+
+    def cancel(self):
+        self._cancelled = True
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+        loop, main = self._loop, self._main
+        if loop is not None and main is not None:
+            try:
+                loop.call_soon_threadsafe(main.cancel)
+            except RuntimeError:
+                pass  # pętla już zamknięta
+
+    def close(self):
+        self.cancel()
+        if self._fallback is not None:
+            self._fallback.close()
+            self._fallback = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,205 @@
+"""Kolumnowa tabela kanałów współdzielona przez listę, sprawdzanie i zapis.
+
+Zamiast słownika na kanał (z kopią surowej linii EXTINF) tabela trzyma
+osobne kolumny: nazwy, adresy i wartości atrybutów w pulach UTF-8
+(:class:`StringColumn`), a identyfikatory grup i układów atrybutów
+w ``array('I')``. Nazwy grup i układy (czas trwania, krotka kluczy)
+są internowane w pulach, więc wiersz nie tworzy żadnego obiektu Pythona.
+Zapis (:meth:`ChannelTable.write_m3u`) odtwarza czas trwania, kolejność
+atrybutów i ``#EXTGRP`` tak jak w pliku źródłowym.
+"""
+from array import array
+
+from .m3u import DEFAULT_GROUP, Channel, iter_playlist
+
+_tuple_new = tuple.__new__
+_SEPARATOR = '\x1f'
+_ESCAPE = '\x1e'    # w zapisanej wartości \x1e to \x1e0, a \x1f to \x1e1
+
+
+def _escape_values(values):
+    return _SEPARATOR.join(value.replace(_ESCAPE, _ESCAPE + '0').replace(_SEPARATOR, _ESCAPE + '1')
+                           for value in values)
+
+
+def _split_values(stored):
+    values = stored.split(_SEPARATOR)
+    if _ESCAPE in stored:
+        values = [value.replace(_ESCAPE + '1', _SEPARATOR).replace(_ESCAPE + '0', _ESCAPE) for value in values]
+    return tuple(values)
+
+
+class StringColumn:
+    """Kolumna napisów zapisana jako jeden bufor UTF-8 i tablica przesunięć."""
+
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+
+    def append(self, text):
+        self._data += text.encode('utf-8', 'surrogatepass')
+        self._offsets.append(len(self._data))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        offsets = self._offsets
+        if index < 0:
+            index += len(offsets) - 1
+        return self._data[offsets[index]:offsets[index + 1]].decode('utf-8', 'surrogatepass')
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def nbytes(self):
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+    def to_bytes(self):
+        return bytes(self._data), self._offsets.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, offsets):
+        column = cls()
+        column._data = bytearray(data)
+        column._offsets = array('Q')
+        column._offsets.frombytes(offsets)
+        return column
+
+
+class ChannelTable:
+    """Tabela kanałów adresowana numerem wiersza."""
+
+    def __init__(self):
+        self.names = StringColumn()
+        self.urls = StringColumn()
+        self.group_ids = array('I')
+        self.groups = []                # pula nazw grup
+        self._group_index = {}
+        self.layout_ids = array('I')
+        self.layouts = []               # pula (czas trwania, klucze, pozycja group-title poza wartościami albo -1)
+        self._layout_index = {}
+        self.attr_values = StringColumn()  # wartości (bez group-title równego grupie) połączone \x1f, patrz _escape_values
+
+    @classmethod
+    def from_playlist(cls, source):
+        table = cls()
+        table.extend(iter_playlist(source))
+        return table
+
+    def __len__(self):
+        return len(self.urls)
+
+    def dump_columns(self):
+        """Kolumny jako proste typy (bytes, listy, krotki) - do zapisu w cache."""
+        return (
+            self.names.to_bytes(), self.urls.to_bytes(), self.attr_values.to_bytes(),
+            self.group_ids.tobytes(), self.groups,
+            self.layout_ids.tobytes(), self.layouts,
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        names, urls, attr_values, group_ids, groups, layout_ids, layouts = columns
+        table = cls()
+        table.names = StringColumn.from_bytes(*names)
+        table.urls = StringColumn.from_bytes(*urls)
+        table.attr_values = StringColumn.from_bytes(*attr_values)
+        table.group_ids.frombytes(group_ids)
+        table.groups = list(groups)
+        table._group_index = {group: gid for gid, group in enumerate(table.groups)}
+        table.layout_ids.frombytes(layout_ids)
+        table.layouts = [(duration, tuple(keys), skip) for duration, keys, skip in layouts]
+        table._layout_index = {(duration, keys, skip >= 0): layout_id
+                               for layout_id, (duration, keys, skip) in enumerate(table.layouts)}
+        return table
+
+    def clear(self):
+        self.__init__()
+
+    def group_id(self, group):
+        gid = self._group_index.get(group)
+        if gid is None:
+            gid = self._group_index[group] = len(self.groups)
+            self.groups.append(group)
+        return gid
+
+    def _layout(self, duration, keys, stripped):
+        """Id układu; ``stripped`` - wartość group-title jest w kolumnie grup, nie w wartościach."""
+        entry = (duration, keys, stripped)
+        layout_id = self._layout_index.get(entry)
+        if layout_id is None:
+            layout_id = self._layout_index[entry] = len(self.layouts)
+            self.layouts.append((duration, keys, keys.index('group-title') if stripped else -1))
+        return layout_id
+
+    def append(self, channel):
+        """Dodaje rekord :class:`~iptvplayer.m3u.Channel`; zwraca numer wiersza."""
+        row = len(self.urls)
+        keys = channel.attr_keys
+        values = channel.attr_values
+        skip = keys.index('group-title') if 'group-title' in keys else -1
+        stripped = skip >= 0 and values[skip] == channel.group
+        layout_id = self._layout(channel.duration, keys, stripped)
+        if stripped:
+            values = values[:skip] + values[skip + 1:]
+        self.names.append(channel.name)
+        self.urls.append(channel.url)
+        self.group_ids.append(self.group_id(channel.group))
+        self.layout_ids.append(layout_id)
+        joined = _SEPARATOR.join(values)
+        # rzadkie: \x1e albo \x1f w samej wartości - wtedy wartości są escapowane
+        if _ESCAPE in joined or _SEPARATOR in joined and joined.count(_SEPARATOR) >= len(values):
+            joined = _escape_values(values)
+        self.attr_values.append(joined)
+        return row
+
+    def extend(self, channels):
+        for channel in channels:
+            self.append(channel)
+
+    def group(self, row):
+        return self.groups[self.group_ids[row]]
+
+    def values(self, row):
+        """Wartości atrybutów wiersza w kolejności kluczy układu (z group-title)."""
+        _, keys, skip = self.layouts[self.layout_ids[row]]
+        stored = len(keys) - (skip >= 0)
+        values = _split_values(self.attr_values[row]) if stored else ()
+        if skip >= 0:
+            values = values[:skip] + (self.group(row),) + values[skip:]
+        return values
+
+    def get(self, row, key, default=None):
+        """Zwraca atrybut EXTINF wiersza (np. ``tvg-logo``)."""
+        if key == 'group-title':
+            return self.group(row)
+        keys = self.layouts[self.layout_ids[row]][1]
+        return self.values(row)[keys.index(key)] if key in keys else default
+
+    def channel(self, row):
+        """Odtwarza rekord :class:`Channel` dla wiersza (np. do eksportu)."""
+        duration, keys, _ = self.layouts[self.layout_ids[row]]
+        return _tuple_new(Channel, (
+            self.names[row], self.group(row), self.urls[row], keys, self.values(row), duration,
+        ))
+
+    def extinf(self, row):
+        duration, keys, _ = self.layouts[self.layout_ids[row]]
+        attrs = ''.join(f' {key}="{value}"' for key, value in zip(keys, self.values(row)))
+        return f'#EXTINF:{duration}{attrs},{self.names[row]}'
+
+    def write_m3u(self, file, rows=None):
+        """Zapisuje wybrane wiersze (domyślnie wszystkie) jako listę M3U.
+
+        Grupa bez ``group-title`` (z dyrektywy ``#EXTGRP``) wraca jako ``#EXTGRP``.
+        """
+        file.write("#EXTM3U\n")
+        for row in range(len(self)) if rows is None else rows:
+            file.write(f'{self.extinf(row)}\n')
+            group = self.group(row)
+            if group != DEFAULT_GROUP and 'group-title' not in self.layouts[self.layout_ids[row]][1]:
+                file.write(f'#EXTGRP:{group}\n')
+            file.write(f'{self.urls[row]}\n')
@@ -0,0 +1,93 @@
+"""Sprawdzanie dostępności kanałów w wątku roboczym z raportowaniem do GUI."""
+import time
+from array import array
+
+from qtpy.QtCore import QThread, Signal
+
+from .check_run import CheckRun
+from .checker import make_checker
+from .health_store import HealthStore
+
+
+class StreamCheckJob(QThread):
+    """Sprawdza wiersze tabeli kanałów poza wątkiem GUI.
+
+    Postęp i nowe działające wiersze zgłaszane są sygnałem ``progress``
+    najwyżej co :attr:`REPORT_INTERVAL` sekund, niezależnie od tempa
+    napływu wyników, więc GUI nie jest zalewane zdarzeniami. Wyniki świeże
+    w :class:`~iptvplayer.health_store.HealthStore` zgłaszane są od razu,
+    bez nowej próby, a powtórzone adresy sprawdzane są raz
+    (:mod:`~iptvplayer.dedup`). :meth:`cancel` porzuca oczekujące próby natychmiast.
+    Razem z postępem wysyłany jest stan harmonogramu (``scheduler_stats``).
+    """
+
+    progress = Signal(object, int, int)      # nowe działające wiersze, sprawdzone, wszystkie
+    scheduler_stats = Signal(object)         # słownik z HostScheduler.stats()
+    check_finished = Signal(int, int, bool, int)  # sprawdzone, działające, czy przerwane, zaoszczędzone próby
+    check_failed = Signal(str)
+
+    REPORT_INTERVAL = 0.1
+
+    def __init__(self, table, rows, backend='asyncio', concurrency=None, depth=2, adaptive=True,
+                 health_ttl=None, health_backoff=None, parent=None):
+        super().__init__(parent)
+        self.urls = table.urls
+        self.rows = rows
+        self.backend = backend
+        self.concurrency = concurrency
+        self.depth = depth
+        self.adaptive = adaptive
+        self.health_ttl = health_ttl
+        self.health_backoff = health_backoff
+        self._run = None
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+        run = self._run
+        if run is not None:
+            run.cancel()
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def _health_store(self):
+        options = {}
+        if self.health_ttl is not None:
+            options['ttl'] = self.health_ttl
+        if self.health_backoff is not None:
+            options['backoff_base'] = self.health_backoff
+        return HealthStore(**options)
+
+    def run(self):
+        total = len(self.rows)
+        checked = alive_count = 0
+        run = None
+        try:
+            checker = make_checker(self.backend, self.concurrency, depth=self.depth, adaptive=self.adaptive)
+            with self._health_store() as health, checker:
+                run = self._run = CheckRun(checker, health)
+                if self._cancelled:
+                    run.cancel()
+                urls = self.urls
+                alive = array('I')
+                deadline = time.monotonic() + self.REPORT_INTERVAL
+                try:
+                    for row, result in run.iter_results([(row, urls[row]) for row in self.rows]):
+                        checked += 1
+                        if result.ok:
+                            alive.append(row)
+                        if time.monotonic() >= deadline:
+                            alive_count += len(alive)
+                            self.progress.emit(alive, checked, total)
+                            self.scheduler_stats.emit(checker.stats())
+                            alive = array('I')
+                            deadline = time.monotonic() + self.REPORT_INTERVAL
+                finally:
+                    self._run = None
+                    self.scheduler_stats.emit(checker.stats())
+                alive_count += len(alive)
+                self.progress.emit(alive, checked, total)
+            self.check_finished.emit(checked, alive_count, self._cancelled, run.saved)
+        except Exception as e:
+            self.check_failed.emit(str(e))
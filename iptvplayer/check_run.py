@@ -0,0 +1,65 @@
+"""Jeden przebieg sprawdzania kanałów, wspólny dla GUI i trybu wsadowego.
+
+:class:`CheckRun` łączy bazę stanu (:mod:`~iptvplayer.health_store`),
+łączenie powtórzonych adresów (:mod:`~iptvplayer.dedup`) i wybrany
+backend sprawdzania. Nie zależy od Qt.
+"""
+from .dedup import collapse, fan_out
+
+RECORD_BATCH = 500
+
+
+class CheckRun:
+    """Sprawdza pary (znacznik, adres), pomijając świeże wpisy i duplikaty.
+
+    :meth:`iter_results` najpierw zwraca wyniki z bazy stanu, potem wyniki
+    nowych prób w kolejności ukończenia. Nowe wyniki zapisywane są do bazy
+    partiami, a resztę zapisuje zakończenie (także przerwane) iteracji.
+    """
+
+    def __init__(self, checker, health=None, dedup=True):
+        self.checker = checker
+        self.health = health
+        self.dedup = dedup
+        self.cached = 0   # wyniki wzięte z bazy stanu
+        self.probes = 0   # próby faktycznie zlecone
+        self.saved = 0    # próby pominięte dzięki łączeniu duplikatów
+        self._cancelled = False
+
+    def iter_results(self, jobs):
+        pending = jobs
+        if self.health is not None:
+            cached, pending = self.health.split(jobs)
+            self.cached = len(cached)
+            yield from cached
+        if self._cancelled:
+            return
+
+        if self.dedup:
+            collapsed = collapse(pending)
+            self.probes, self.saved = len(collapsed.jobs), collapsed.saved
+            results = fan_out(self.checker.iter_results(collapsed.jobs), collapsed)
+        else:
+            pending = list(pending)
+            self.probes = len(pending)
+            results = self.checker.iter_results(pending)
+
+        fresh = []
+        try:
+            for tag, result in results:
+                if self._cancelled:
+                    break
+                yield tag, result
+                if self.health is not None:
+                    fresh.append(result)
+                    if len(fresh) >= RECORD_BATCH:
+                        self.health.record(fresh)
+                        fresh = []
+        finally:
+            results.close()
+            if self.health is not None:
+                self.health.record(fresh)
+
+    def cancel(self):
+        self._cancelled = True
+        self.checker.cancel()
@@ -0,0 +1,48 @@
+"""Panel z decyzjami adaptacyjnego limitu prób podczas sprawdzania kanałów."""
+from qtpy.QtWidgets import QFormLayout, QGroupBox, QLabel
+
+
+class CheckStatsPanel(QGroupBox):
+    """Pokazuje słownik z :meth:`~iptvplayer.adaptive.HostScheduler.stats`."""
+
+    FIELDS = (
+        ('limit', "Concurrency limit"),
+        ('in_flight', "In flight"),
+        ('pending', "Pending"),
+        ('rate', "Probes/s"),
+        ('latency', "Latency p50 / p95"),
+        ('slowdown', "Slowdown vs host median"),
+        ('timeout_rate', "Timeout rate"),
+        ('decisions', "Increases / decreases"),
+        ('reason', "Last decision"),
+        ('retried', "Retried (429/503)"),
+        ('throttled', "Throttled hosts"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__("Stream check scheduler", parent)
+        layout = QFormLayout(self)
+        self._labels = {}
+        for key, title in self.FIELDS:
+            label = self._labels[key] = QLabel("-")
+            layout.addRow(title + ":", label)
+
+    def update_stats(self, stats):
+        if not stats:
+            return
+        throttled = ', '.join(f"{host} ({limit})" for host, limit in stats['throttled_hosts'])
+        values = {
+            'limit': str(stats['limit']),
+            'in_flight': str(stats['in_flight']),
+            'pending': str(stats['pending']),
+            'rate': f"{stats['rate']:.1f}",
+            'latency': f"{stats['p50_ms']:.0f} / {stats['p95_ms']:.0f} ms",
+            'slowdown': f"{stats['slowdown']:.2f}x",
+            'timeout_rate': f"{stats['timeout_rate']:.1%}",
+            'decisions': f"+{stats['increases']} / -{stats['decreases']}",
+            'reason': stats['reason'],
+            'retried': str(stats['retried']),
+            'throttled': f"{stats['throttled_count']} of {stats['hosts']}" + (f": {throttled}" if throttled else ''),
+        }
+        for key, text in values.items():
+            self._labels[key].setText(text)
@@ -0,0 +1,229 @@
+"""Sprawdzanie dostępności kanałów ze współdzielonymi sesjami Streamlink.
+
+Utworzenie ``streamlink.Streamlink()`` ładuje wtyczki i zakłada nową sesję
+HTTP, więc :class:`SessionPool` trzyma kilka gotowych sesji na cały przebieg
+sprawdzania. Wszystkie sesje korzystają z jednego ``HTTPAdapter``, czyli ze
+wspólnych pul połączeń keep-alive per host - kanały z tego samego CDN
+nie płacą za kolejne połączenie TCP/TLS.
+
+Domyślnie kanały HTTP sprawdzane są lekką próbą z :mod:`iptvplayer.probe`
+(playlisty i ewentualnie początek segmentu) na tych samych połączeniach;
+sesja Streamlink jest wypożyczana tylko dla adresów wymagających wtyczki.
+Liczbę prób w toku (ogólnie i per host) dobiera
+:class:`~iptvplayer.adaptive.HostScheduler`.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .adaptive import CANCELLED, HostScheduler
+from .lazy import lazy_import
+from .probe import TIER_MEDIA, CheckResult, HLSProbe, error_message
+
+CHECK_TIMEOUT = 2
+HOST_POOLS = 256  # liczba hostów, dla których trzymane są otwarte połączenia
+
+requests = lazy_import('requests')
+streamlink = lazy_import('streamlink')  # ładowanie wtyczek trwa - dopiero przy pierwszej sesji
+
+
+class SessionPool:
+    """Pula sesji Streamlink skonfigurowanych raz, wypożyczanych na czas próby."""
+
+    def __init__(self, size, timeout=CHECK_TIMEOUT, adapter=None):
+        self.size = size
+        self.timeout = timeout
+        self.adapter = adapter or requests.adapters.HTTPAdapter(
+            pool_connections=HOST_POOLS, pool_maxsize=size, max_retries=0)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def _create(self):
+        session = streamlink.Streamlink()
+        session.set_option("stream-timeout", self.timeout)
+        session.set_option("hls-timeout", self.timeout)
+        session.set_option("http-timeout", self.timeout)
+        session.http.mount('http://', self.adapter)
+        session.http.mount('https://', self.adapter)
+        self._sessions.append(session)
+        return session
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._create()
+                except BaseException:
+                    self._created -= 1  # nieudana sesja nie zajmuje miejsca w puli
+                    raise
+        return self._idle.get()
+
+    def release(self, session):
+        self._idle.put(session)
+
+    def close(self):
+        for session in self._sessions:
+            try:
+                session.http.close()
+            except Exception:
+                pass
+        self.adapter.close()
+        self._sessions = []
+
+
+class StreamChecker:
+    """Sprawdza adresy pulą wątków, korzystając z :class:`SessionPool`.
+
+    ``depth`` to poziom lekkiej próby (:data:`~iptvplayer.probe.TIER_MEDIA`
+    itd.); ``0`` wymusza pełne otwieranie strumieni przez Streamlink.
+    ``max_workers`` jest górnym limitem; z ``adaptive=True`` faktyczną
+    liczbę prób w toku dobiera AIMD.
+    """
+
+    def __init__(self, max_workers=5, timeout=CHECK_TIMEOUT, depth=TIER_MEDIA, per_host=8, adaptive=True):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.depth = depth
+        self.per_host = per_host
+        self.adaptive = adaptive
+        self.scheduler = None
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HOST_POOLS, pool_maxsize=max_workers, max_retries=0)
+        self.sessions = SessionPool(max_workers, timeout, self.adapter)
+        self._local = threading.local()
+        self._http_sessions = []
+        self._executor = None
+
+    def _probe(self):
+        """HLSProbe wątku - sesje requests są osobne, połączenia wspólne."""
+        probe = getattr(self._local, 'probe', None)
+        if probe is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._http_sessions.append(session)
+            probe = self._local.probe = HLSProbe(session, self.timeout, self.depth)
+        return probe
+
+    def check(self, url):
+        return self._check(url)[0]
+
+    def _check(self, url):
+        """(wynik, czy lekka próba) - wyniki Streamlink nie sterują AIMD."""
+        if self.depth:
+            result = self._probe().probe(url)
+            if result is not None:
+                return result, True
+        return self.check_streamlink(url), False
+
+    def check_streamlink(self, url):
+        """Pełna próba: rozwiązanie wtyczką i otwarcie strumienia 'best'/'worst'."""
+        start = time.monotonic()
+        session = None
+        try:
+            session = self.sessions.acquire()
+            streams = session.streams(url)
+            if streams:
+                for quality in ['best', 'worst']:
+                    if quality in streams:
+                        try:
+                            fd = streams[quality].open()
+                            fd.close()
+                            return CheckResult(url, True, time.monotonic() - start, variant=quality)
+                        except Exception as e:
+                            print(f"Unable to open stream {url} at quality {quality}: {e}")
+                            continue
+            return CheckResult(url, False, time.monotonic() - start, "no playable streams")
+        except Exception as e:
+            # StreamlinkError sprawdzany dopiero przy udanym imporcie - inaczej samo
+            # dopasowanie wyjątku zgłosiłoby błąd importu poza obsługą pojedynczego adresu
+            error = error_message(e)
+            if session is not None and isinstance(e, streamlink.StreamlinkError):
+                print(f"Streamlink error for {url}: {error}")
+            else:
+                print(f"General error checking stream {url}: {error}")
+            return CheckResult(url, False, time.monotonic() - start, error)
+        finally:
+            if session is not None:
+                self.sessions.release(session)
+
+    def iter_results(self, jobs):
+        """Dla par (znacznik, adres) zwraca (znacznik, CheckResult) w kolejności ukończenia."""
+        scheduler = self.scheduler = HostScheduler(self.max_workers, self.per_host, self.adaptive)
+        scheduler.add(jobs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            running = {}
+            try:
+                while True:
+                    job = scheduler.next_job()
+                    while job is not None:
+                        try:
+                            running[executor.submit(self._check, job[1])] = job
+                        except RuntimeError:  # cancel() zamknął pulę
+                            scheduler.done(*job, CheckResult(job[1], False, error=CANCELLED), observe=False)
+                            break
+                        job = scheduler.next_job()
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        tag, url = running.pop(future)
+                        if future.cancelled():
+                            scheduler.done(tag, url, CheckResult(url, False, error=CANCELLED), observe=False)
+                            continue
+                        result, probed = future.result()
+                        if not scheduler.done(tag, url, result, observe=probed):
+                            yield tag, result
+            finally:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """Decyzje harmonogramu bieżącego przebiegu (pusty słownik przed startem)."""
+        return self.scheduler.stats() if self.scheduler is not None else {}
+
+    def cancel(self):
+        """Porzuca próby czekające w kolejce (trwające kończą się same)."""
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+        executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self.cancel()
+        for session in self._http_sessions:
+            session.close()
+        self._http_sessions = []
+        self.sessions.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_checker(backend='asyncio', concurrency=None, timeout=CHECK_TIMEOUT, depth=TIER_MEDIA, adaptive=True):
+    """Tworzy sprawdzanie wybranego typu; bez aiohttp wraca do puli wątków.
+
+    ``concurrency`` to górny limit prób w toku; z ``adaptive`` właściwy
+    limit ustala AIMD na podstawie opóźnień i przekroczeń czasu.
+    """
+    if backend == 'asyncio':
+        from .async_checker import AsyncStreamChecker, aiohttp
+        if aiohttp is not None:
+            return AsyncStreamChecker(concurrency=concurrency or 500, timeout=timeout, depth=depth,
+                                      adaptive=adaptive)
+        print("aiohttp is not installed - falling back to the thread checker")
+    return StreamChecker(max_workers=concurrency or (32 if adaptive else 5), timeout=timeout, depth=depth,
+                         adaptive=adaptive)
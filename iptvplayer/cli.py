@@ -0,0 +1,161 @@
+"""Tryb wsadowy bez GUI: ``python -m iptvplayer check lista.m3u -o dzialajace.m3u``.
+
+Używa tych samych modułów parsowania i sprawdzania co odtwarzacz, ale nie
+importuje Qt ani modułów napisów/syntezy mowy (numpy, piper, whisper_live),
+więc nadaje się do nocnego sprawdzania dużych list na serwerze.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from . import playlist_cache
+from .channels import ChannelTable
+from .check_run import CheckRun
+from .checker import CHECK_TIMEOUT, make_checker
+from .download import fetch_playlist
+from .health_store import HealthStore
+from .paths import cache_dir
+from .probe import TIER_MEDIA
+
+PROGRESS_INTERVAL = 1.0
+
+
+def load_table(source, use_cache=True):
+    """Wczytuje listę z pliku albo adresu HTTP(S) (pobieranej do katalogu cache)."""
+    if source.startswith(('http://', 'https://')):
+        name = hashlib.sha1(source.encode('utf-8')).hexdigest() + '.m3u'
+        path = os.path.join(cache_dir('remote'), name)
+        result = fetch_playlist(source, path)
+        if not result.ok:
+            raise RuntimeError(f"HTTP {result.status} fetching {source}")
+        source = path
+    if use_cache:
+        table = playlist_cache.load(source)
+        if table is not None:
+            return table
+    table = ChannelTable.from_playlist(source)
+    if use_cache:
+        playlist_cache.store(source, table)
+    return table
+
+
+def _progress(checked, total, alive, start, stream):
+    elapsed = time.monotonic() - start
+    rate = checked / elapsed if elapsed > 0 else 0.0
+    stream.write(f"\rchecked {checked}/{total}  alive {alive}  {rate:.1f}/s  {elapsed:.0f}s ")
+    stream.flush()
+
+
+def check_command(args):
+    start = time.monotonic()
+    table = load_table(args.input, use_cache=not args.no_cache)
+    total = len(table)
+    urls = table.urls
+    results = [None] * total
+
+    checker = make_checker(args.backend, args.concurrency, timeout=args.timeout, depth=args.depth,
+                           adaptive=not args.no_adaptive)
+    health = None if args.no_health else HealthStore()
+    checked = alive = 0
+    interrupted = False
+    next_report = start + PROGRESS_INTERVAL
+    run = CheckRun(checker, health, dedup=not args.no_dedup)
+    try:
+        with checker:
+            try:
+                for row, result in run.iter_results([(row, urls[row]) for row in range(total)]):
+                    results[row] = result
+                    checked += 1
+                    alive += result.ok
+                    if not args.quiet and time.monotonic() >= next_report:
+                        _progress(checked, total, alive, start, sys.stderr)
+                        next_report = time.monotonic() + PROGRESS_INTERVAL
+            except KeyboardInterrupt:
+                interrupted = True
+                run.cancel()
+            stats = checker.stats()
+    finally:
+        if health is not None:
+            health.close()
+    elapsed = time.monotonic() - start
+    if not args.quiet:
+        _progress(checked, total, alive, start, sys.stderr)
+        sys.stderr.write("\n")
+
+    alive_rows = [row for row in range(total) if results[row] is not None and results[row].ok]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            table.write_m3u(f, alive_rows)
+
+    summary = {
+        'input': args.input,
+        'output': args.output,
+        'channels': total,
+        'checked': checked,
+        'alive': alive,
+        'dead': checked - alive,
+        'cached': run.cached,
+        'probes': run.probes,
+        'probes_saved': run.saved,
+        'interrupted': interrupted,
+        'elapsed': round(elapsed, 3),
+        'channels_per_second': round(checked / elapsed, 1) if elapsed > 0 else None,
+        'backend': type(checker).__name__,
+        'depth': args.depth,
+        'scheduler': stats,
+    }
+    print(f"{alive}/{checked} channels alive ({total} in playlist, {run.probes} probes, "
+          f"{run.saved} duplicates merged, {run.cached} from health cache) in {elapsed:.1f}s")
+
+    if args.json:
+        report = dict(summary)
+        report['results'] = [
+            {
+                'name': table.names[row],
+                'group': table.group(row),
+                'url': urls[row],
+                'ok': result.ok,
+                'latency': round(result.latency, 4),
+                'error': result.error,
+                'variant': result.variant,
+                'cached': result.cached,
+            }
+            for row, result in enumerate(results) if result is not None
+        ]
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 130 if interrupted else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m iptvplayer', description="IPTV playlist tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help="check channel availability and export working ones")
+    check.add_argument('input', help="M3U file or http(s) URL")
+    check.add_argument('-o', '--output', help="write working channels to this M3U file")
+    check.add_argument('--json', help="write a JSON report (summary and per-channel results)")
+    check.add_argument('--backend', choices=('asyncio', 'threads'), default='asyncio')
+    check.add_argument('--concurrency', type=int, default=None, help="upper limit of probes in flight")
+    check.add_argument('--no-adaptive', action='store_true', help="use fixed limits instead of AIMD")
+    check.add_argument('--depth', type=int, default=TIER_MEDIA, choices=(0, 1, 2, 3),
+                       help="probe depth: 1 playlist, 2 + media playlist, 3 + segment, 0 Streamlink only")
+    check.add_argument('--timeout', type=float, default=CHECK_TIMEOUT, help="per-request timeout in seconds")
+    check.add_argument('--no-health', action='store_true', help="ignore and do not update the health database")
+    check.add_argument('--no-dedup', action='store_true', help="probe duplicate URLs separately")
+    check.add_argument('--no-cache', action='store_true', help="do not use the parsed playlist cache")
+    check.add_argument('-q', '--quiet', action='store_true', help="no progress output")
+    check.set_defaults(func=check_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, RuntimeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,53 @@
+"""Panel diagnostyczny (F12): tłumaczenia, pamięć tłumaczeń, kolejka segmentów i podział wątków."""
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QFormLayout, QGroupBox, QLabel
+
+
+class DebugPanel(QGroupBox):
+    """Co sekundę, gdy jest widoczny, pyta ``source()`` o słownik liczników i je wyświetla."""
+
+    FIELDS = (
+        ('hit_rate', "Translation cache hit rate"),
+        ('hits', "Memory / disk hits"),
+        ('misses', "Misses"),
+        ('entries', "Entries in memory"),
+        ('evictions', "Evicted / expired"),
+        ('batches', "Segments / requests"),
+        ('dropped', "Segments dropped (queue full)"),
+        ('threads', "Thread budget"),
+    )
+
+    def __init__(self, source, parent=None):
+        super().__init__("Debug", parent)
+        self.source = source
+        layout = QFormLayout(self)
+        self._labels = {}
+        for key, title in self.FIELDS:
+            label = self._labels[key] = QLabel("-")
+            layout.addRow(title + ":", label)
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+
+    def setVisible(self, visible):
+        super().setVisible(visible)
+        if visible:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        stats = self.source()
+        values = {
+            'hit_rate': f"{stats.get('hit_rate', 0.0):.1%} of {stats.get('lookups', 0)} lookups",
+            'hits': f"{stats.get('memory_hits', 0)} / {stats.get('disk_hits', 0)}",
+            'misses': str(stats.get('misses', 0)),
+            'entries': f"{stats.get('entries', 0)} / {stats.get('max_entries', 0)}",
+            'evictions': f"{stats.get('evictions', 0)} / {stats.get('expired', 0)}",
+            'batches': f"{stats.get('segments', 0)} / {stats.get('batches', 0)}",
+            'dropped': str(stats.get('dropped', 0)),
+            'threads': stats.get('threads', "-"),
+        }
+        for key, text in values.items():
+            self._labels[key].setText(text)
@@ -0,0 +1,90 @@
+"""Łączenie powtórzonych adresów w jedną próbę i rozsyłanie jej wyniku.
+
+Listy łączone z kilku kategorii iptv-org zawierają te same kanały wiele
+razy, często z innym zapisem adresu (wielkość liter w hoście, domyślny
+port, fragment) albo z inną kwerendą doklejoną do tej samej playlisty
+master. :func:`normalize_url` sprowadza takie adresy do wspólnego klucza,
+:func:`collapse` zostawia jedną próbę na klucz, a :func:`fan_out` przypisuje
+jej wynik wszystkim wierszom, które go dzielą.
+"""
+from urllib.parse import urlsplit, urlunsplit
+
+from .probe import CheckResult
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url, ignore_query=True):
+    """Klucz porównania adresu.
+
+    Schemat i host są sprowadzane do małych liter, domyślny port i fragment
+    usuwane, a dla playlist ``.m3u8`` (przy ``ignore_query``) także kwerenda.
+    Adresy, których nie da się rozłożyć, zwracane są bez zmian.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if not parts.netloc:
+        return url
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username or parts.password:
+        host = f"{parts.netloc.rpartition('@')[0]}@{host}"
+    path = parts.path or '/'
+    query = parts.query
+    if ignore_query and path.lower().endswith('.m3u8'):
+        query = ''
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class Collapsed:
+    """Wynik :func:`collapse`: unikalne próby i znaczniki przypisane do każdej z nich."""
+
+    __slots__ = ('jobs', 'groups', 'total')
+
+    def __init__(self):
+        self.jobs = []     # (klucz, adres) - jedna próba na klucz
+        self.groups = {}   # klucz -> [(znacznik, adres), ...]
+        self.total = 0
+
+    @property
+    def saved(self):
+        """Ile prób zaoszczędzono dzięki łączeniu."""
+        return self.total - len(self.jobs)
+
+
+def collapse(jobs, ignore_query=True):
+    """Łączy pary (znacznik, adres) o tym samym kluczu :func:`normalize_url`."""
+    collapsed = Collapsed()
+    groups = collapsed.groups
+    for tag, url in jobs:
+        collapsed.total += 1
+        key = normalize_url(url, ignore_query)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = []
+            collapsed.jobs.append((key, url))
+        group.append((tag, url))
+    return collapsed
+
+
+def fan_out(results, collapsed):
+    """Dla wyników (klucz, CheckResult) zwraca (znacznik, CheckResult) każdego wiersza.
+
+    Wiersze z innym zapisem adresu dostają kopię wyniku z własnym ``url``,
+    żeby np. :class:`~iptvplayer.health_store.HealthStore` zapisał każdy adres.
+    """
+    groups = collapsed.groups
+    for key, result in results:
+        for tag, url in groups.pop(key, ()):
+            if url == result.url:
+                yield tag, result
+            else:
+                yield tag, CheckResult(url, result.ok, result.latency, result.error, result.variant)
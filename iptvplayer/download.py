@@ -0,0 +1,113 @@
+"""Pobieranie zdalnych list M3U: strumieniowo na dysk, z walidacją ETag.
+
+Dla każdego adresu zapamiętywane są ``ETag`` i ``Last-Modified``; przy
+kolejnym pobraniu wysyłane są ``If-None-Match``/``If-Modified-Since``
+i odpowiedź 304 nie zmienia pliku docelowego (a więc i jego mtime, co
+pozwala trafić w cache sparsowanej listy). Treść przesyłana jest
+z kompresją gzip i zapisywana kawałkami przez plik tymczasowy.
+"""
+import json
+import os
+import threading
+
+from .lazy import lazy_import
+from .paths import cache_dir
+
+requests = lazy_import('requests')
+
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadResult:
+    __slots__ = ('url', 'path', 'status', 'not_modified', 'bytes_written')
+
+    def __init__(self, url, path, status, not_modified=False, bytes_written=0):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.not_modified = not_modified
+        self.bytes_written = bytes_written
+
+    @property
+    def ok(self):
+        return self.status == 200 or self.not_modified
+
+
+class ValidatorStore:
+    """Plik JSON z walidatorami HTTP (ETag, Last-Modified) per adres."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir('http'), 'validators.json')
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, url):
+        return self._entries.get(url)
+
+    def put(self, url, entry):
+        with self._lock:
+            if entry:
+                self._entries[url] = entry
+            else:
+                self._entries.pop(url, None)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+
+
+def conditional_headers(entry, dest_path):
+    """Nagłówki warunkowe - tylko gdy poprzednia kopia wciąż leży na dysku."""
+    headers = {'Accept-Encoding': 'gzip, deflate'}
+    if not entry or entry.get('path') != os.path.abspath(dest_path) or not os.path.exists(dest_path):
+        return headers
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def fetch_playlist(url, dest_path, session=None, validators=None, timeout=10, chunk_size=CHUNK_SIZE):
+    """Pobiera ``url`` do ``dest_path``; zwraca :class:`DownloadResult`.
+
+    Błędy sieci są zgłaszane wyjątkami ``requests``; kody HTTP inne niż
+    200/304 zwracane są w ``status`` bez zmiany pliku docelowego.
+    """
+    validators = validators if validators is not None else ValidatorStore()
+    http = session or requests
+    entry = validators.get(url)
+    headers = conditional_headers(entry, dest_path)
+
+    with http.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return DownloadResult(url, dest_path, 304, not_modified=True)
+        if response.status_code != 200:
+            return DownloadResult(url, dest_path, response.status_code)
+
+        tmp_path = dest_path + '.part'
+        written = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                # iter_content rozpakowuje gzip/deflate w locie
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        validators.put(url, {
+            'path': os.path.abspath(dest_path),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+        return DownloadResult(url, dest_path, 200, bytes_written=written)
@@ -0,0 +1,56 @@
+"""Pomiar płynności pętli zdarzeń Qt (utracone klatki, najdłuższe przestoje)."""
+import time
+
+from qtpy.QtCore import QObject, Qt, QTimer
+
+
+class FrameMonitor(QObject):
+    """Tyka co ``interval_ms`` i liczy klatki, których pętla zdarzeń nie obsłużyła.
+
+    Każde opóźnienie tyknięcia dłuższe niż 1.5 interwału oznacza, że GUI
+    było zablokowane; liczba pominiętych interwałów to utracone klatki.
+    """
+
+    def __init__(self, interval_ms=16, parent=None):
+        super().__init__(parent)
+        self.interval = interval_ms / 1000.0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.dropped = 0
+        self.max_stall = 0.0
+        self.started = self._last = time.perf_counter()
+
+    def start(self):
+        self.reset()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._tick()
+        return self.stats()
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    def _tick(self):
+        now = time.perf_counter()
+        gap = now - self._last
+        self._last = now
+        self.frames += 1
+        if gap > self.interval * 1.5:
+            self.dropped += int(gap / self.interval) - 1
+        self.max_stall = max(self.max_stall, gap)
+
+    def stats(self):
+        return {
+            'elapsed': time.perf_counter() - self.started,
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'max_stall_ms': self.max_stall * 1000.0,
+        }
@@ -0,0 +1,120 @@
+"""Trwała baza stanu kanałów (SQLite), żeby nie sprawdzać ich od zera.
+
+Dla każdego adresu zapisywany jest czas ostatniej próby, wynik, opóźnienie,
+rozwiązany wariant i liczba kolejnych porażek. Działający kanał jest
+ponownie sprawdzany dopiero po ``ttl`` sekundach; niedziałający po czasie
+rosnącym wykładniczo z każdą porażką (``backoff_base * 2**(porażki-1)``,
+najwyżej ``backoff_max``).
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from .paths import cache_dir
+from .probe import CheckResult
+
+DEFAULT_TTL = 48 * 3600
+DEFAULT_BACKOFF_BASE = 15 * 60
+DEFAULT_BACKOFF_MAX = 7 * 24 * 3600
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS health (
+    url TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL,
+    ok INTEGER NOT NULL,
+    latency REAL,
+    variant TEXT,
+    error TEXT,
+    failures INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class HealthStore:
+    def __init__(self, path=None, ttl=DEFAULT_TTL, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX):
+        self.path = path or os.path.join(cache_dir(), 'stream_health.sqlite3')
+        self.ttl = ttl
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def retry_after(self, ok, failures):
+        """Po ilu sekundach wpis wymaga ponownej próby."""
+        if ok:
+            return self.ttl
+        return min(self.backoff_base * 2 ** max(failures - 1, 0), self.backoff_max)
+
+    def lookup(self, urls):
+        """Zwraca {adres: (checked_at, ok, latency, variant, error, failures)}."""
+        urls = list(dict.fromkeys(urls))
+        found = {}
+        with self._lock:
+            for i in range(0, len(urls), _QUERY_CHUNK):
+                chunk = urls[i:i + _QUERY_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                for row in self._db.execute(
+                        f"SELECT url, checked_at, ok, latency, variant, error, failures "
+                        f"FROM health WHERE url IN ({marks})", chunk):
+                    found[row[0]] = row[1:]
+        return found
+
+    def split(self, jobs, now=None):
+        """Dzieli pary (znacznik, adres) na wyniki z bazy i próby do wykonania.
+
+        Zwraca ``(cached, pending)``: ``cached`` to lista (znacznik, CheckResult)
+        dla świeżych wpisów, ``pending`` - pary wymagające sprawdzenia.
+        """
+        now = time.time() if now is None else now
+        jobs = list(jobs)
+        known = self.lookup(url for _, url in jobs)
+        cached, pending = [], []
+        for tag, url in jobs:
+            entry = known.get(url)
+            if entry is not None:
+                checked_at, ok, latency, variant, error, failures = entry
+                if now - checked_at < self.retry_after(ok, failures):
+                    cached.append((tag, CheckResult(url, bool(ok), latency or 0.0, error, variant, cached=True)))
+                    continue
+            pending.append((tag, url))
+        return cached, pending
+
+    def record(self, results, now=None):
+        """Zapisuje wyniki (CheckResult) jedną transakcją."""
+        now = time.time() if now is None else now
+        rows = [(r.url, now, int(r.ok), r.latency, r.variant, r.error, int(r.ok))
+                for r in results if not r.cached]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO health (url, checked_at, ok, latency, variant, error, failures) "
+                "VALUES (?, ?, ?, ?, ?, ?, CASE WHEN ? THEN 0 ELSE 1 END) "
+                "ON CONFLICT(url) DO UPDATE SET checked_at=excluded.checked_at, ok=excluded.ok, "
+                "latency=excluded.latency, variant=excluded.variant, error=excluded.error, "
+                "failures=CASE WHEN excluded.ok THEN 0 ELSE health.failures + 1 END",
+                rows,
+            )
+            self._db.commit()
+
+    def forget(self, urls):
+        with self._lock:
+            self._db.executemany("DELETE FROM health WHERE url = ?", [(url,) for url in urls])
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,59 @@
+"""Leniwe importy ciężkich, opcjonalnych modułów.
+
+``np = lazy_import('numpy')`` zwraca obiekt modułu, który importuje
+właściwy moduł dopiero przy pierwszym odwołaniu do atrybutu (``np.zeros``).
+Po imporcie atrybuty są kopiowane do obiektu zastępczego, więc kolejne
+odwołania nie przechodzą już przez ``__getattr__``. Brak modułu zgłaszany
+jest dopiero przy użyciu, jako ``ImportError`` z nazwą modułu.
+"""
+import importlib
+import sys
+import threading
+import types
+
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(
+                        (key, value) for key, value in module.__dict__.items() if not key.startswith('__'))
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        if attr.startswith('__') and attr.endswith('__'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name):
+    """Moduł ``name`` importowany przy pierwszym użyciu (od razu, jeśli już jest w ``sys.modules``)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module):
+    """Czy moduł (zwykły albo :class:`LazyModule`) został już faktycznie zaimportowany."""
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+    return True
@@ -0,0 +1,155 @@
+"""Strumieniowy parser list M3U/M3U8 (bez zależności od Qt).
+
+Plik czytany jest linia po linii, a każda linia ``#EXTINF`` jest
+rozbierana w jednym przebiegu (jeden ``split`` po cudzysłowach) na
+wszystkie atrybuty ``klucz="wartość"`` oraz nazwę kanału. Parser zwraca
+lekkie rekordy :class:`Channel` zaraz po przeczytaniu adresu kanału.
+"""
+import sys
+from collections import namedtuple
+
+DEFAULT_GROUP = "Undefined"
+
+_tuple_new = tuple.__new__
+_CACHE_LIMIT = 4096
+
+
+class _KeyCache(dict):
+    """Mapuje surowy fragment ``' tvg-id='`` na internowany klucz ``'tvg-id'``."""
+
+    def __missing__(self, segment):
+        key = segment.rstrip()
+        if key.endswith('='):
+            start = max(key.rfind(' '), key.rfind('\t')) + 1
+            key = sys.intern(key[start:-1].lower())
+        else:
+            key = ''
+        if len(self) < _CACHE_LIMIT:
+            self[segment] = key
+        return key
+
+
+class _LayoutCache(dict):
+    """Współdzielone (krotka kluczy, czas trwania) - kanały z tym samym układem
+    atrybutów (czyli prawie wszystkie w indeksach iptv-org) wskazują na ten sam
+    obiekt. Pierwszy fragment zaczyna się od ``#EXTINF:<czas>``, więc czas
+    trwania jest częścią klucza i liczony jest raz na układ."""
+
+    def __missing__(self, segments):
+        layout = tuple(map(_KEYS.__getitem__, segments)), sys.intern(extinf_duration(segments[0]))
+        if len(self) < _CACHE_LIMIT:
+            self[segments] = layout
+        return layout
+
+
+_KEYS = _KeyCache()
+_LAYOUTS = _LayoutCache()
+
+
+class Channel(namedtuple('Channel', 'name group url attr_keys attr_values duration')):
+    """Pojedynczy wpis listy: nazwa, grupa, adres, atrybuty i czas trwania (tekst) z EXTINF."""
+
+    __slots__ = ()
+
+    def get(self, key, default=None):
+        """Zwraca wartość atrybutu EXTINF (np. ``tvg-id``)."""
+        keys = self.attr_keys
+        return self.attr_values[keys.index(key)] if key in keys else default
+
+    @property
+    def attrs(self):
+        return dict(zip(self.attr_keys, self.attr_values))
+
+
+def split_extinf(line):
+    """Rozbiera linię ``#EXTINF`` na (klucze, wartości, nazwa) w jednym przebiegu."""
+    keys, values, title, _ = _split_extinf(line)
+    return keys, values, title
+
+
+def _split_extinf(line):
+    """Jak :func:`split_extinf`, z czasem trwania jako czwartym elementem.
+
+    Po podziale po cudzysłowach nieparzyste fragmenty są wartościami,
+    parzyste - kluczami; nazwa zaczyna się po pierwszym przecinku poza
+    cudzysłowem, więc przecinki w nazwie i w wartościach są zachowane.
+    Linia bez takiego przecinka daje pustą nazwę, ale zachowuje atrybuty.
+    """
+    parts = line.split('"')
+    last = len(parts) - 1
+    if last % 2 == 0 and ',' in parts[last] and (last == 0 or ',' not in ''.join(parts[0:last:2])):
+        i = last
+    else:
+        for i in range(0, last + 1, 2):
+            if ',' in parts[i]:
+                break
+        else:
+            # bez przecinka, czyli bez nazwy - atrybuty i tak są w linii
+            if not last or last % 2:  # bez atrybutów albo niezamknięty cudzysłów
+                return (), (), '', sys.intern(extinf_duration(line))
+            keys, duration = _LAYOUTS[tuple(parts[0:last:2])]
+            return keys, tuple(parts[1:last:2]), '', duration
+    segment = parts[i]
+    title = segment[segment.index(',') + 1:]
+    if i < last:
+        title = '"'.join([title] + parts[i + 1:])
+    if not i:  # bez atrybutów
+        return (), (), title.strip(), sys.intern(extinf_duration(segment))
+    keys, duration = _LAYOUTS[tuple(parts[0:i:2])]
+    return keys, tuple(parts[1:i:2]), title.strip(), duration
+
+
+def extinf_duration(line):
+    """Czas trwania z ``#EXTINF:<czas> ...`` jako tekst (w listach IPTV zwykle ``-1``)."""
+    text = line[8:].lstrip()
+    end = len(text)
+    for separator in (' ', '\t', ','):
+        i = text.find(separator, 0, end)
+        if i >= 0:
+            end = i
+    return text[:end] or '-1'
+
+
+def parse_extinf(line):
+    """Zwraca (atrybuty, nazwa) dla linii ``#EXTINF``; atrybuty jako dict."""
+    keys, values, title = split_extinf(line)
+    return dict(zip(keys, values)), title
+
+
+def iter_playlist(source):
+    """Generator kanałów z pliku (ścieżka) lub iterowalnego zbioru linii.
+
+    Plik nie jest wczytywany w całości - każdy kanał jest zwracany zaraz
+    po przeczytaniu jego adresu. Adresem jest pierwsza linia niebędąca
+    komentarzem po ``#EXTINF``; grupa pochodzi z ``group-title`` albo
+    z dyrektywy ``#EXTGRP``.
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        with open(source, 'r', encoding='utf-8-sig', errors='replace') as file:
+            yield from iter_playlist(file)
+        return
+
+    intern = sys.intern
+    name = group = None
+    keys = values = ()
+    duration = '-1'
+    for line in source:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == '#':
+            if line.startswith('#EXTINF:'):
+                keys, values, name, duration = _split_extinf(line)
+                group = values[keys.index('group-title')] if 'group-title' in keys else None
+            elif line.startswith('#EXTGRP:') and name is not None and not group:
+                group = line[8:].strip()
+            continue
+        if name is None:
+            continue
+        yield _tuple_new(Channel, (name, intern(group or DEFAULT_GROUP), line, keys, values, duration))
+        name = None
+
+
+def parse_playlist_file(path):
+    """Zwraca listę wszystkich kanałów z pliku M3U."""
+    return list(iter_playlist(path))
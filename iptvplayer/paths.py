@@ -0,0 +1,10 @@
+"""Katalogi robocze odtwarzacza (cache poza katalogiem programu)."""
+import os
+
+
+def cache_dir(*parts):
+    """Zwraca (i tworzy) podkatalog w ``$XDG_CACHE_HOME/iptvplayer``."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'iptvplayer', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
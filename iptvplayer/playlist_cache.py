@@ -0,0 +1,113 @@
+"""Binarny cache sparsowanych list (ChannelTable) na dysku.
+
+Wpis jest kluczowany ścieżką pliku, a ważny tylko dla zgodnego rozmiaru,
+``mtime`` i skrótu BLAKE2 zawartości. Gdy zmienił się sam ``mtime``
+(np. ``touch`` albo ponowne pobranie tej samej listy), skrót decyduje
+o ważności i nagłówek jest odświeżany. Kolumny tabeli zapisywane są
+modułem ``marshal``, więc odczyt to praktycznie kopiowanie buforów.
+"""
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+
+from .channels import ChannelTable
+from .paths import cache_dir
+
+MAGIC = b'IPTVCH\x03'  # zmiana przy każdej zmianie kolumn ChannelTable
+MAX_ENTRIES = 20
+_HEADER_LEN = struct.Struct('<I')
+# marshal nie gwarantuje zgodności między wersjami Pythona
+_PYTHON = list(sys.version_info[:2])
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(path):
+    key = hashlib.sha1(os.path.abspath(path).encode('utf-8', 'surrogatepass')).hexdigest()
+    return os.path.join(cache_dir('playlists'), key + '.bin')
+
+
+def _read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+    return json.loads(f.read(length).decode('utf-8'))
+
+
+def _write(target, header, payload):
+    raw = json.dumps(header).encode('utf-8')
+    tmp = target + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(raw)))
+        f.write(raw)
+        f.write(payload)
+    os.replace(tmp, target)
+
+
+def load(path):
+    """Zwraca ChannelTable z cache albo None, gdy wpisu brak lub jest nieaktualny."""
+    target = cache_path(path)
+    try:
+        st = os.stat(path)
+        with open(target, 'rb') as f:
+            header = _read_header(f)
+            if (header is None or header.get('python') != _PYTHON
+                    or header.get('path') != os.path.abspath(path)
+                    or header.get('size') != st.st_size):
+                return None
+            if header.get('mtime_ns') != st.st_mtime_ns:
+                if header.get('digest') != file_digest(path):
+                    return None
+                header['mtime_ns'] = st.st_mtime_ns
+                payload = f.read()
+                _write(target, header, payload)
+            else:
+                payload = f.read()
+        return ChannelTable.from_columns(marshal.loads(payload))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Playlist cache error for {path}: {e}")
+        return None
+
+
+def store(path, table):
+    """Zapisuje tabelę dla pliku ``path``; błędy zapisu nie są krytyczne."""
+    try:
+        st = os.stat(path)
+        header = {
+            'path': os.path.abspath(path),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'digest': file_digest(path),
+            'python': _PYTHON,
+            'channels': len(table),
+        }
+        _write(cache_path(path), header, marshal.dumps(table.dump_columns()))
+        prune()
+    except Exception as e:
+        print(f"Error writing playlist cache for {path}: {e}")
+
+
+def prune(max_entries=MAX_ENTRIES):
+    """Usuwa najdawniej używane wpisy ponad limit."""
+    directory = cache_dir('playlists')
+    entries = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.bin')]
+    if len(entries) <= max_entries:
+        return
+    entries.sort(key=os.path.getmtime)
+    for entry in entries[:-max_entries]:
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
@@ -0,0 +1,70 @@
+"""Wczytywanie listy M3U w wątku roboczym z przekazywaniem partii do GUI."""
+import time
+
+from qtpy.QtCore import QThread, Signal
+
+from . import playlist_cache
+from .channels import ChannelTable
+from .m3u import iter_playlist
+
+
+class PlaylistLoader(QThread):
+    """Parsuje listę poza wątkiem GUI i zgłasza kolejne zakresy wierszy.
+
+    Wątek sam wypełnia :attr:`table`; GUI dostaje sygnał ``rows_ready``
+    z tabelą i zakresem nowych wierszy po :attr:`BATCH_SIZE` kanałach albo
+    po :attr:`BATCH_INTERVAL` sekundach. Wiersze już zgłoszone nie są
+    później modyfikowane, więc GUI może je czytać bez blokad. Niezmieniona
+    lista wczytywana jest z :mod:`~iptvplayer.playlist_cache` bez parsowania.
+    """
+
+    rows_ready = Signal(object, int, int)  # tabela, pierwszy wiersz, koniec zakresu
+    loading_finished = Signal(int, bool)   # liczba kanałów, czy z cache
+    loading_failed = Signal(str)
+
+    BATCH_SIZE = 2000
+    BATCH_INTERVAL = 0.05
+
+    def __init__(self, file_path, use_cache=True, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.use_cache = use_cache
+        self.table = ChannelTable()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            if self.use_cache:
+                cached = playlist_cache.load(self.file_path)
+                if cached is not None and not self._cancelled:
+                    self.table = cached
+                    self.rows_ready.emit(cached, 0, len(cached))
+                    self.loading_finished.emit(len(cached), True)
+                    return
+
+            table = self.table
+            reported = 0
+            deadline = time.monotonic() + self.BATCH_INTERVAL
+            for channel in iter_playlist(self.file_path):
+                if self._cancelled:
+                    return
+                table.append(channel)
+                if len(table) - reported >= self.BATCH_SIZE or time.monotonic() >= deadline:
+                    self.rows_ready.emit(table, reported, len(table))
+                    reported = len(table)
+                    deadline = time.monotonic() + self.BATCH_INTERVAL
+            if self._cancelled:
+                return
+            if reported < len(table):
+                self.rows_ready.emit(table, reported, len(table))
+            self.loading_finished.emit(len(table), False)
+            if self.use_cache:
+                playlist_cache.store(self.file_path, table)
+        except Exception as e:
+            self.loading_failed.emit(str(e))
@@ -0,0 +1,171 @@
+"""Model Qt listy kanałów nad :class:`~iptvplayer.channels.ChannelTable`.
+
+Na najwyższym poziomie są grupy, pod nimi kanały. Grupowanie liczone jest
+jednym przebiegiem po kolumnie ``group_ids``, a wiersze kanałów pojawiają
+się w widoku dopiero po rozwinięciu grupy (``canFetchMore``/``fetchMore``),
+partiami po :attr:`PlaylistModel.FETCH_BATCH`.
+"""
+from array import array
+
+from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from .channels import ChannelTable
+
+
+class _TopLevel:
+    """Znacznik indeksów grup (internalPointer musi wskazywać żywy obiekt)."""
+
+
+_TOP = _TopLevel()
+
+
+class _GroupNode:
+    __slots__ = ('gid', 'name', 'position', 'rows', 'fetched')
+
+    def __init__(self, gid, name, position):
+        self.gid = gid
+        self.name = name
+        self.position = position
+        self.rows = array('I')  # wiersze tabeli w tej grupie
+        self.fetched = 0        # ile z nich widok już zna
+
+
+class PlaylistModel(QAbstractItemModel):
+    FETCH_BATCH = 256
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = ChannelTable()
+        self._groups = []
+        self._by_gid = {}
+
+    # --- wypełnianie -----------------------------------------------------
+
+    def set_channels(self, table, rows=None):
+        """Podmienia tabelę; ``rows`` ogranicza listę do wybranych wierszy."""
+        self.beginResetModel()
+        self.table = table
+        self._groups = []
+        self._by_gid = {}
+        self._groups.extend(self._group(range(len(table)) if rows is None else rows))
+        self.endResetModel()
+
+    def clear(self):
+        self.set_channels(ChannelTable(), ())
+
+    def append_rows(self, rows):
+        """Dopisuje wiersze tabeli (np. wyniki sprawdzania) do istniejących grup."""
+        before = {node: len(node.rows) for node in self._groups}
+        new_nodes = self._group(rows)
+        if new_nodes:
+            first = len(self._groups)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_nodes) - 1)
+            self._groups.extend(new_nodes)
+            self.endInsertRows()
+        # Rozwinięte i w pełni pobrane grupy od razu pokazują nowe kanały
+        for node, old_count in before.items():
+            if 0 < old_count == node.fetched < len(node.rows):
+                self.fetchMore(self.createIndex(node.position, 0, _TOP))
+
+    def _group(self, rows):
+        """Jeden przebieg po wierszach; zwraca nowo utworzone węzły grup."""
+        group_ids = self.table.group_ids
+        groups = self.table.groups
+        by_gid = self._by_gid
+        new_nodes = []
+        position = len(self._groups)
+        for row in rows:
+            gid = group_ids[row]
+            node = by_gid.get(gid)
+            if node is None:
+                node = by_gid[gid] = _GroupNode(gid, groups[gid], position + len(new_nodes))
+                new_nodes.append(node)
+            node.rows.append(row)
+        return new_nodes
+
+    # --- dostęp ----------------------------------------------------------
+
+    def table_row(self, index):
+        """Numer wiersza tabeli dla indeksu kanału albo None dla grupy."""
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if node is _TOP:
+            return None
+        return node.rows[index.row()]
+
+    def group_index(self, position):
+        return self.createIndex(position, 0, _TOP)
+
+    # --- QAbstractItemModel ----------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, _TOP)
+        return self.createIndex(row, column, self._groups[parent.row()])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is _TOP:
+            return QModelIndex()
+        return self.createIndex(node.position, 0, _TOP)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._groups)
+        if parent.internalPointer() is _TOP:
+            return self._groups[parent.row()].fetched
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._groups)
+        if parent.internalPointer() is _TOP:
+            return bool(self._groups[parent.row()].rows)
+        return False
+
+    def canFetchMore(self, parent):
+        if parent.isValid() and parent.internalPointer() is _TOP:
+            node = self._groups[parent.row()]
+            return node.fetched < len(node.rows)
+        return False
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        node = self._groups[parent.row()]
+        count = min(self.FETCH_BATCH, len(node.rows) - node.fetched)
+        self.beginInsertRows(parent, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if node is _TOP:
+            if role == Qt.DisplayRole:
+                return self._groups[index.row()].name
+            if role == Qt.ToolTipRole:
+                return f"{len(self._groups[index.row()].rows)} channels"
+            return None
+        row = node.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.table.names[row]
+        if role == Qt.ToolTipRole:
+            return self.table.urls[row]
+        if role == Qt.UserRole:
+            return row
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "Channel Name"
+        return None
@@ -0,0 +1,203 @@
+"""Lekka, stopniowana próba kanałów HLS bez otwierania strumieni Streamlink.
+
+Poziomy próby:
+
+1. ``TIER_PLAYLIST`` - GET adresu kanału i odczyt początku odpowiedzi;
+2. ``TIER_MEDIA`` - parsowanie playlisty master/media i pobranie playlisty
+   mediów najtańszego wariantu (musi zawierać segmenty);
+3. ``TIER_SEGMENT`` - dodatkowo zapytanie ``Range`` o pierwsze bajty
+   pierwszego segmentu.
+
+Pełne rozwiązywanie przez Streamlink zostaje tylko dla adresów spoza
+HTTP(S) i stron wymagających wtyczki (np. odpowiedź HTML) - wtedy
+:meth:`HLSProbe.probe` zwraca ``None``.
+
+Decyzje kolejnych poziomów (parsowanie playlist, wybór wariantu, treść
+błędów) podejmuje :func:`probe_steps` bez żadnego wejścia/wyjścia;
+:class:`HLSProbe` (requests) i
+:class:`~iptvplayer.async_checker.AsyncStreamChecker` (aiohttp) tylko
+wykonują zapytania, o które prosi.
+"""
+import time
+from urllib.parse import urljoin, urlsplit
+
+TIER_PLAYLIST = 1
+TIER_MEDIA = 2
+TIER_SEGMENT = 3
+
+SNIFF_BYTES = 64 * 1024
+MAX_PLAYLIST_BYTES = 512 * 1024
+SEGMENT_RANGE = 'bytes=0-1023'
+MEDIA_TYPES = ('video/', 'audio/', 'application/octet-stream', 'application/dash+xml')
+HLS_TYPES = ('mpegurl',)
+NO_SEGMENTS = 'no media segments'
+TIMEOUT = 'timeout'
+
+
+class CheckResult:
+    __slots__ = ('url', 'ok', 'latency', 'error', 'variant', 'cached')
+
+    def __init__(self, url, ok, latency=0.0, error=None, variant=None, cached=False):
+        self.url = url
+        self.ok = ok
+        self.latency = latency
+        self.error = error
+        self.variant = variant
+        self.cached = cached  # wynik z bazy stanu, bez nowej próby
+
+    def __repr__(self):
+        return f"CheckResult({self.url!r}, ok={self.ok}, latency={self.latency:.3f})"
+
+
+class M3U8:
+    """Wynik parsowania playlisty HLS: warianty (master) albo segmenty (media)."""
+
+    __slots__ = ('variants', 'segments')
+
+    def __init__(self):
+        self.variants = []   # (bandwidth, absolutny adres)
+        self.segments = []   # absolutne adresy segmentów
+
+    @property
+    def is_master(self):
+        return bool(self.variants)
+
+    def cheapest_variant(self):
+        return min(self.variants)[1] if self.variants else None
+
+
+def is_http(url):
+    return urlsplit(url).scheme in ('http', 'https')
+
+
+def classify(status, content_type, head):
+    """Rodzaj odpowiedzi: 'hls', 'media', 'page' (potrzebna wtyczka) albo 'dead'."""
+    if status >= 400:
+        return 'dead'
+    if head.lstrip(b'\xef\xbb\xbf \r\n\t').startswith(b'#EXTM3U'):
+        return 'hls'
+    content_type = (content_type or '').lower()
+    if any(media in content_type for media in MEDIA_TYPES):
+        return 'media'
+    if any(hls in content_type for hls in HLS_TYPES):
+        return 'dead'  # deklaruje HLS, ale treść nie jest playlistą
+    return 'page'
+
+
+def parse_m3u8(text, base_url):
+    playlist = M3U8()
+    bandwidth = None
+    expect_uri = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == '#':
+            if line.startswith('#EXT-X-STREAM-INF:'):
+                bandwidth = 0
+                for attr in line[18:].split(','):
+                    if attr.startswith('BANDWIDTH='):
+                        try:
+                            bandwidth = int(attr[10:])
+                        except ValueError:
+                            pass
+                expect_uri = True
+            elif line.startswith('#EXTINF:'):
+                expect_uri = True
+            continue
+        if expect_uri:
+            uri = urljoin(base_url, line)
+            if bandwidth is not None:
+                playlist.variants.append((bandwidth, uri))
+            else:
+                playlist.segments.append(uri)
+            bandwidth = None
+            expect_uri = False
+    return playlist
+
+
+def probe_steps(url, depth):
+    """Stopniowana próba adresu ``url`` jako generator bez wejścia/wyjścia.
+
+    Zwraca kolejne zapytania ``(adres, limit_bajtów, nagłówki)``; wykonujący
+    odsyła przez ``send()`` odpowiedź ``(status, Content-Type, treść,
+    adres_po_przekierowaniach)``. Wartość końcowa (``StopIteration.value``)
+    to ``(ok, błąd, wariant)`` albo ``None``, gdy potrzebny jest Streamlink.
+    """
+    status, content_type, head, final_url = yield url, SNIFF_BYTES, None
+    kind = classify(status, content_type, head)
+    if kind == 'page':
+        return None
+    if kind != 'hls' or depth <= TIER_PLAYLIST:
+        return kind != 'dead', None if kind != 'dead' else f"HTTP {status}", final_url
+
+    playlist = parse_m3u8(head.decode('utf-8', 'replace'), final_url)
+    variant = final_url
+    if playlist.is_master:
+        status, _, body, variant = yield playlist.cheapest_variant(), MAX_PLAYLIST_BYTES, None
+        if status >= 400:
+            return False, f"variant HTTP {status}", variant
+        playlist = parse_m3u8(body.decode('utf-8', 'replace'), variant)
+    if not playlist.segments:
+        return False, NO_SEGMENTS, variant
+
+    if depth >= TIER_SEGMENT:
+        status, _, _, _ = yield playlist.segments[0], 1024, {'Range': SEGMENT_RANGE}
+        if status >= 400:
+            return False, f"segment HTTP {status}", variant
+    return True, None, variant
+
+
+def probe_result(url, outcome, latency):
+    """CheckResult z wartości końcowej :func:`probe_steps` (``None`` przechodzi bez zmian)."""
+    if outcome is None:
+        return None
+    ok, error, variant = outcome
+    return CheckResult(url, ok, latency, error, variant)
+
+
+def error_message(exc):
+    """Treść błędu próby; przekroczenia czasu (requests, aiohttp, gniazda) zawsze jako ``timeout``."""
+    if isinstance(exc, TimeoutError) or any('Timeout' in cls.__name__ for cls in type(exc).__mro__):
+        return TIMEOUT
+    return str(exc) or type(exc).__name__
+
+
+def _read_limited(response, limit):
+    data = bytearray()
+    for chunk in response.iter_content(chunk_size=16 * 1024):
+        data += chunk
+        if len(data) >= limit:
+            break
+    return bytes(data)
+
+
+class HLSProbe:
+    """Synchroniczna próba na sesji ``requests`` (współdzielona pula połączeń)."""
+
+    def __init__(self, session, timeout, depth=TIER_MEDIA):
+        self.session = session
+        self.timeout = timeout
+        self.depth = depth
+
+    def _get(self, url, limit, headers=None):
+        response = self.session.get(url, stream=True, timeout=self.timeout,
+                                    headers=headers, allow_redirects=True)
+        with response:
+            return response.status_code, response.headers.get('Content-Type'), \
+                _read_limited(response, limit), response.url
+
+    def probe(self, url):
+        """CheckResult dla HLS/mediów albo None, gdy potrzebny jest Streamlink."""
+        if not is_http(url):
+            return None
+        start = time.monotonic()
+        steps = probe_steps(url, self.depth)
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(self._get(*request))
+        except StopIteration as stop:
+            return probe_result(url, stop.value, time.monotonic() - start)
+        except Exception as e:
+            return CheckResult(url, False, time.monotonic() - start, error_message(e))
@@ -0,0 +1,165 @@
+"""Podział rdzeni procesora między podsystemy odtwarzacza.
+
+Serwer Whisper (wątki OpenMP), synteza mowy Piper (wątki onnxruntime),
+lokalny model tłumaczenia (CTranslate2), sprawdzanie kanałów i interfejs razem z dekoderem wideo walczą o te same
+rdzenie. :func:`available_cores` ustala, ile ich naprawdę jest (maska
+``sched_getaffinity`` i limit CPU z cgroup v1/v2 - w kontenerze
+``os.cpu_count()`` podaje rdzenie hosta), a :class:`ResourceBudget`
+dzieli je według udziałów albo stałych wartości z konfiguracji.
+
+Podsystem oznaczony jako bezczynny (:meth:`ResourceBudget.set_active`)
+oddaje swoją część pozostałym. Nie każdy potrafi przyjąć zmianę od razu:
+liczba wątków OpenMP serwera Whisper i modelu tłumaczenia jest ustalana
+przy ich starcie, więc dostają :meth:`~ResourceBudget.base` - udział przy wszystkich
+podsystemach aktywnych. Piper (proces na każdą wypowiedź) i sprawdzanie
+(limit na każdy przebieg) biorą bieżący :meth:`~ResourceBudget.threads`.
+"""
+import os
+import threading
+
+SUBSYSTEMS = ('ui', 'whisper', 'tts', 'translation', 'checker')
+DEFAULT_SHARES = {'ui': 0.2, 'whisper': 0.5, 'tts': 0.2, 'translation': 0.15, 'checker': 0.1}
+ALWAYS_ACTIVE = frozenset({'ui'})  # wątek GUI i dekoder pracują przez cały czas
+
+# Próby w toku na jeden rdzeń budżetu sprawdzania (górny limit dla AIMD)
+PROBES_PER_THREAD = {'asyncio': 128, 'threads': 8}
+MAX_CONCURRENCY = {'asyncio': 500, 'threads': 32}
+
+
+def _read(path):
+    try:
+        with open(path, encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root='/sys/fs/cgroup', proc_cgroup='/proc/self/cgroup'):
+    """Limit CPU z cgroup (w rdzeniach, może być ułamkowy) albo ``None`` bez limitu."""
+    lines = (_read(proc_cgroup) or '').splitlines()
+    for line in lines:
+        hierarchy, _, rest = line.partition(':')
+        controllers, _, path = rest.partition(':')
+        if hierarchy == '0' and controllers == '':
+            # cgroup v2: "max 100000" albo "<quota> <period>", limit może leżeć wyżej w drzewie
+            path = path.strip('/')
+            while True:
+                value = _read(os.path.join(root, path, 'cpu.max'))
+                if value:
+                    quota, _, period = value.partition(' ')
+                    if quota != 'max':
+                        return int(quota) / int(period or 100000)
+                if not path:
+                    break
+                path = os.path.dirname(path)
+        elif 'cpu' in controllers.split(','):
+            # cgroup v1: cpu.cfs_quota_us = -1 oznacza brak limitu
+            for name in (controllers, 'cpu', 'cpu,cpuacct'):
+                for base in (os.path.join(root, name, path.strip('/')), os.path.join(root, name)):
+                    quota = _read(os.path.join(base, 'cpu.cfs_quota_us'))
+                    period = _read(os.path.join(base, 'cpu.cfs_period_us'))
+                    if quota and period:
+                        return int(quota) / int(period) if int(quota) > 0 else None
+    return None
+
+
+def available_cores():
+    """Rdzenie dostępne dla procesu: maska affinity ograniczona limitem cgroup (co najmniej 1)."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cores = min(cores, int(limit))
+    return max(1, cores)
+
+
+def limit_process_cpus(pid, threads):
+    """Ogranicza proces potomny do ``threads`` ostatnich rdzeni z maski (pierwsze zostają dla GUI)."""
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(pid, cpus[-max(1, threads):])
+    except (AttributeError, OSError):
+        pass
+
+
+def _apportion(total, weights):
+    """Dzieli ``total`` proporcjonalnie do wag (metoda największych reszt).
+
+    Każda pozycja dostaje co najmniej 1, więc na małej liczbie rdzeni suma
+    może przekroczyć ``total`` - lepsze lekkie przeciążenie niż odebranie
+    wątków największemu odbiorcy.
+    """
+    if not weights:
+        return {}
+    weight_sum = sum(weights.values()) or 1.0
+    exact = {name: max(total, 1) * w / weight_sum for name, w in weights.items()}
+    result = {name: max(1, int(value)) for name, value in exact.items()}
+    while sum(result.values()) < total:
+        name = max(result, key=lambda n: exact[n] - result[n])
+        result[name] += 1
+    return result
+
+
+class ResourceBudget:
+    """Liczba wątków na podsystem, przeliczana przy zmianie aktywności.
+
+    ``fixed`` to stałe liczby wątków (np. ``{'whisper': 4}``) - pozostałe
+    rdzenie dzielone są według ``shares`` między aktywne podsystemy.
+    Podsystemy odczytują swój przydział (:meth:`threads`) przy starcie
+    każdego zadania, więc zmiana podziału działa od następnego zadania.
+    """
+
+    def __init__(self, cores=None, fixed=None, shares=None):
+        self.cores = int(cores) if cores else available_cores()
+        self.fixed = {name: int(n) for name, n in (fixed or {}).items() if name in SUBSYSTEMS and n}
+        self.shares = dict(DEFAULT_SHARES)
+        self.shares.update({name: float(w) for name, w in (shares or {}).items() if name in SUBSYSTEMS})
+        self._active = set(SUBSYSTEMS)
+        self._lock = threading.Lock()
+        self._split = self._compute(self._active)
+        self._base = dict(self._split)
+
+    def _compute(self, active):
+        auto = {name: self.shares[name] for name in SUBSYSTEMS if name not in self.fixed and name in active}
+        split = dict.fromkeys(SUBSYSTEMS, 0)
+        split.update(self.fixed)
+        split.update(_apportion(self.cores - sum(self.fixed.values()), auto))
+        return split
+
+    def split(self):
+        """Bieżący podział {podsystem: wątki}; bezczynne podsystemy mają 0."""
+        with self._lock:
+            return dict(self._split)
+
+    def threads(self, name):
+        """Bieżąca liczba wątków podsystemu (co najmniej 1)."""
+        with self._lock:
+            return max(1, self._split[name])
+
+    def base(self, name):
+        """Liczba wątków przy wszystkich podsystemach aktywnych - dla ustawień niezmiennych po starcie."""
+        return max(1, self._base[name])
+
+    def set_active(self, name, active):
+        """Zgłasza start (``True``) albo bezczynność podsystemu i przelicza podział."""
+        if name in ALWAYS_ACTIVE:
+            return
+        with self._lock:
+            if (name in self._active) == bool(active):
+                return
+            if active:
+                self._active.add(name)
+            else:
+                self._active.discard(name)
+            self._split = self._compute(self._active)
+
+    def checker_concurrency(self, backend):
+        """Górny limit prób w toku dla sprawdzania wynikający z jego części rdzeni."""
+        backend = backend if backend in PROBES_PER_THREAD else 'threads'
+        return min(self.threads('checker') * PROBES_PER_THREAD[backend], MAX_CONCURRENCY[backend])
+
+    def describe(self):
+        split = self.split()
+        return f"{self.cores} cores: " + ", ".join(f"{name} {split[name]}" for name in SUBSYSTEMS)
@@ -0,0 +1,193 @@
+"""Napisy rysowane na obrazie wideo - widoczne także na pełnym ekranie.
+
+:class:`SubtitleOverlay` zastępuje ``QVideoWidget``: obraz trafia do
+``QGraphicsVideoItem`` na scenie, a nad nim leżą elementy
+:class:`CueItem` z ostatnimi ``max_cues`` napisami. Układ tekstu
+(``QStaticText``) liczony jest raz na napis i rozmiar okna, a gotowy obraz
+napisu trzyma ``DeviceCoordinateCache`` - przerysowanie przy każdej klatce
+wideo to tylko skopiowanie pikseli.
+
+Czasy napisów to sekundy strumienia z segmentów transkrypcji.
+:class:`CueClock` przelicza je na czas zegara monotonicznego na podstawie
+najmniejszego zaobserwowanego opóźnienia między końcem segmentu a jego
+nadejściem; ``delay`` przesuwa napisy, gdy obraz jest opóźniony względem
+dźwięku wysyłanego do transkrypcji.
+"""
+import time
+
+from qtpy.QtCore import QPointF, QRectF, QSizeF, Qt, QTimer
+from qtpy.QtGui import QColor, QFont, QFontMetricsF, QStaticText, QTextOption, QTransform
+from qtpy.QtMultimediaWidgets import QGraphicsVideoItem
+from qtpy.QtWidgets import QFrame, QGraphicsItem, QGraphicsScene, QGraphicsView
+
+DEFAULT_CUES = 2
+MIN_DURATION = 1.5    # najkrótszy czas wyświetlania napisu (s)
+LINGER = 1.0          # napis zostaje tyle sekund po końcu segmentu
+MAX_WIDTH = 0.8       # szerokość napisu jako część szerokości obrazu
+FONT_DIVISOR = 22     # wysokość czcionki = wysokość obrazu / FONT_DIVISOR
+MIN_POINT_SIZE = 10
+PADDING = 0.25        # margines tła jako część wysokości czcionki
+
+
+class CueClock:
+    """Przelicza czas segmentu (s od początku strumienia) na ``time.monotonic()``."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.offset = None
+
+    def observe(self, end, now):
+        lag = now - end
+        if self.offset is None or lag < self.offset:
+            self.offset = lag
+
+    def at(self, stream_time):
+        return self.offset + stream_time + self.delay
+
+    def reset(self):
+        self.offset = None
+
+
+class CueItem(QGraphicsItem):
+    """Jeden napis: tekst z gotowym układem na półprzezroczystym tle."""
+
+    def __init__(self, text, show_at, hide_at):
+        super().__init__()
+        self.text = text
+        self.show_at = show_at
+        self.hide_at = hide_at
+        self._static = QStaticText()
+        self._static.setTextFormat(Qt.PlainText)
+        self._font = QFont()
+        self._size = QSizeF()
+        self._padding = 0.0
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setZValue(1)
+
+    def layout(self, font, max_width):
+        """Układa tekst dla czcionki i szerokości; wołane tylko po zmianie rozmiaru obrazu."""
+        self.prepareGeometryChange()
+        self._font = font
+        self._padding = QFontMetricsF(font).height() * PADDING
+        natural = QFontMetricsF(font).horizontalAdvance(self.text)
+        static = QStaticText(self.text)
+        static.setTextFormat(Qt.PlainText)
+        static.setTextOption(QTextOption(Qt.AlignHCenter))
+        static.setTextWidth(min(natural + 1, max_width) if max_width > 0 else natural + 1)
+        static.prepare(QTransform(), font)
+        self._static = static
+        self._size = static.size()
+        self.update()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self._size.width() + 2 * self._padding, self._size.height() + 2 * self._padding)
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 170))
+        painter.drawRoundedRect(self.boundingRect(), self._padding, self._padding)
+        painter.setFont(self._font)
+        painter.setPen(Qt.white)
+        painter.drawStaticText(QPointF(self._padding, self._padding), self._static)
+
+
+class SubtitleOverlay(QGraphicsView):
+    """Wideo (``video_item`` dla ``QMediaPlayer.setVideoOutput``) z napisami u dołu obrazu.
+
+    :meth:`add_cue` planuje napis na czas jego segmentu; jeden
+    jednorazowy ``QTimer`` budzi widok na najbliższe pokazanie lub
+    ukrycie napisu, więc bez napisów nic nie jest liczone.
+    """
+
+    def __init__(self, max_cues=DEFAULT_CUES, delay=0.0, parent=None):
+        super().__init__(parent)
+        self.max_cues = max_cues
+        self.clock = CueClock(delay)
+        self.setScene(QGraphicsScene(self))
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setBackgroundBrush(Qt.black)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.video_item = QGraphicsVideoItem()
+        self.scene().addItem(self.video_item)
+        self._pending = []    # napisy czekające na swój czas
+        self._visible = []    # wyświetlane, od najstarszego
+        self._font = QFont()
+        self._max_width = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._update_cues)
+
+    def add_cue(self, text, start, end, now=None):
+        """Dodaje napis dla segmentu ``start``-``end`` (sekundy strumienia)."""
+        if not self.max_cues or not text:
+            return
+        now = time.monotonic() if now is None else now
+        self.clock.observe(end, now)
+        show_at = max(self.clock.at(start), now)
+        hide_at = max(self.clock.at(end) + LINGER, show_at + MIN_DURATION)
+        self._pending.append(CueItem(text, show_at, hide_at))
+        self._update_cues(now)
+
+    def clear_cues(self):
+        self._timer.stop()
+        for cue in self._visible:
+            self.scene().removeItem(cue)
+        self._pending.clear()
+        self._visible.clear()
+        self.clock.reset()
+
+    def cue_texts(self):
+        return [cue.text for cue in self._visible]
+
+    def _update_cues(self, now=None):
+        now = time.monotonic() if now is None else now
+        changed = False
+        due = [cue for cue in self._pending if cue.show_at <= now]
+        if due:
+            self._pending = [cue for cue in self._pending if cue.show_at > now]
+            for cue in due:
+                cue.layout(self._font, self._max_width)
+                self.scene().addItem(cue)
+                self._visible.append(cue)
+            changed = True
+        expired = [cue for cue in self._visible if cue.hide_at <= now]
+        remaining = [cue for cue in self._visible if cue.hide_at > now]
+        if len(remaining) > self.max_cues:
+            expired += remaining[:len(remaining) - self.max_cues]
+        for cue in expired:
+            self.scene().removeItem(cue)
+            self._visible.remove(cue)
+            changed = True
+        if changed:
+            self._place_cues()
+        deadlines = [cue.show_at for cue in self._pending] + [cue.hide_at for cue in self._visible]
+        if deadlines:
+            self._timer.start(max(0, int((min(deadlines) - now) * 1000)))
+        else:
+            self._timer.stop()
+
+    def _place_cues(self):
+        """Układa napisy od dołu obrazu w górę, najnowszy na dole."""
+        rect = self.sceneRect()
+        y = rect.bottom() - rect.height() * 0.05
+        for cue in reversed(self._visible):
+            box = cue.boundingRect()
+            y -= box.height()
+            cue.setPos(rect.center().x() - box.width() / 2, y)
+            y -= box.height() * 0.1
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        size = self.viewport().size()
+        rect = QRectF(0, 0, size.width(), size.height())
+        self.scene().setSceneRect(rect)
+        self.video_item.setSize(rect.size())
+        self._font = QFont(self.font())
+        self._font.setPointSizeF(max(MIN_POINT_SIZE, rect.height() / FONT_DIVISOR * 0.75))
+        self._max_width = rect.width() * MAX_WIDTH
+        for cue in self._visible:
+            cue.layout(self._font, self._max_width)
+        self._place_cues()
@@ -0,0 +1,49 @@
+"""Okno napisów dopisujące linie zamiast przepisywania całego dokumentu."""
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QPlainTextEdit
+
+DEFAULT_MAX_LINES = 500
+FLUSH_INTERVAL_MS = 16  # jedna klatka przy 60 Hz
+
+
+class SubtitleView(QPlainTextEdit):
+    """Historia napisów ograniczona do ``max_lines`` ostatnich linii.
+
+    :meth:`append_line` tylko zapamiętuje tekst; linie z jednej klatki
+    dopisywane są razem jednym ``appendPlainText``, więc seria napisów
+    kosztuje jedno przerysowanie. ``setMaximumBlockCount`` usuwa najstarsze
+    bloki z początku dokumentu, dzięki czemu koszt dopisania linii nie rośnie
+    z długością sesji. Widok przewija się na koniec tylko wtedy, gdy był na
+    końcu - przewijanie historii nie jest przerywane przez nowe napisy.
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def append_line(self, text):
+        self._pending.append(text)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        if not self._pending:
+            return
+        text = '\n'.join(self._pending)
+        self._pending.clear()
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.appendPlainText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear_lines(self):
+        self._pending.clear()
+        self.clear()
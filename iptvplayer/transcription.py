@@ -0,0 +1,145 @@
+"""Segmenty transkrypcji z klienta WhisperLive, bez przechwytywania ``sys.stdout``.
+
+Klient WhisperLive nie udostępnia wyników - wypisuje ostatnie linie na
+ekran. :class:`SegmentStream` podpina się pod jego ``process_segments``
+(wywoływane dla każdej wiadomości serwera) i zamienia listę słowników na
+obiekty :class:`Segment`. Serwer za każdym razem odsyła kilka ostatnich
+segmentów, więc ukończony segment przekazywany jest tylko raz (gdy zaczyna
+się nie wcześniej niż koniec poprzedniego), a nieukończony - przy każdej
+zmianie tekstu, z ``completed=False``.
+
+:class:`SegmentQueue` to ograniczona kolejka między wątkiem klienta a GUI:
+gdy jest pełna, najstarszy segment jest odrzucany - przy napisach na żywo
+zaległy tekst jest mniej wart niż bieżący.
+"""
+import collections
+import threading
+
+from .lazy import lazy_import
+
+whisper_client = lazy_import('whisper_live.client')
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class Segment:
+    """Fragment transkrypcji; ``start``/``end`` w sekundach od początku strumienia."""
+
+    __slots__ = ('text', 'start', 'end', 'completed')
+
+    def __init__(self, text, start, end, completed):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.completed = completed
+
+    @classmethod
+    def from_message(cls, seg):
+        """Segment z wiadomości serwera (``start``/``end`` przychodzą jako tekst)."""
+        return cls(seg.get('text', '').strip(), float(seg.get('start', 0.0)), float(seg.get('end', 0.0)),
+                   bool(seg.get('completed', False)))
+
+    def __repr__(self):
+        state = 'completed' if self.completed else 'partial'
+        return f"Segment({self.text!r}, {self.start:.2f}-{self.end:.2f}, {state})"
+
+
+class SegmentQueue:
+    """Ograniczona kolejka segmentów; przy przepełnieniu odrzuca najstarszy."""
+
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE):
+        self._items = collections.deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, segment):
+        with self._lock:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(segment)
+
+    def drain(self):
+        """Zwraca i usuwa wszystkie czekające segmenty (od najstarszego)."""
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TranscriptionStopped(Exception):
+    """Zgłaszany w wątku klienta, żeby przerwać przesyłanie dźwięku po :meth:`SegmentStream.stop`."""
+
+
+def make_client(host, port, lang=None, model='small'):
+    """Klient WhisperLive bez wypisywania transkrypcji na ekran (jeśli wersja na to pozwala)."""
+    try:
+        return whisper_client.TranscriptionClient(host, port, lang=lang, model=model, log_transcription=False)
+    except TypeError:
+        return whisper_client.TranscriptionClient(host, port, lang=lang, model=model)
+
+
+class SegmentStream:
+    """Łączy klienta WhisperLive z funkcją ``on_segment(Segment)``.
+
+    :meth:`run` blokuje do końca strumienia albo do :meth:`stop`;
+    ``on_segment`` wywoływane jest z wątku klienta WebSocket.
+    """
+
+    def __init__(self, client, on_segment):
+        self.client = client
+        self.on_segment = on_segment
+        self._stopped = threading.Event()
+        self._last_end = -1.0
+        self._partial = None
+        # TranscriptionClient opakowuje właściwego klienta (Client) w ``client``
+        inner = getattr(client, 'client', client)
+        process_segments = inner.process_segments
+
+        def hooked_process_segments(segments, *args, **kwargs):
+            self._on_segments(segments)
+            return process_segments(segments, *args, **kwargs)
+
+        inner.process_segments = hooked_process_segments
+
+        # Przerwanie pętli ffmpeg -> serwer: klient sam kończy ffmpeg i zamyka połączenie
+        sender_owner, sender_name = (client, 'multicast_packet') if hasattr(client, 'multicast_packet') \
+            else (inner, 'send_packet_to_server')
+        send = getattr(sender_owner, sender_name)
+
+        def guarded_send(*args, **kwargs):
+            if self._stopped.is_set():
+                raise TranscriptionStopped()
+            return send(*args, **kwargs)
+
+        setattr(sender_owner, sender_name, guarded_send)
+
+    def _on_segments(self, segments):
+        if self._stopped.is_set():
+            return
+        for i, raw in enumerate(segments):
+            try:
+                segment = Segment.from_message(raw)
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if segment.completed:
+                if segment.start >= self._last_end and segment.text:
+                    self._last_end = segment.end
+                    self._partial = None
+                    self.on_segment(segment)
+            elif i == len(segments) - 1 and segment.text and segment.text != self._partial:
+                self._partial = segment.text
+                self.on_segment(segment)
+
+    def run(self, hls_url):
+        if not self._stopped.is_set():
+            self.client(hls_url=hls_url)
+
+    def stop(self):
+        self._stopped.set()
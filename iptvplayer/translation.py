@@ -0,0 +1,199 @@
+"""Tłumaczenie segmentów transkrypcji poza wątkiem GUI.
+
+Tłumaczenie to zapytanie sieciowe trwające od kilkudziesięciu milisekund
+do kilku sekund; wykonywane w wątku GUI zamrażało sterowanie odtwarzaniem.
+:class:`TranslationStage` przyjmuje ukończone segmenty
+(:class:`~iptvplayer.transcription.Segment`), łączy sąsiednie krótkie
+fragmenty w jedno zapytanie (:class:`SegmentBatcher`), tłumaczy je w puli
+wątków i oddaje wyniki sygnałem ``translated`` w kolejności segmentów,
+nawet jeśli zapytania kończą się w innej kolejności. Partie, które
+czekają na wolny wątek, trafiają do tłumacza razem przez
+``translate_batch`` (do ``max_batch`` tłumacza naraz).
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from qtpy.QtCore import QObject, Signal
+
+SHORT_CHARS = 60      # segment krótszy czeka na następny, żeby trafić do jednego zapytania
+MAX_BATCH_CHARS = 240
+MAX_GAP = 1.5         # największa przerwa (s) między łączonymi segmentami
+MAX_HOLD = 0.6        # najdłuższe czekanie (s) krótkiego segmentu na sąsiada
+
+
+class Translation:
+    """Przetłumaczony fragment: jeden albo kilka połączonych segmentów."""
+
+    __slots__ = ('segments', 'text', 'translated', 'error')
+
+    def __init__(self, segments, translated, error=None):
+        self.segments = segments
+        self.text = ' '.join(segment.text for segment in segments)
+        self.translated = translated
+        self.error = error
+
+    @property
+    def start(self):
+        return self.segments[0].start
+
+    @property
+    def end(self):
+        return self.segments[-1].end
+
+
+class SegmentBatcher:
+    """Łączy kolejne ukończone segmenty w partie do tłumaczenia.
+
+    Partia zamykana jest, gdy przekroczy ``max_chars``, gdy następny
+    segment jest odległy o więcej niż ``max_gap`` albo gdy ostatni krótki
+    segment czeka dłużej niż ``max_hold``. Długi segment zamyka partię od razu.
+    """
+
+    def __init__(self, short_chars=SHORT_CHARS, max_chars=MAX_BATCH_CHARS, max_gap=MAX_GAP, max_hold=MAX_HOLD):
+        self.short_chars = short_chars
+        self.max_chars = max_chars
+        self.max_gap = max_gap
+        self.max_hold = max_hold
+        self._pending = []
+        self._chars = 0
+        self._since = 0.0
+
+    def add(self, segment, now=None):
+        """Dodaje segment; zwraca listę zamkniętych partii (może być pusta)."""
+        now = time.monotonic() if now is None else now
+        ready = []
+        if self._pending and (segment.start - self._pending[-1].end > self.max_gap
+                              or self._chars + len(segment.text) > self.max_chars):
+            ready.append(self._take())
+        if not self._pending:
+            self._since = now
+        self._pending.append(segment)
+        self._chars += len(segment.text) + 1
+        if len(segment.text) >= self.short_chars:
+            ready.append(self._take())
+        return ready
+
+    def due(self, now=None):
+        """Partia czekająca dłużej niż ``max_hold`` (albo ``None``)."""
+        now = time.monotonic() if now is None else now
+        if self._pending and now - self._since >= self.max_hold:
+            return self._take()
+        return None
+
+    def flush(self):
+        return self._take() if self._pending else None
+
+    def clear(self):
+        self._pending = []
+        self._chars = 0
+
+    def _take(self):
+        batch, self._pending, self._chars = self._pending, [], 0
+        return batch
+
+
+class TranslationStage(QObject):
+    """Pula tłumaczeń z wynikami oddawanymi sygnałem w kolejności zgłoszenia.
+
+    ``translator_factory()`` tworzy tłumacza (obiekt z metodą
+    ``translate(tekst)``) osobno dla każdego wątku puli. Jeśli tłumacz ma
+    ``max_batch`` > 1, wątek zabiera z kolejki do tylu czekających partii
+    i tłumaczy je jednym ``translate_batch(teksty)``. :meth:`submit`
+    i :meth:`poll` wywoływane są z wątku GUI; sygnał ``translated``
+    emitowany jest z wątków puli (połączenie kolejkowane dostarcza go do GUI).
+    """
+
+    translated = Signal(object)   # Translation
+
+    def __init__(self, translator_factory, workers=2, batcher=None, parent=None):
+        super().__init__(parent)
+        self.translator_factory = translator_factory
+        self.batcher = batcher or SegmentBatcher()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='translate')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._next_seq = 0      # numer następnej zgłoszonej partii
+        self._emit_seq = 0      # numer następnej partii do wysłania sygnałem
+        self._done = {}         # gotowe wyniki czekające na wcześniejsze partie
+        self._queue = deque()   # (numer, pokolenie, partia) czekające na wątek puli
+        self._generation = 0    # zwiększany przez reset() - stare wyniki są odrzucane
+        self.batches = 0
+        self.segments = 0
+
+    def submit(self, segments):
+        """Przyjmuje ukończone segmenty; pełne partie trafiają od razu do puli."""
+        now = time.monotonic()
+        for segment in segments:
+            self.segments += 1
+            for batch in self.batcher.add(segment, now):
+                self._dispatch(batch)
+        self.poll(now)
+
+    def poll(self, now=None):
+        """Wysyła partię, która za długo czekała na sąsiada (wywoływane cyklicznie)."""
+        batch = self.batcher.due(now)
+        if batch:
+            self._dispatch(batch)
+
+    def reset(self):
+        """Porzuca czekające partie i wyniki tłumaczeń w toku (np. po zmianie kanału)."""
+        self.batcher.clear()
+        with self._lock:
+            self._generation += 1
+            self._done.clear()
+            self._queue.clear()
+            self._emit_seq = self._next_seq
+
+    def shutdown(self):
+        self.reset()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self, batch):
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._queue.append((seq, self._generation, batch))
+        self.batches += 1
+        self._pool.submit(self._translate)
+
+    def _translator(self):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._local.translator = self.translator_factory()
+        return translator
+
+    def _translate(self):
+        try:
+            translator, failure = self._translator(), None
+        except Exception as e:  # np. brak modelu lokalnego silnika
+            translator, failure = None, str(e)
+        limit = max(1, getattr(translator, 'max_batch', 1))
+        with self._lock:
+            jobs = [self._queue.popleft() for _ in range(min(limit, len(self._queue)))]
+        if not jobs:
+            return  # partie zabrał już inny wątek razem ze swoimi
+        batches = [batch for _, _, batch in jobs]
+        texts = [' '.join(segment.text for segment in batch) for batch in batches]
+        try:
+            if translator is None:
+                raise RuntimeError(failure)
+            if len(texts) == 1:
+                translated = [translator.translate(texts[0])]
+            else:
+                translated = translator.translate_batch(texts)
+            results = [Translation(batch, text) for batch, text in zip(batches, translated)]
+        except Exception as e:
+            results = [Translation(batch, None, str(e)) for batch in batches]
+        ready = []
+        with self._lock:
+            for (seq, generation, _), result in zip(jobs, results):
+                if generation == self._generation:
+                    self._done[seq] = result
+            while self._emit_seq in self._done:
+                ready.append(self._done.pop(self._emit_seq))
+                self._emit_seq += 1
+            # Emisja pod zamkiem - inny wątek nie wyprzedzi kolejności
+            for item in ready:
+                self.translated.emit(item)
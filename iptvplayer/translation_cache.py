@@ -0,0 +1,158 @@
+"""Pamięć podręczna tłumaczeń: LRU w pamięci i opcjonalna warstwa SQLite.
+
+Te same frazy wracają wielokrotnie - dżingle stacji, paski wiadomości,
+powtórzone segmenty Whispera - a każde tłumaczenie to zapytanie sieciowe.
+Kluczem jest (język źródłowy, język docelowy, tekst po normalizacji:
+zwinięte odstępy, małe litery). Wpisy w pamięci wygasają po ``ttl``
+sekundach albo wypadają jako najdawniej używane po przekroczeniu
+``max_entries``; warstwa na dysku przeżywa restart odtwarzacza i ma
+własny, dłuższy ``disk_ttl``.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from .paths import cache_dir
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL = 24 * 3600
+DEFAULT_DISK_TTL = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translated TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (source, target, text)
+)
+"""
+
+
+def normalize_text(text):
+    return ' '.join(text.split()).casefold()
+
+
+class TranslationCache:
+    """Dwupoziomowa pamięć tłumaczeń, bezpieczna dla wielu wątków.
+
+    ``path=False`` wyłącza warstwę SQLite, ``None`` używa domyślnego pliku
+    w katalogu cache. Liczniki trafień dostępne są przez :meth:`stats`.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, path=None, disk_ttl=DEFAULT_DISK_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self._memory = OrderedDict()   # klucz -> (tłumaczenie, czas zapisu)
+        self._lock = threading.Lock()
+        self.counters = Counter()
+        self._db = None
+        if path is not False:
+            self.path = path or os.path.join(cache_dir(), 'translations.sqlite3')
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(_SCHEMA)
+            self._db.execute("DELETE FROM translations WHERE stored_at < ?", (time.time() - disk_ttl,))
+            self._db.commit()
+
+    def get(self, source, target, text, now=None):
+        """Tłumaczenie z pamięci albo z dysku; ``None``, jeśli go nie ma lub wygasło."""
+        now = time.time() if now is None else now
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return entry[0]
+                del self._memory[key]
+                self.counters['expired'] += 1
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translated, stored_at FROM translations WHERE source = ? AND target = ? AND text = ?",
+                    key).fetchone()
+                if row is not None and now - row[1] <= self.disk_ttl:
+                    self.counters['disk_hits'] += 1
+                    self._remember(key, row[0], now)
+                    return row[0]
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, source, target, text, translated, now=None):
+        now = time.time() if now is None else now
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            self._remember(key, translated, now)
+            self.counters['stores'] += 1
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", key + (translated, now))
+                self._db.commit()
+
+    def _remember(self, key, translated, now):
+        self._memory[key] = (translated, now)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._memory)
+        hits = counters.get('memory_hits', 0) + counters.get('disk_hits', 0)
+        lookups = hits + counters.get('misses', 0)
+        counters.update(entries=entries, max_entries=self.max_entries, lookups=lookups,
+                        hit_rate=hits / lookups if lookups else 0.0)
+        return counters
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CachedTranslator:
+    """Tłumacz (``translate``/``translate_batch``) sprawdzający najpierw :class:`TranslationCache`."""
+
+    def __init__(self, translator, cache, source, target):
+        self.translator = translator
+        self.cache = cache
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        translated = self.cache.get(self.source, self.target, text)
+        if translated is None:
+            translated = self.translator.translate(text)
+            if translated:
+                self.cache.put(self.source, self.target, text, translated)
+        return translated
+
+    @property
+    def max_batch(self):
+        return getattr(self.translator, 'max_batch', 1)
+
+    def translate_batch(self, texts):
+        """Tłumaczy jednym wywołaniem tylko te teksty, których nie ma w pamięci."""
+        results = [self.cache.get(self.source, self.target, text) for text in texts]
+        missing = [i for i, translated in enumerate(results) if translated is None]
+        if missing:
+            translated = self.translator.translate_batch([texts[i] for i in missing])
+            for i, text in zip(missing, translated):
+                results[i] = text
+                if text:
+                    self.cache.put(self.source, self.target, texts[i], text)
+        return results
@@ -0,0 +1,221 @@
+"""Wymienne silniki tłumaczenia napisów.
+
+Każdy silnik ma ``translate(tekst)``, ``translate_batch(teksty)``,
+``source``/``target`` (kody języków, używane też jako klucz
+:class:`~iptvplayer.translation_cache.TranslationCache`) i ``close()``;
+wszystkie można wywoływać z wielu wątków naraz.
+
+- ``google`` - :class:`GoogleBackend`, usługa sieciowa przez deep_translator,
+- ``argos`` - :class:`ArgosBackend`, pakiety argostranslate (lokalnie, CPU),
+- ``ctranslate2`` - :class:`CTranslate2Backend`, model Marian/OPUS-MT
+  przekonwertowany do CTranslate2; ``inter_threads`` tłumaczeń naraz,
+  ``intra_threads`` wątków na jedno tłumaczenie,
+- ``echo`` - :class:`EchoBackend`, lokalny zastępnik bez modelu
+  (zwraca tekst, opcjonalnie po stałym opóźnieniu) do testów i pomiarów.
+
+:class:`BoundedTranslator` ogranicza czas pojedynczego tłumaczenia:
+po ``timeout`` sekundach zgłasza :class:`TranslationTimeout`, a napis
+zostaje wyświetlony bez tłumaczenia.
+
+``max_batch`` silnika mówi, ile tekstów opłaca się oddać jednym
+``translate_batch``; większe niż 1 ma tylko CTranslate2, który tłumaczy
+partię jednym przebiegiem modelu. Pozostałe silniki tłumaczą teksty po
+kolei, więc lepiej wywoływać je równolegle z osobnych wątków.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from .lazy import lazy_import
+
+deep_translator = lazy_import('deep_translator')
+
+DEFAULT_TIMEOUT = 5.0
+
+
+class TranslationTimeout(Exception):
+    pass
+
+
+class TranslatorBackend:
+    name = None
+    max_batch = 1
+
+    def __init__(self, target, source='auto'):
+        self.target = target
+        self.source = source
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        return [self.translate(text) for text in texts]
+
+    def close(self):
+        pass
+
+
+class GoogleBackend(TranslatorBackend):
+    """Tłumacz Google; jeden obiekt GoogleTranslator na wątek (nie jest bezpieczny dla wątków)."""
+
+    name = 'google'
+
+    def __init__(self, target, source='auto'):
+        super().__init__(target, source)
+        self._local = threading.local()
+
+    def translate(self, text):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._local.translator = deep_translator.GoogleTranslator(source=self.source,
+                                                                                  target=self.target)
+        return translator.translate(text)
+
+
+class ArgosBackend(TranslatorBackend):
+    """Tłumaczenie lokalne pakietami argostranslate (muszą być zainstalowane dla pary języków)."""
+
+    name = 'argos'
+
+    def __init__(self, target, source='en'):
+        super().__init__(target, source)
+        from argostranslate import translate
+        self._translation = translate.get_translation_from_codes(source, target)
+        if self._translation is None:
+            raise RuntimeError(f"no Argos package installed for {source} -> {target}")
+
+    def translate(self, text):
+        return self._translation.translate(text)
+
+
+class CTranslate2Backend(TranslatorBackend):
+    """Model Marian (OPUS-MT) w formacie CTranslate2 z ``source.spm``/``target.spm`` w katalogu modelu.
+
+    ``source_prefix`` to znacznik języka modeli wielojęzycznych (np. ``>>pol<<``).
+    """
+
+    name = 'ctranslate2'
+    max_batch = 16
+
+    def __init__(self, target, source='en', model_dir=None, inter_threads=1, intra_threads=1,
+                 beam_size=2, source_prefix=None):
+        super().__init__(target, source)
+        if not model_dir:
+            raise RuntimeError("translation_model_dir is not set")
+        import ctranslate2
+        import sentencepiece
+        self._translator = ctranslate2.Translator(model_dir, device='cpu', inter_threads=inter_threads,
+                                                  intra_threads=intra_threads)
+        self._source_spm = sentencepiece.SentencePieceProcessor(model_file=os.path.join(model_dir, 'source.spm'))
+        self._target_spm = sentencepiece.SentencePieceProcessor(model_file=os.path.join(model_dir, 'target.spm'))
+        self.beam_size = beam_size
+        self.source_prefix = source_prefix
+
+    def translate_batch(self, texts):
+        tokens = self._source_spm.encode(list(texts), out_type=str)
+        prefix = [self.source_prefix] if self.source_prefix else []
+        batch = [prefix + t + ['</s>'] for t in tokens]
+        results = self._translator.translate_batch(batch, beam_size=self.beam_size, max_decoding_length=256)
+        return [self._target_spm.decode(result.hypotheses[0]) for result in results]
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+
+class EchoBackend(TranslatorBackend):
+    """Zastępnik bez modelu i sieci: zwraca tekst (z ``prefix``) po ``latency`` sekundach."""
+
+    name = 'echo'
+
+    def __init__(self, target, source='auto', latency=0.0, prefix=''):
+        super().__init__(target, source)
+        self.latency = latency
+        self.prefix = prefix
+
+    def translate(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.prefix + text
+
+
+BACKENDS = {cls.name: cls for cls in (GoogleBackend, ArgosBackend, CTranslate2Backend, EchoBackend)}
+LOCAL_BACKENDS = frozenset({'argos', 'ctranslate2', 'echo'})
+
+
+def make_backend(name, target, source=None, **options):
+    """Tworzy silnik o nazwie z :data:`BACKENDS`; ``options`` trafiają do konstruktora."""
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown translation backend {name!r} (choose from {', '.join(BACKENDS)})") from None
+    if source:
+        options['source'] = source
+    return cls(target, **options)
+
+
+class BoundedTranslator:
+    """Wykonuje wywołania silnika w osobnej puli i czeka najwyżej ``timeout`` sekund.
+
+    Wywołanie, które przekroczy czas, kończy się w tle (wątku nie da się
+    przerwać), ale wołający dostaje :class:`TranslationTimeout` od razu -
+    zawieszona usługa nie opóźnia napisów bardziej niż o ``timeout``.
+    Porzucone wywołanie nadal zajmuje jedno z ``workers`` miejsc, dopóki
+    silnik naprawdę nie odpowie; gdy wszystkie są zajęte, następne
+    tłumaczenie czeka na wolne miejsce w ramach tego samego ``timeout``,
+    zamiast ustawiać się w kolejce puli bez limitu.
+    """
+
+    def __init__(self, backend, timeout=DEFAULT_TIMEOUT, workers=2):
+        self.backend = backend
+        self.timeout = timeout
+        self.source = backend.source
+        self.target = backend.target
+        self.max_batch = backend.max_batch
+        self.workers = max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'{backend.name}-call')
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.abandoned = 0   # wywołania po przekroczeniu czasu, które jeszcze trwają
+
+    def translate(self, text):
+        return self._call(self.backend.translate, text)
+
+    def translate_batch(self, texts):
+        return self._call(self.backend.translate_batch, list(texts))
+
+    def _call(self, method, argument):
+        deadline = time.monotonic() + self.timeout
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise TranslationTimeout(f"no free {self.backend.name} worker within {self.timeout:g}s "
+                                     f"({self.abandoned} calls still running after a timeout)")
+        try:
+            future = self._pool.submit(method, argument)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finished)
+        try:
+            return future.result(max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            cancelled = future.cancel()  # anulowanie woła _finished od razu - poza zamkiem
+            with self._lock:
+                self.timeouts += 1
+                if not cancelled and not future.done():
+                    future.abandoned = True
+                    self.abandoned += 1
+            raise TranslationTimeout(f"{self.backend.name} did not answer within {self.timeout:g}s") from None
+
+    def _finished(self, future):
+        """Zwalnia miejsce dopiero po faktycznym zakończeniu (albo anulowaniu) wywołania."""
+        with self._lock:
+            if getattr(future, 'abandoned', False):
+                self.abandoned -= 1
+        self._slots.release()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.backend.close()
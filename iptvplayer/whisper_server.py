@@ -0,0 +1,392 @@
+"""Nadzór nad serwerem WhisperLive: start w tle, kontrola stanu, restart, ponowne użycie.
+
+:class:`WhisperServerSupervisor` jest właścicielem procesu
+``WhisperLive/run_server.py``. :meth:`~WhisperServerSupervisor.start` wraca
+od razu, a wątek nadzorcy:
+
+* przejmuje serwer działający już na porcie (np. pozostawiony przez
+  poprzednie uruchomienie odtwarzacza), dzięki czemu model nie jest
+  ładowany ponownie - numer procesu zapisany jest w pliku ``.pid``
+  i używany tylko wtedy, gdy ``/proc`` potwierdza, że to nadal
+  ``run_server.py`` na tym porcie (:func:`is_whisper_server`),
+* w przeciwnym razie uruchamia nowy proces i czeka na gotowość, łącząc się
+  co coraz dłuższy odstęp (``READY_INITIAL_DELAY`` do ``READY_MAX_DELAY``)
+  aż do ``ready_timeout``,
+* co ``health_interval`` sekund sprawdza serwer na poziomie aplikacji
+  (uzgodnienie WebSocket, nie samo połączenie TCP); po ``HEALTH_FAILURES``
+  nieudanych próbach z rzędu albo po zakończeniu procesu uruchamia go
+  ponownie z wykładniczym odstępem, a po ``MAX_RESTARTS`` nieudanych
+  restartach z rzędu zgłasza :data:`FAILED`.
+
+Wyjście serwera trafia do rotowanego pliku dziennika, więc potok nigdy się
+nie zapełnia. Zmiany stanu (:data:`STARTING`, :data:`READY`,
+:data:`RESTARTING`, :data:`FAILED`) zgłaszane są wywołaniem
+``on_state(stan, opis)`` z wątku nadzorcy.
+"""
+import base64
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from .paths import cache_dir
+
+DEFAULT_PORT = 9090
+SERVER_PYTHON = 'python3.11'  # interpreter ze środowiskiem WhisperLive
+READY_TIMEOUT = 120.0
+READY_INITIAL_DELAY = 0.05
+READY_MAX_DELAY = 2.0
+HEALTH_INTERVAL = 10.0
+HEALTH_TIMEOUT = 3.0
+HEALTH_FAILURES = 3
+RESTART_INITIAL_DELAY = 1.0
+RESTART_MAX_DELAY = 60.0
+MAX_RESTARTS = 5
+STABLE_AFTER = 300.0   # po tylu sekundach poprawnej pracy licznik restartów jest zerowany
+STOP_TIMEOUT = 5.0
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+STARTING = 'starting'
+READY = 'ready'
+RESTARTING = 'restarting'
+FAILED = 'failed'
+
+
+def is_port_in_use(port, host='localhost'):
+    """Sprawdza czy port jest zajęty."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(1.0)
+        return s.connect_ex((host, port)) == 0
+
+
+def websocket_ping(port, host='localhost', timeout=HEALTH_TIMEOUT):
+    """Czy serwer odpowiada na uzgodnienie WebSocket (``101 Switching Protocols``).
+
+    Po udanym uzgodnieniu wysyłana jest ramka zamknięcia, żeby serwer
+    zakończył połączenie bez błędu. Sam otwarty port nie wystarcza -
+    zawieszony proces nadal przyjmuje połączenia TCP.
+    """
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    request = (
+        f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    )
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as s:
+            s.settimeout(timeout)
+            s.sendall(request.encode('ascii'))
+            response = b''
+            while b'\r\n' not in response and len(response) < 1024:
+                chunk = s.recv(1024)
+                if not chunk:
+                    break
+                response += chunk
+            ok = response.split(b' ', 2)[1:2] == [b'101']
+            if ok:
+                # Maskowana ramka zamknięcia (kod 1000), jak wymaga RFC 6455 od klienta
+                mask = os.urandom(4)
+                payload = (1000).to_bytes(2, 'big')
+                s.sendall(bytes([0x88, 0x80 | len(payload)]) + mask
+                          + bytes(b ^ mask[i % 4] for i, b in enumerate(payload)))
+            return ok
+    except OSError:
+        return False
+
+
+def server_command(whisper_dir, port=DEFAULT_PORT, omp_threads=6, python=None,
+                   model_pool_size=1, model_queue_size=8, preload_model=None):
+    """Polecenie uruchomienia serwera.
+
+    ``model_pool_size`` > 0 włącza wspólną pulę modeli (``WhisperLive/model_pool.py``),
+    0 przywraca osobny model dla każdego połączenia (``--no_single_model``).
+    """
+    command = [
+        python or SERVER_PYTHON, os.path.join(whisper_dir, "run_server.py"),
+        "--port", str(port),
+        "--backend", "faster_whisper",
+        "--omp_num_threads", str(omp_threads),
+    ]
+    if model_pool_size > 0:
+        command += ["--model_pool_size", str(model_pool_size), "--model_queue_size", str(model_queue_size)]
+        if preload_model:
+            command += ["--preload_model", preload_model]
+    else:
+        command.append("--no_single_model")
+    return command
+
+
+def server_logger(path=None):
+    """Logger zapisujący wyjście serwera do rotowanego pliku (bez propagacji do konsoli)."""
+    logger = logging.getLogger('iptvplayer.whisper_server')
+    if not logger.handlers:
+        path = path or os.path.join(cache_dir('logs'), 'whisper_server.log')
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def server_port(args):
+    """Port z argumentów ``run_server.py`` (``--port``/``-p``, domyślnie jak w run_server.py)."""
+    for i, arg in enumerate(args):
+        if arg in ('--port', '-p') and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith('--port='):
+            return arg[7:]
+    return str(DEFAULT_PORT)
+
+
+def is_whisper_server(pid, port):
+    """Czy proces ``pid`` to ``run_server.py`` uruchomiony na porcie ``port``.
+
+    Numer z pliku ``.pid`` mógł zostać przydzielony innemu procesowi, więc
+    samo :func:`pid_alive` nie wystarcza przed przejęciem czy wysłaniem
+    sygnału. Bez ``/proc`` (poza Linuksem) procesu nie da się sprawdzić
+    i wynik to ``False``.
+    """
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            args = f.read().decode('utf-8', 'replace').split('\0')
+    except OSError:
+        return False
+    for i, arg in enumerate(args):
+        if os.path.basename(arg) == 'run_server.py':
+            return server_port(args[i + 1:]) == str(port)
+    return False
+
+
+class WhisperServerSupervisor:
+    """Uruchamia, pilnuje i zatrzymuje serwer WhisperLive na porcie ``port``.
+
+    Przy ``keep_running`` serwer uruchamiany jest w osobnej sesji, z wyjściem
+    zapisywanym wprost do pliku, i :meth:`stop` zostawia go działającego dla
+    następnego uruchomienia odtwarzacza.
+    """
+
+    def __init__(self, whisper_dir, port=DEFAULT_PORT, command=None, on_state=None,
+                 ready_timeout=READY_TIMEOUT, health_interval=HEALTH_INTERVAL,
+                 keep_running=False, pidfile=None, logger=None):
+        self.whisper_dir = whisper_dir
+        self.port = port
+        self.command = command or server_command(whisper_dir, port)
+        self.on_state = on_state
+        self.ready_timeout = ready_timeout
+        self.health_interval = health_interval
+        self.keep_running = keep_running
+        self.pidfile = pidfile or os.path.join(cache_dir('run'), f'whisper_server_{port}.pid')
+        self.logger = logger or server_logger()
+        self.process = None   # Popen uruchomionego przez nas procesu
+        self.pid = None       # numer procesu serwera (także przejętego), jeśli znany
+        self.state = None
+        self.restarts = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _set_state(self, state, detail=''):
+        self.state = state
+        self.logger.info("[supervisor] %s %s", state, detail)
+        if self.on_state is not None:
+            self.on_state(state, detail)
+
+    def start(self):
+        """Startuje wątek nadzorcy i wraca natychmiast."""
+        self._thread = threading.Thread(target=self._supervise, name="whisper-supervisor", daemon=True)
+        self._thread.start()
+
+    # --- plik .pid -------------------------------------------------------
+
+    def _read_pidfile(self):
+        try:
+            with open(self.pidfile, encoding='utf-8') as f:
+                info = json.load(f)
+            pid = int(info['pid'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if info.get('port') != self.port or not is_whisper_server(pid, self.port):
+            self.logger.info("[supervisor] discarding stale pidfile (pid %s)", pid)
+            self._remove_pidfile()
+            return None
+        return pid
+
+    def _write_pidfile(self, pid):
+        tmp = self.pidfile + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'pid': pid, 'port': self.port, 'started': time.time()}, f)
+        os.replace(tmp, self.pidfile)
+
+    def _remove_pidfile(self):
+        try:
+            os.remove(self.pidfile)
+        except OSError:
+            pass
+
+    # --- cykl nadzoru ----------------------------------------------------
+
+    def _supervise(self):
+        if self._adopt():
+            self._set_state(READY, f"reusing server on port {self.port}" + (f" (pid {self.pid})" if self.pid else ""))
+        else:
+            self._set_state(STARTING, f"starting on port {self.port}")
+            if not self._launch():
+                return
+        while not self._stop.is_set():
+            self._watch()
+            if self._stop.is_set() or not self._restart():
+                return
+
+    def _restart(self):
+        """Uruchamia serwer ponownie z rosnącym odstępem; ``False`` gdy nadzór się kończy.
+
+        Odstęp zależy od liczby restartów od ostatniej stabilnej pracy, więc
+        serwer padający zaraz po starcie jest wznawiany coraz rzadziej.
+        """
+        while True:
+            self.restarts += 1
+            if self.restarts > MAX_RESTARTS:
+                self._terminate()
+                self._set_state(FAILED, f"gave up after {MAX_RESTARTS} restarts")
+                return False
+            delay = min(RESTART_INITIAL_DELAY * 2 ** (self.restarts - 1), RESTART_MAX_DELAY)
+            self._set_state(RESTARTING, f"restart {self.restarts} in {delay:g}s")
+            self._terminate()
+            if self._stop.wait(delay):
+                return False
+            if self._launch(final=False):
+                return True
+
+    def _adopt(self):
+        """Przejmuje działający serwer, jeśli odpowiada na uzgodnienie WebSocket."""
+        if not is_port_in_use(self.port) or not websocket_ping(self.port):
+            return False
+        self.pid = self._read_pidfile()
+        return True
+
+    def _launch(self, final=True):
+        """Uruchamia proces i czeka na gotowość; przy ``final`` porażka kończy nadzór."""
+        try:
+            if self.keep_running:
+                # Wyjście wprost do pliku i osobna sesja - proces przeżyje odtwarzacz
+                path = os.path.join(cache_dir('logs'), 'whisper_server.out')
+                if os.path.exists(path) and os.path.getsize(path) > LOG_MAX_BYTES:
+                    os.replace(path, path + '.1')
+                with open(path, 'ab') as log:
+                    self.process = subprocess.Popen(
+                        self.command, cwd=self.whisper_dir, stdin=subprocess.DEVNULL,
+                        stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+                    )
+            else:
+                self.process = subprocess.Popen(
+                    self.command, cwd=self.whisper_dir, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                )
+                threading.Thread(target=self._drain, args=(self.process,), name="whisper-log", daemon=True).start()
+        except OSError as e:
+            self.logger.info("[supervisor] cannot start server: %s", e)
+            if final:
+                self._set_state(FAILED, str(e))
+            return False
+        self.pid = self.process.pid
+        self._write_pidfile(self.pid)
+        error = self._wait_ready(self.process)
+        if error is None:
+            self._set_state(READY, f"listening on port {self.port} (pid {self.pid})")
+            return True
+        self.logger.info("[supervisor] server not ready: %s", error)
+        self._terminate()
+        if final:
+            self._set_state(FAILED, error)
+        return False
+
+    def _drain(self, process):
+        for line in iter(process.stdout.readline, b''):
+            self.logger.info("%s", line.decode('utf-8', 'replace').rstrip())
+        process.stdout.close()
+
+    def _wait_ready(self, process):
+        """Czeka na gotowość procesu; zwraca opis błędu albo ``None``."""
+        deadline = time.monotonic() + self.ready_timeout
+        delay = READY_INITIAL_DELAY
+        while not self._stop.is_set():
+            if is_port_in_use(self.port) and websocket_ping(self.port):
+                return None
+            code = process.poll()
+            if code is not None:
+                return f"server exited with code {code}"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return f"not ready after {self.ready_timeout:.0f}s"
+            self._stop.wait(min(delay, remaining))
+            delay = min(delay * 2, READY_MAX_DELAY)
+        return "stopped"
+
+    def _watch(self):
+        """Kontroluje działający serwer aż do awarii albo :meth:`stop`."""
+        failures = 0
+        ready_at = time.monotonic()
+        while not self._stop.wait(self.health_interval):
+            if self.process is not None and self.process.poll() is not None:
+                self.logger.info("[supervisor] server exited with code %s", self.process.returncode)
+                return
+            if self.process is None and self.pid is not None and not is_whisper_server(self.pid, self.port):
+                self.logger.info("[supervisor] adopted server (pid %s) is gone", self.pid)
+                return
+            if websocket_ping(self.port):
+                failures = 0
+                if self.restarts and time.monotonic() - ready_at > STABLE_AFTER:
+                    self.restarts = 0   # długo stabilny - licznik restartów od nowa
+                continue
+            failures += 1
+            self.logger.info("[supervisor] health check failed (%d/%d)", failures, HEALTH_FAILURES)
+            if failures >= HEALTH_FAILURES:
+                return
+
+    # --- zatrzymanie -----------------------------------------------------
+
+    def _terminate(self, timeout=STOP_TIMEOUT):
+        """Kończy proces serwera (SIGTERM, po ``timeout`` SIGKILL)."""
+        process, pid = self.process, self.pid
+        self.process = self.pid = None
+        if process is not None:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+        elif pid is not None and is_whisper_server(pid, self.port):
+            # przejęty proces - sygnał tylko po ponownym sprawdzeniu, czy to nadal serwer
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + timeout
+            while pid_alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            if is_whisper_server(pid, self.port):
+                os.kill(pid, signal.SIGKILL)
+        self._remove_pidfile()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Kończy nadzór; serwer jest zatrzymywany, chyba że ustawiono ``keep_running``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.keep_running and (self.process is None or self.process.poll() is None):
+            return
+        self._terminate(timeout)